@@ -0,0 +1,229 @@
+"""Benchmark parse_cvs_from_folder against a local fake Drive service.
+
+No credentials or network needed: the Drive client pool is swapped for one
+handing out an in-memory fake that serves generated PDFs with a fixed
+per-request latency.
+
+Run: python tools/bench_cv_parser.py
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+import httplib2
+
+import cv_parser_tool
+import pdf_pages
+from bench_text_parser import make_cv_pdf
+
+
+class _Executable:
+    """A fake HttpRequest: execute() costs one round trip, batching does not."""
+
+    def __init__(self, drive, fn):
+        self._drive = drive
+        self.fn = fn
+
+    def execute(self):
+        self._drive.list_calls += 1
+        time.sleep(self._drive.latency)
+        return self.fn()
+
+
+class _FakeBatch:
+    """Stub of the Drive batch endpoint: many sub-requests, one round trip."""
+
+    def __init__(self, drive, callback):
+        self._drive = drive
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        if len(self._requests) >= cv_parser_tool.BATCH_MAX_REQUESTS:
+            raise ValueError("Drive batch requests are limited to 100 calls")
+        self._requests.append((request_id, request, callback or self._callback))
+
+    def execute(self):
+        self._drive.batch_calls += 1
+        time.sleep(self._drive.latency)
+        for request_id, request, callback in self._requests:
+            try:
+                response, exception = request.fn(), None
+            except Exception as e:
+                response, exception = None, e
+            callback(request_id, response, exception)
+
+
+class _FakeHttp:
+    """Answers MediaIoBaseDownload requests from the fake's blob store."""
+
+    def __init__(self, drive):
+        self._drive = drive
+
+    def request(self, uri, method="GET", **kwargs):
+        self._drive.media_calls += 1
+        time.sleep(self._drive.latency)
+        file_id = uri.rsplit("/", 1)[-1]
+        if file_id in self._drive.broken:
+            return httplib2.Response({"status": "500"}), b"backend error"
+        body = self._drive.blobs[file_id]
+        resp = httplib2.Response({
+            "status": "200",
+            "content-range": f"bytes 0-{len(body) - 1}/{len(body)}",
+        })
+        return resp, body
+
+
+class _FakeMediaRequest:
+    def __init__(self, drive, file_id):
+        self.uri = f"fake://drive/{file_id}"
+        self.headers = {}
+        self.http = _FakeHttp(drive)
+
+
+class _FakeFiles:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def list(self, q=None, fields=None, pageSize=100, pageToken=None, orderBy=None):
+        # Only the two query shapes cv_parser_tool sends are told apart
+        listing = self._drive.job_files if "job-listing.txt" in (q or "") else self._drive.listing
+
+        def run():
+            start = int(pageToken or 0)
+            page = listing[start:start + pageSize]
+            out = {"files": [dict(f) for f in page]}
+            if start + pageSize < len(listing):
+                out["nextPageToken"] = str(start + pageSize)
+            return out
+        return _Executable(self._drive, run)
+
+    def get(self, fileId, fields=None):
+        def run():
+            for f in self._drive.listing:
+                if f["id"] == fileId:
+                    return dict(f, size=str(len(self._drive.blobs[fileId])))
+            raise LookupError(f"File not found: {fileId}")
+        return _Executable(self._drive, run)
+
+    def get_media(self, fileId):
+        return _FakeMediaRequest(self._drive, fileId)
+
+
+class FakeDriveService:
+    """Minimal stand-in for the Drive v3 service used by cv_parser_tool."""
+
+    def __init__(self, count: int, latency: float = 0.02, broken=()):
+        self.latency = latency
+        self.broken = set(broken)
+        self.listing = []
+        self.job_files = [{"id": "job", "name": "job-listing.txt"}]
+        self.blobs = {"job": b"Senior Backend Developer\nPython, Django, PostgreSQL"}
+        self.list_calls = 0
+        self.media_calls = 0
+        self.batch_calls = 0
+        for i in range(count):
+            file_id = f"file{i:05d}"
+            name = f"Candidate_{i:05d}.pdf"
+            self.blobs[file_id] = make_cv_pdf(f"Candidate {i}", lines=40, pages=2)
+            self.listing.append({
+                "id": file_id,
+                "name": name,
+                "mimeType": "application/pdf",
+                "md5Checksum": hashlib.md5(self.blobs[file_id]).hexdigest(),
+            })
+
+    def files(self):
+        return _FakeFiles(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _FakeBatch(self, callback)
+
+
+def _install(drive):
+    cv_parser_tool._drive_pool = cv_parser_tool.DriveClientPool(factory=lambda: drive)
+    cv_parser_tool._thread_local.__dict__.clear()
+
+
+def run_case(label: str, drive, **kwargs):
+    _install(drive)
+    start = time.perf_counter()
+    result = cv_parser_tool.parse_cvs_from_folder("folder", **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<32} {elapsed:7.2f}s  cvs={result['total_found']}  errors={len(result['errors'])}")
+    return result
+
+
+if __name__ == "__main__":
+    # Benchmark raw download/extraction first; the cache gets its own run below
+    os.environ["CV_TEXT_CACHE_PATH"] = ""
+    count = 60
+    drive = FakeDriveService(count, latency=0.02, broken={"file00007"})
+
+    print(f"📊 parse_cvs_from_folder over {count} fake CVs (20ms latency per request)")
+    base = run_case("sequential", drive)
+    threaded = run_case("download_workers=8", drive, download_workers=8)
+    piped = run_case("download_workers=8, extract=4", drive, download_workers=8, extract_workers=4)
+
+    for other in (threaded, piped):
+        assert [c["file_id"] for c in other["cvs"]] == [c["file_id"] for c in base["cvs"]]
+        assert [c["cv_text"] for c in other["cvs"]] == [c["cv_text"] for c in base["cvs"]]
+        assert other["errors"] == base["errors"]
+    print("✅ Results identical and in listing order")
+
+    big = FakeDriveService(250, latency=0.0)
+    _install(big)
+    errors = []
+    streamed = 0
+    for cv in cv_parser_tool.iter_cvs_from_folder("folder", download_workers=4, errors=errors):
+        streamed += 1
+    assert streamed == 250 and not errors, (streamed, errors)
+    print(f"✅ Streamed all {streamed} CVs across {big.list_calls} listing pages")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CV_TEXT_CACHE_PATH"] = os.path.join(tmp, "cv_text.sqlite3")
+        cached = FakeDriveService(count, latency=0.02)
+        cold = run_case("cache cold", cached, download_workers=8)
+        calls_before = (cached.list_calls, cached.media_calls)
+        warm = run_case("cache warm", cached, download_workers=8)
+        assert warm["cvs"] == cold["cvs"]
+        assert cached.media_calls == calls_before[1], "warm run should not download"
+        assert cached.list_calls == calls_before[0] + 1, "warm run should list once"
+        print(f"✅ Warm run: 1 listing call, 0 downloads; {cv_parser_tool.get_extraction_cache().stats()}")
+        cv_parser_tool.get_extraction_cache().close()
+
+    os.environ["CV_TEXT_CACHE_PATH"] = ""
+    folder = FakeDriveService(250, latency=0.02)
+    _install(folder)
+    ids = [f["id"] for f in folder.listing] + ["missing"]
+    start = time.perf_counter()
+    meta = cv_parser_tool.get_files_metadata(ids)
+    elapsed = time.perf_counter() - start
+    assert [f["id"] for f in meta["files"]] == ids[:-1] and len(meta["errors"]) == 1
+    assert folder.batch_calls == 3 and folder.list_calls == 0
+    print(f"✅ Metadata for {len(ids)} files in {folder.batch_calls} batch round trips ({elapsed:.2f}s)")
+
+    folder.batch_calls = folder.list_calls = 0
+    ingest = cv_parser_tool.ingest_review_folder("folder", download_workers=8)
+    assert ingest["total_found"] == 250 and not ingest["errors"], ingest["errors"]
+    assert ingest["job_listing"]["found"] and ingest["job_listing"]["file_name"] == "job-listing.txt"
+    print(f"✅ Ingested folder with {folder.batch_calls} batch + {folder.list_calls} list round trips")
+
+    long_pdf = make_cv_pdf("Portfolio", lines=60, pages=300)
+    cpus = os.cpu_count() or 1
+    print(f"📊 300-page PDF, per-page parallel extraction ({cpus} CPU(s) available)")
+    texts = []
+    for workers in (0, 4):
+        start = time.perf_counter()
+        texts.append(cv_parser_tool.extract_text_from_pdf_bytes(long_pdf, page_workers=workers))
+        label = f"page_workers={workers} ({pdf_pages.split_workers(300, workers) or 'serial'})"
+        print(f"   {label:<32} {time.perf_counter() - start:7.2f}s")
+    # The shared pool itself, ignoring the CPU cap: first call starts it
+    for label in ("4 processes, new pool", "4 processes, reused pool"):
+        start = time.perf_counter()
+        pages = pdf_pages.extract_pages(long_pdf, 300, 4)
+        print(f"   {label:<32} {time.perf_counter() - start:7.2f}s")
+    assert texts[0] == texts[1] == "\n".join(pages).strip()
+    print("✅ Parallel page extraction matches single-threaded output")
@@ -0,0 +1,327 @@
+"""Benchmarks and equivalence checks for cv_review_excel.
+
+Generates a synthetic Mass Review response in the Reviewer agent's output
+format and compares the current parser against the implementation it
+replaced.
+
+Run: python tools/bench_cv_review.py
+"""
+
+import csv
+import json
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterator, List
+
+import openpyxl
+
+import cv_review_excel
+from candidate_table import CandidateTable
+
+
+def legacy_parse_agent_review_response(response_text: str) -> List[Dict]:
+    """parse_agent_review_response before the line tokenizer."""
+    candidates = []
+    pattern = r'\d+\.\s+\*\*(.+?)\*\*\s+-\s+Score:\s+(\d+(?:\.\d+)?)/10\s+(.+?)(?=\d+\.\s+\*\*|\Z)'
+    matches = re.finditer(pattern, response_text, re.DOTALL)
+    recommend_pos = [m.start() for m in re.finditer(r'🟢\s+RECOMMENDED', response_text)]
+    consider_pos = [m.start() for m in re.finditer(r'🟡\s+CONSIDER', response_text)]
+    reject_pos = [m.start() for m in re.finditer(r'🔴\s+NOT\s+RECOMMENDED', response_text)]
+    for match in matches:
+        name = match.group(1).strip()
+        score = float(match.group(2))
+        details = match.group(3).strip()
+        match_pos = match.start()
+        skills_match = re.search(r'-\s+Skills:\s+(.+?)(?=\n\s+-|\Z)', details)
+        exp_match = re.search(r'-\s+Experience:\s+(.+?)(?=\n\s+-|\Z)', details)
+        why_match = re.search(r'-\s+Why:\s+(.+?)(?=\n\s+-|\Z)', details)
+        missing_match = re.search(r'-\s+Missing:\s+(.+?)(?=\n\s+-|\Z)', details)
+        if recommend_pos and match_pos > recommend_pos[0]:
+            decision = 'RECOMMEND'
+            if consider_pos and match_pos > consider_pos[0]:
+                decision = 'CONSIDER'
+            if reject_pos and match_pos > reject_pos[0]:
+                decision = 'REJECT'
+        elif consider_pos and match_pos > consider_pos[0]:
+            decision = 'CONSIDER'
+            if reject_pos and match_pos > reject_pos[0]:
+                decision = 'REJECT'
+        elif reject_pos and match_pos > reject_pos[0]:
+            decision = 'REJECT'
+        else:
+            decision = 'RECOMMEND' if score >= 8 else 'CONSIDER' if score >= 6 else 'REJECT'
+        candidates.append({
+            'name': name,
+            'final_score': score,
+            'auto_decision': decision,
+            'skills': skills_match.group(1).strip() if skills_match else '',
+            'experience': exp_match.group(1).strip() if exp_match else '',
+            'reasoning': why_match.group(1).strip() if why_match else '',
+            'missing': missing_match.group(1).strip() if missing_match else '',
+        })
+    return candidates
+
+
+_SKILLS = ["Python", "Django", "PostgreSQL", "Docker", "AWS", "Kubernetes", "React", "Go", "Kafka", "Terraform"]
+_SECTIONS = (
+    ("🟢 RECOMMENDED", 8.0, 10.0),
+    ("🟡 CONSIDER", 5.5, 7.5),
+    ("🔴 NOT RECOMMENDED", 1.0, 5.0),
+)
+
+
+def make_review_response(count: int, seed: int = 5, wrap_every: int = 0) -> str:
+    """A Mass Review response with ``count`` candidates split over the three sections.
+
+    wrap_every > 0 wraps every n-th "Why" line onto a second line, the way
+    long model answers often come out.
+    """
+    rng = random.Random(seed)
+    lines = ["📊 CANDIDATE REVIEW RESULTS", "", "Job: Senior Backend Developer",
+             f"Total Candidates: {count}", ""]
+    number = 0
+    per_section = [count // 3, count // 3, count - 2 * (count // 3)]
+    for (header, low, high), size in zip(_SECTIONS, per_section):
+        lines += [f"{header} ({size} candidates)", ""]
+        for _ in range(size):
+            number += 1
+            score = round(rng.uniform(low, high) * 2) / 2
+            why = f"Matches {rng.randint(2, 6)} of the must-have skills with {rng.randint(1, 9)} years in production."
+            lines.append(f"{number}. **Candidate {number:05d}** - Score: {score:g}/10")
+            lines.append(f"   - Skills: {', '.join(rng.sample(_SKILLS, 4))}")
+            lines.append(f"   - Experience: {rng.randint(1, 15)} years")
+            if wrap_every and number % wrap_every == 0:
+                lines.append(f"   - Why: {why}")
+                lines.append("     Strong references from the last two employers.")
+            else:
+                lines.append(f"   - Why: {why}")
+            lines.append(f"   - Missing: {rng.choice(['None significant', 'AWS', 'Kafka, Go', 'Team lead experience'])}")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def token_chunks(text: str, size: int = 4) -> List[str]:
+    """Split text into LLM-token-sized chunks."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _timed(fn, *args, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _streamed(chunks: List[str]) -> List[Dict]:
+    parser = cv_review_excel.ReviewResponseParser()
+    out = []
+    for chunk in chunks:
+        out.extend(parser.feed(chunk))
+    out.extend(parser.close())
+    return out
+
+
+def bench_parse_review_response(count: int = 5000):
+    print(f"\n📊 parse_agent_review_response, {count} candidates")
+    fields = ("skills", "experience", "reasoning", "missing")
+    for label, wrap_every in (("one-line details", 0), ("every 10th Why wrapped", 10)):
+        text = make_review_response(count, wrap_every=wrap_every)
+        old_t, old = _timed(legacy_parse_agent_review_response, text)
+        new_t, new = _timed(cv_review_excel.parse_agent_review_response, text)
+        assert len(new) == len(old) == count, label
+        recovered = 0
+        for n, o in zip(new, old):
+            assert (n["name"], n["final_score"], n["auto_decision"]) == \
+                (o["name"], o["final_score"], o["auto_decision"]), label
+            for field in fields:
+                # The old regex dropped values that ran into a section
+                # header or wrapped onto a second line
+                assert n[field] == o[field] or (o[field] == "" and n[field]), (label, n, o)
+                recovered += n[field] != o[field]
+        print(
+            f"   {label:<24} {len(text) / 1e6:5.2f} MB  old {old_t:6.3f}s  new {new_t:6.3f}s  "
+            f"x{old_t / new_t:5.1f}  ({recovered} field(s) the old regex dropped)"
+        )
+
+    text = make_review_response(count)
+    chunks = token_chunks(text)
+    stream_t, streamed = _timed(_streamed, chunks)
+    assert streamed == cv_review_excel.parse_agent_review_response(text)
+    print(f"   fed as {len(chunks)} 4-char chunks     {stream_t:6.3f}s")
+    print("✅ Same candidates as the previous parser; streamed chunks parse identically")
+
+
+def legacy_create_review_summary_from_text(agent_response_text: str, output_csv_path: str) -> Dict:
+    """create_review_summary_from_text before ReviewSummaryStream: parse, write, count."""
+    candidates = legacy_parse_agent_review_response(agent_response_text)
+    cv_review_excel.export_review_summary_to_csv(candidates, output_csv_path)
+    stats = {'RECOMMEND': 0, 'CONSIDER': 0, 'REJECT': 0}
+    for c in candidates:
+        decision = c.get('auto_decision', '').upper()
+        if decision in stats:
+            stats[decision] += 1
+    return {
+        "total_candidates": len(candidates),
+        "recommended": stats['RECOMMEND'],
+        "consider": stats['CONSIDER'],
+        "reject": stats['REJECT'],
+    }
+
+
+def bench_review_summary_stream(count: int = 5000):
+    print(f"\n📊 Review summary CSV from a streamed response, {count} candidates")
+    text = make_review_response(count)
+    chunks = token_chunks(text)
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.csv")
+        new_path = os.path.join(tmp, "new.csv")
+
+        # Before: buffer every token, then parse and write once streaming ends
+        start = time.perf_counter()
+        buffered = "".join(chunks)
+        old = legacy_create_review_summary_from_text(buffered, old_path)
+        old_after = time.perf_counter() - start
+
+        stream = cv_review_excel.ReviewSummaryStream(new_path)
+        feed_t = 0.0
+        rows_while_streaming = 0
+        for i, chunk in enumerate(chunks):
+            start = time.perf_counter()
+            stream.feed(chunk)
+            feed_t += time.perf_counter() - start
+            if i == len(chunks) // 2:
+                with open(new_path, newline="", encoding="utf-8") as f:
+                    rows_while_streaming = sum(1 for _ in csv.reader(f)) - 1
+        start = time.perf_counter()
+        new = stream.close()
+        new_after = time.perf_counter() - start
+
+        for key in ("total_candidates", "recommended", "consider", "reject"):
+            assert new[key] == old[key], key
+        with open(old_path, newline="", encoding="utf-8") as f_old, \
+                open(new_path, newline="", encoding="utf-8") as f_new:
+            for o, n in zip(csv.reader(f_old), csv.reader(f_new)):
+                assert o[:6] == n[:6]
+        print(f"   after the last token: old {old_after * 1000:7.1f} ms  new {new_after * 1000:7.1f} ms")
+        print(f"   spread over {len(chunks)} feeds:        {feed_t * 1000:7.1f} ms")
+        print(f"   rows already in the CSV halfway through the stream: {rows_while_streaming}")
+    print("✅ Same counts and rows as parsing after the stream ends")
+
+
+def make_candidates(count: int, seed: int = 11) -> Iterator[Dict]:
+    """Candidate profiles in the shape export_cv_review_to_csv takes."""
+    rng = random.Random(seed)
+    for i in range(count):
+        score = round(rng.uniform(1, 10), 1)
+        low = rng.randrange(30, 120) * 1000
+        yield {
+            "file_name": f"Candidate_{i:06d}.pdf",
+            "name": f"Candidate {i:06d}",
+            "scores": {"final_score": score},
+            "auto_decision": "RECOMMEND" if score >= 8 else "CONSIDER" if score >= 6 else "REJECT",
+            "worth_range": {"currency": "EUR", "min": low, "max": low + 15000},
+            "unreadable": i % 500 == 0,
+            "unreadable_reason": "scanned image" if i % 500 == 0 else "",
+        }
+
+
+def in_memory_xlsx(candidates, output_path: str) -> str:
+    """The obvious openpyxl export: whole workbook in memory, saved at the end."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(cv_review_excel.CV_REVIEW_HEADERS)
+    for c in candidates:
+        ws.append(cv_review_excel._cv_review_row(c))
+    wb.save(output_path)
+    return output_path
+
+
+def _peak_mb(fn, *args) -> float:
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return peak
+
+
+def bench_xlsx_export(count: int = 100_000, traced_count: int = 10_000):
+    print(f"\n📊 CV review export, {count} candidates (peak traced memory at {traced_count})")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "out.csv")
+        mem_path = os.path.join(tmp, "in_memory.xlsx")
+        xlsx_path = os.path.join(tmp, "streamed.xlsx")
+        cases = (
+            ("CSV (export_cv_review_to_csv)", cv_review_excel.export_cv_review_to_csv, csv_path),
+            ("XLSX, in-memory workbook", in_memory_xlsx, mem_path),
+            ("XLSX, export_cv_review_to_xlsx", cv_review_excel.export_cv_review_to_xlsx, xlsx_path),
+        )
+        for label, fn, path in cases:
+            # tracemalloc slows openpyxl several times over, so memory is
+            # measured on a smaller run
+            peak = _peak_mb(fn, make_candidates(traced_count), path)
+            start = time.perf_counter()
+            fn(make_candidates(count), path)
+            elapsed = time.perf_counter() - start
+            print(f"   {label:<32} {elapsed:6.2f}s  peak {peak:6.1f} MB  file {os.path.getsize(path) / 1e6:5.1f} MB")
+
+        wb = openpyxl.load_workbook(xlsx_path, read_only=True)
+        rows = {ws.title: sum(1 for _ in ws.iter_rows(min_row=2, values_only=True)) for ws in wb.worksheets}
+        first = next(wb["Recommended"].iter_rows(min_row=2, max_row=2, values_only=True))
+        wb.close()
+        expected = {"Recommended": 0, "Consider": 0, "Not Recommended": 0}
+        titles = dict(cv_review_excel._DECISION_SHEETS)
+        for c in make_candidates(count):
+            expected[titles[c["auto_decision"]]] += 1
+        assert rows == expected, (rows, expected)
+        assert isinstance(first[2], float) and isinstance(first[5], int), first
+    print(f"✅ One sheet per decision {rows}, numeric score and worth columns")
+
+
+def _retained_mb(build):
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return size, kept
+
+
+def bench_candidate_table(count: int = 100_000):
+    print(f"\n📊 CandidateTable vs list of dicts, {count} candidates")
+    dict_mb, dicts = _retained_mb(lambda: list(make_candidates(count)))
+    table_mb, table = _retained_mb(lambda: CandidateTable.from_dicts(make_candidates(count)))
+    print(f"   held in memory                 dicts {dict_mb:6.1f} MB  table {table_mb:6.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = os.path.join(tmp, "dicts.csv"), os.path.join(tmp, "table.csv")
+        old_t, _ = _timed(cv_review_excel.export_cv_review_to_csv, dicts, old_path)
+        new_t, _ = _timed(cv_review_excel.export_cv_review_to_csv, table, new_path)
+        with open(old_path, "rb") as f_old, open(new_path, "rb") as f_new:
+            assert f_old.read() == f_new.read()
+        print(f"   export_cv_review_to_csv        dicts {old_t:6.3f}s   table {new_t:6.3f}s")
+
+        json_t, json_path = _timed(table.to_json, os.path.join(tmp, "table.json"))
+        with open(json_path, encoding="utf-8") as f:
+            assert len(json.load(f)) == count
+        print(f"   CandidateTable.to_json                        {json_t:6.3f}s")
+
+    old_counts = {}
+    for c in dicts:
+        old_counts[c["auto_decision"]] = old_counts.get(c["auto_decision"], 0) + 1
+    assert table.decision_counts() == old_counts
+
+    assert CandidateTable.from_dicts(table.to_dicts()).to_dicts() == table.to_dicts()
+    print("✅ Identical CSV bytes, counts and to_dicts round trip")
+
+
+if __name__ == "__main__":
+    bench_parse_review_response()
+    bench_review_summary_stream()
+    bench_xlsx_export()
+    bench_candidate_table()
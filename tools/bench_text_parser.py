@@ -0,0 +1,718 @@
+"""Benchmarks and equivalence checks for text_parser_tools internals.
+
+Builds a synthetic CV corpus in memory and compares the current helpers
+against the implementations they replaced.
+
+Run: python tools/bench_text_parser.py
+"""
+
+import base64
+import mmap
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from io import BytesIO
+
+import openpyxl
+
+import text_parser_tools as tp
+
+
+def make_cv_pdf(
+    name: str,
+    lines: int = 20,
+    pages: int = 1,
+    compress: bool = False,
+    kerned: bool = False,
+    image_kb: int = 0
+) -> bytes:
+    """Build a small text PDF that PyPDF2 can read.
+
+    kerned=True writes each line as a TJ array of kerned fragments, the way
+    ATS exporters do; image_kb adds a binary image stream to every page.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    rng = random.Random(name)
+    for p in range(pages):
+        ops = [b"BT /F1 10 Tf 50 780 Td 14 TL"]
+        for i in range(lines):
+            line = f"{name} page {p + 1} line {i + 1}: Python, SQL, Docker"
+            if kerned:
+                parts = [line[j:j + 7] for j in range(0, len(line), 7)]
+                ops.append(b"[" + b" -15 ".join(f"({part})".encode() for part in parts) + b"] TJ T*")
+            else:
+                ops.append(f"({line}) Tj T*".encode())
+        ops.append(b"ET")
+        content = b"\n".join(ops)
+        if compress:
+            packed = zlib.compress(content)
+            stream = b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(packed)
+            stream += packed + b"\nendstream"
+        else:
+            stream = b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        objects.append(stream)
+        content_ref = len(objects)
+        xobject = b""
+        if image_kb:
+            blob = bytes(rng.getrandbits(8) for _ in range(image_kb * 1024))
+            objects.append(
+                b"<< /Type /XObject /Subtype /Image /Width 64 /Height 64 /BitsPerComponent 8 "
+                b"/ColorSpace /DeviceRGB /Filter /DCTDecode /Length %d >>\nstream\n" % len(blob)
+                + blob + b"\nendstream"
+            )
+            xobject = b" /XObject << /Im1 %d 0 R >>" % len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >>" + xobject + b" >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ---- previous implementations, kept as reference ----
+
+def legacy_pdf_unescape(s: bytes) -> str:
+    out = bytearray()
+    i = 0
+    while i < len(s):
+        c = s[i]
+        if c == 0x5C:  # backslash
+            i += 1
+            if i >= len(s): break
+            nxt = s[i]
+
+            if nxt in b"nrtbf":
+                out.extend({
+                    ord("n"): b"\n",
+                    ord("r"): b"\r",
+                    ord("t"): b"\t",
+                    ord("b"): b"\b",
+                    ord("f"): b"\f",
+                }[nxt])
+                i += 1
+                continue
+
+            if nxt in b"()\\":
+                out.append(nxt); i += 1; continue
+
+            if 0x30 <= nxt <= 0x37:
+                oct_digits = bytes([nxt]); i += 1
+                for _ in range(2):
+                    if i < len(s) and 0x30 <= s[i] <= 0x37:
+                        oct_digits += bytes([s[i]]); i += 1
+                    else:
+                        break
+                try: out.append(int(oct_digits, 8))
+                except Exception: pass
+                continue
+
+            out.append(nxt); i += 1
+        else:
+            out.append(c); i += 1
+
+    return out.decode("utf-8", errors="replace")
+
+def legacy_collapse_short_word_runs(text: str) -> str:
+    pat = re.compile(r'(?:(?:\b[A-Za-z]{1,3}\b\s+){2,}\b[A-Za-z]{1,3}\b)')
+    def repl(m):
+        return m.group(0).replace(" ", "")
+    return pat.sub(repl, text)
+
+
+def legacy_despace_spans(text: str, span_pat: re.Pattern) -> str:
+    def repl(m):
+        s = m.group(0)
+        return re.sub(r"\s+", "", s)
+    return span_pat.sub(repl, text)
+
+
+def legacy_normalize_contacts(text: str) -> str:
+    email_span = re.compile(
+        r'(?i)[A-Z0-9._%+\-\s]+@\s*[A-Z0-9.\-\s]+\.\s*[A-Z\s]{2,}'
+    )
+    text = legacy_despace_spans(text, email_span)
+    url_span = re.compile(
+        r'(?i)(https?\s*:\s*//\s*[^\s|]+|[A-Z0-9\-\s]+\.\s*com\s*/\s*[^\s|]+)'
+    )
+    text = legacy_despace_spans(text, url_span)
+    text = re.sub(r'(?i)l\s*i\s*n\s*k\s*e\s*d\s*i\s*n', 'linkedin', text)
+    phone_span = re.compile(r'\+?\d(?:[\s\-]?\d){6,}')
+    text = legacy_despace_spans(text, phone_span)
+    return text
+
+
+def legacy_merge_pdf_chunks(chunks):
+    out = []
+    prev = ""
+
+    for c in chunks:
+        c = c.strip()
+        if not c:
+            continue
+
+        if prev and len(prev) == 1 and len(c) == 1:
+            out[-1] = out[-1] + c
+            prev = out[-1]
+            continue
+
+        if prev and len(prev) == 1 and len(c) > 1:
+            out[-1] = out[-1] + c
+            prev = out[-1]
+            continue
+
+        if prev and not prev.endswith((" ", "\n")) and not c.startswith(("\n", " ")):
+            out.append(" " + c)
+            prev = c
+        else:
+            out.append(c)
+            prev = c
+
+    text = "".join(out)
+
+    text = re.sub(r"[ \t]{2,}", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+
+    text = legacy_collapse_short_word_runs(text)
+    text = legacy_normalize_contacts(text)
+
+    return text.strip()
+
+
+def legacy_sniff_file_type(file_bytes: bytes) -> str:
+    if file_bytes[:8].startswith(b"%PDF-"):
+        return "pdf"
+    if file_bytes[:8].startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(BytesIO(file_bytes)) as z:
+                names = z.namelist()
+                for prefix, kind in (("xl/", "xlsx"), ("word/", "docx"), ("ppt/", "pptx")):
+                    if any(n.startswith(prefix) for n in names):
+                        return kind
+        except Exception:
+            pass
+        return "zip"
+    if file_bytes.lstrip()[:1] in (b"{", b"["):
+        return "json"
+    return "txt"
+
+
+def legacy_parse_xlsx(file_bytes: bytes) -> dict:
+    wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
+    sheets_out = []
+    for name in wb.sheetnames:
+        ws = wb[name]
+        sheet_rows = []
+        for row in ws.iter_rows(values_only=True):
+            sheet_rows.append([cell for cell in row])
+        sheets_out.append({"sheet": name, "rows": sheet_rows})
+    return {"sheets": sheets_out}
+
+
+def legacy_parse_csv(file_bytes: bytes) -> tuple:
+    text = file_bytes.decode("utf-8", errors="replace")
+    rows = []
+    for line in text.splitlines():
+        rows.append([c.strip() for c in line.split(",")])
+    return text, rows
+
+
+def legacy_extract_text_from_pdf_fallback(file_bytes: bytes) -> str:
+    data = file_bytes
+    stream_pat = re.compile(rb"stream\s*(.*?)\s*endstream", re.DOTALL)
+    flate_hint_pat = re.compile(rb"/Filter\s*/FlateDecode")
+    tj_pat = re.compile(rb"\((?:\\.|[^\\)])*\)\s*Tj")
+    tj_array_pat = re.compile(rb"\[(.*?)\]\s*TJ", re.DOTALL)
+    inner_str_pat = re.compile(rb"\((?:\\.|[^\\)])*\)")
+
+    chunks = []
+    for m in stream_pat.finditer(data):
+        raw_stream = m.group(1)
+        start = max(0, m.start() - 200)
+        context = data[start:m.start()]
+        is_flate = bool(flate_hint_pat.search(context))
+        candidates = []
+        if is_flate:
+            for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+                try:
+                    candidates.append(zlib.decompress(raw_stream, wbits))
+                    break
+                except Exception:
+                    continue
+        else:
+            candidates.append(raw_stream)
+        for cand in candidates:
+            for tm in tj_pat.finditer(cand):
+                sm = inner_str_pat.search(tm.group(0))
+                if sm:
+                    chunks.append(legacy_pdf_unescape(sm.group(0)[1:-1]))
+            for tm in tj_array_pat.finditer(cand):
+                for sm in inner_str_pat.finditer(tm.group(1)):
+                    chunks.append(legacy_pdf_unescape(sm.group(0)[1:-1]))
+    return legacy_merge_pdf_chunks(chunks)
+
+
+def _timed(fn, *args, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _random_literal(rng: random.Random, size: int) -> bytes:
+    # Bias towards the bytes the escape grammar cares about
+    alphabet = b"\\\\\\0123456789nrtbf()\n\r" + bytes(range(32, 127)) + bytes([0xC3, 0xA9, 0xFF])
+    return bytes(rng.choice(alphabet) for _ in range(size))
+
+
+def bench_pdf_unescape(cases: int = 20000):
+    print("\n📊 _pdf_unescape vs previous byte-by-byte loop")
+    rng = random.Random(9)
+    samples = [_random_literal(rng, rng.randint(0, 40)) for _ in range(cases)]
+    samples += [b"", b"\\", b"a\\", b"\\777", b"\\0000", b"\\4001", b"\\\\\\"]
+    for s in samples:
+        assert tp._pdf_unescape(s) == legacy_pdf_unescape(s), s
+    print(f"✅ {len(samples)} random literals decode identically")
+
+    rng = random.Random(10)
+    corpus = {
+        "plain text, 5000 x 60 B": [
+            (f"Candidate {i} Python SQL Docker AWS Kubernetes Linux").encode() for i in range(5000)
+        ],
+        "escape-heavy, 5000 x 60 B": [_random_literal(rng, 60) for _ in range(5000)],
+        "one 1 MB literal": [b"Senior Engineer \\(Python\\) \\351t\\351 " * 30000],
+    }
+    for label, literals in corpus.items():
+        old_t, old = _timed(lambda: [legacy_pdf_unescape(s) for s in literals])
+        new_t, new = _timed(lambda: [tp._pdf_unescape(s) for s in literals])
+        assert old == new, label
+        print(f"   {label:<30} old {old_t:6.3f}s  new {new_t:6.3f}s  x{old_t / new_t:5.1f}")
+
+
+def make_cv_chunks(rng: random.Random, lines: int = 60) -> list:
+    """Show-text chunks as a kerning PDF exporter emits them."""
+    chunks = []
+    for i in range(lines):
+        kind = rng.randrange(6)
+        if kind == 0:
+            chunks += list("j a n e . d o e @ e x a m p l e . c o m")
+        elif kind == 1:
+            chunks += ["+ 1 ", "5 5 5 - 0 1", "2 3 - 4 5 6 7"]
+        elif kind == 2:
+            chunks += ["https : //", "l i n k e d i n . com / in / jane-doe-%d" % i]
+        elif kind == 3:
+            chunks += ["A W S", "G C P", "and", "C I / C D", "\n\n\n\n"]
+        else:
+            chunks += [f"Line {i}: built   data pipelines in Python and SQL,", "  shipped to prod.\n"]
+    return chunks
+
+
+def bench_text_normalizer(docs: int = 400):
+    print("\n📊 TextNormalizer vs previous _merge_pdf_chunks passes")
+    rng = random.Random(7)
+    corpus = {
+        "kerned contacts": [make_cv_chunks(rng) for _ in range(docs)],
+        "plain prose": [
+            [f"Line {i}: built data pipelines in Python and SQL for team {d}." for i in range(60)]
+            for d in range(docs)
+        ],
+    }
+    for label, docs_chunks in corpus.items():
+        old_t, old = _timed(lambda: [legacy_merge_pdf_chunks(c) for c in docs_chunks])
+        new_t, new = _timed(lambda: [tp._merge_pdf_chunks(c) for c in docs_chunks])
+        assert old == new, label
+        mb = sum(len(t) for t in new) / 1e6
+        print(
+            f"   {label:<20} {mb:5.2f} MB  old {mb / old_t:6.2f} MB/s  "
+            f"new {mb / new_t:6.2f} MB/s  x{old_t / new_t:4.1f}"
+        )
+    print("✅ Same normalized text as the previous helpers")
+
+
+def make_zip(names, mimetype: bytes = None, filler: int = 0) -> bytes:
+    """A ZIP with the given member names; filler adds that many worksheet members."""
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        if mimetype:
+            z.writestr(zipfile.ZipInfo("mimetype"), mimetype, compress_type=zipfile.ZIP_STORED)
+        z.writestr("[Content_Types].xml", "<Types/>")
+        for n in names:
+            z.writestr(n, "<root>" + "data " * 200 + "</root>")
+        for i in range(filler):
+            z.writestr(f"xl/worksheets/sheet{i}.xml", "<row/>" * 50)
+    return buf.getvalue()
+
+
+def bench_sniff_file_type():
+    print("\n📊 _sniff_file_type vs previous whole-archive sniff")
+    ole_dir = b"R\x00o\x00o\x00t\x00" + "WordDocument".encode("utf-16-le")
+    # OLE header: 512-byte sectors (shift 9), directory in sector 0
+    ole = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 22 + b"\x09\x00" + b"\x00" * 480
+    ole += ole_dir.ljust(512, b"\x00")
+    samples = {
+        "pdf": make_cv_pdf("Sniff"),
+        "xlsx": make_zip(["xl/workbook.xml", "xl/worksheets/sheet1.xml"]),
+        "docx": make_zip(["word/document.xml"]),
+        "pptx": make_zip(["ppt/presentation.xml"]),
+        "zip": make_zip(["notes.txt"]),
+        "odt": make_zip(["content.xml"], mimetype=b"application/vnd.oasis.opendocument.text"),
+        "ods": make_zip(["content.xml"], mimetype=b"application/vnd.oasis.opendocument.spreadsheet"),
+        "doc": ole,
+        "rtf": b"{\\rtf1\\ansi Jane Doe}",
+        "json": b'  {"name": "Jane"}',
+        "png": b"\x89PNG\r\n\x1a\n" + b"\x00" * 64,
+        "jpg": b"\xff\xd8\xff\xe0" + b"\x00" * 64,
+        "gif": b"GIF89a" + b"\x00" * 64,
+        "tiff": b"II*\x00" + b"\x00" * 64,
+        "webp": b"RIFF\x00\x00\x00\x00WEBPVP8 ",
+        "bmp": b"BM" + b"\x00" * 12 + (40).to_bytes(4, "little") + b"\x00" * 40,
+        "txt": b"BMW Group - Senior Engineer\nJane Doe",
+    }
+    for expected, data in samples.items():
+        assert tp._sniff_file_type(data) == expected, (expected, tp._sniff_file_type(data))
+        assert tp._sniff_file_type(BytesIO(data)) == expected, expected
+        if expected in ("pdf", "xlsx", "docx", "pptx", "zip", "json"):
+            assert legacy_sniff_file_type(data) == expected, expected
+    with tempfile.TemporaryFile() as fh:
+        fh.write(samples["docx"])
+        fh.flush()
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert tp._sniff_file_type(mm) == "docx"
+            assert tp._sniff_file_type(memoryview(mm)) == "docx"
+    print(f"✅ {len(samples)} formats detected from bytes, file objects and mmap")
+
+    for members in (2000, 20000):
+        big = make_zip(["docProps/app.xml", "xl/workbook.xml"], filler=members)
+        mb = len(big) / 1e6
+        old_t, old = _timed(lambda: legacy_sniff_file_type(big))
+        new_t, new = _timed(lambda: tp._sniff_file_type(big))
+        assert old == new == "xlsx"
+        print(
+            f"   xlsx, {members:>5} members, {mb:5.1f} MB  old {old_t * 1e3:7.2f}ms  "
+            f"new {new_t * 1e3:7.2f}ms  x{old_t / new_t:6.1f}"
+        )
+
+
+def make_applicant_xlsx(rows: int) -> bytes:
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Applicants")
+    ws.append(["Name", "Email", "Score", "Years", "Stage", "Notes"])
+    for i in range(rows):
+        ws.append([f"Candidate {i}", f"cand{i}@example.com", i % 10, i % 25, "screen", "Python SQL"])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def _peak_mb(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def bench_xlsx_paging(rows: int = 20000):
+    print(f"\n📊 xlsx parsing, {rows} applicant rows: full load vs read-only paging (under tracemalloc)")
+    data = make_applicant_xlsx(rows)
+    old_t, old_peak, old = _peak_mb(lambda: legacy_parse_xlsx(data))
+    new_t, new_peak, new = _peak_mb(lambda: tp._parse_bytes(data, "xlsx", "utf-8", 200000, {"warnings": []}))
+    sheet = new["obj"]["sheets"][0]
+    assert sheet["rows"] == old["sheets"][0]["rows"][:1000]
+    assert sheet["next_row_offset"] == 1000
+    print(f"   old full load    {old_t:6.2f}s  peak {old_peak:7.1f} MB")
+    print(f"   new first page   {new_t:6.2f}s  peak {new_peak:7.1f} MB")
+
+    pages = 0
+    offset = 0
+    seen = []
+    while offset is not None:
+        page = tp._parse_bytes(
+            data, "xlsx", "utf-8", 200000, {"warnings": []}, max_rows=8000, row_offset=offset
+        )["obj"]["sheets"][0]
+        seen.extend(page["rows"])
+        offset = page["next_row_offset"]
+        pages += 1
+    assert seen == old["sheets"][0]["rows"]
+    print(f"✅ Paged through all {len(seen)} rows in {pages} pages, same rows as a full load")
+
+
+def bench_csv_paging(rows: int = 100000):
+    print(f"\n📊 csv parsing, {rows} applicant rows: split(',') vs csv.reader paging (under tracemalloc)")
+    lines = ["name,email,score,notes"]
+    lines += [f'"Doe, Jane {i}",cand{i}@example.com,{i % 10}.5,"Python, SQL"' for i in range(rows)]
+    data = ("\n".join(lines) + "\n").encode()
+
+    old_t, old_peak, (_, old_rows) = _peak_mb(lambda: legacy_parse_csv(data))
+    new_t, new_peak, new = _peak_mb(lambda: tp._parse_bytes(data, "csv", "utf-8", 200000, {"warnings": []}))
+    assert len(old_rows[1]) == 6, "split(',') breaks quoted fields"
+    assert new["tables"][1] == ["Doe, Jane 0", "cand0@example.com", "0.5", "Python, SQL"]
+    assert [c["type"] for c in new["obj"]["columns"]] == ["str", "str", "float", "str"]
+    print(f"   {len(data) / 1e6:.1f} MB input")
+    print(f"   old full split   {old_t:6.2f}s  peak {old_peak:7.1f} MB  (quoted fields split apart)")
+    print(f"   new first page   {new_t:6.2f}s  peak {new_peak:7.1f} MB")
+
+    seen = 0
+    offset = 0
+    while offset is not None:
+        page = tp._parse_bytes(data, "csv", "utf-8", 200000, {"warnings": []}, max_rows=40000, row_offset=offset)
+        seen += len(page["tables"])
+        offset = page["obj"]["next_row_offset"]
+    assert seen == rows + 1
+    print(f"✅ Paged through all {seen} rows with quoted commas intact")
+
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_cv_docx(name: str, paragraphs: int = 40, tables: int = 1) -> bytes:
+    """A minimal docx: paragraphs with runs, tabs and breaks, plus skill tables."""
+    body = []
+    for i in range(paragraphs):
+        body.append(
+            f"<w:p><w:r><w:t>{name} paragraph {i}:</w:t></w:r><w:r><w:tab/>"
+            f"<w:t xml:space=\"preserve\"> Python &amp; SQL</w:t><w:br/><w:t>Docker</w:t></w:r></w:p>"
+        )
+    for t in range(tables):
+        rows = "".join(
+            f"<w:tr><w:tc><w:p><w:r><w:t>Skill {t}.{r}</w:t></w:r></w:p></w:tc>"
+            f"<w:tc><w:p><w:r><w:t>{r} years</w:t></w:r></w:p></w:tc></w:tr>"
+            for r in range(5)
+        )
+        body.append(f"<w:tbl>{rows}</w:tbl>")
+    xml = f'<?xml version="1.0"?><w:document xmlns:w="{_W_NS}"><w:body>{"".join(body)}</w:body></w:document>'
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", "<Types/>")
+        z.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+def make_cv_odt(name: str) -> bytes:
+    xml = (
+        '<?xml version="1.0"?><office:document-content '
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"><office:body><office:text>'
+        f'<text:h>{name}</text:h><text:p>Senior<text:s text:c="2"/>Engineer<text:tab/>'
+        '<text:span>Python</text:span> and SQL<text:line-break/>Berlin</text:p>'
+        '<table:table><table:table-row><table:table-cell><text:p>Skill</text:p></table:table-cell>'
+        '<table:table-cell><text:p>Years</text:p></table:table-cell></table:table-row>'
+        '<table:table-row><table:table-cell><text:p>Go</text:p></table:table-cell>'
+        '<table:covered-table-cell/></table:table-row></table:table>'
+        '</office:text></office:body></office:document-content>'
+    )
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr(zipfile.ZipInfo("mimetype"), "application/vnd.oasis.opendocument.text")
+        z.writestr("content.xml", xml)
+    return buf.getvalue()
+
+
+def dom_docx_text(file_bytes: bytes) -> str:
+    """Reference: load the whole document.xml tree, then walk paragraphs."""
+    import xml.etree.ElementTree as ET
+    with zipfile.ZipFile(BytesIO(file_bytes)) as z:
+        root = ET.fromstring(z.read("word/document.xml"))
+    return "\n".join(
+        "".join(t.text or "" for t in p.iter(f"{{{_W_NS}}}t")) for p in root.iter(f"{{{_W_NS}}}p")
+    )
+
+
+def bench_word_extraction():
+    print("\n📊 docx/odt extraction on a synthetic CV corpus")
+    meta = {"warnings": []}
+    one = tp._parse_bytes(make_cv_docx("Jane", paragraphs=1), "docx", "utf-8", 200000, meta)
+    assert one["text"].splitlines()[:3] == ["Jane paragraph 0:\t Python & SQL", "Docker", "Skill 0.0\t0 years"]
+    assert one["tables"][0][1] == ["Skill 0.1", "1 years"] and not meta["warnings"]
+    odt = tp._parse_bytes(make_cv_odt("Jane Doe"), "odt", "utf-8", 200000, meta)
+    assert odt["text"] == "Jane Doe\nSenior  Engineer\tPython and SQL\nBerlin\nSkill\tYears\nGo\t", odt["text"]
+    assert odt["tables"] == [[["Skill", "Years"], ["Go", ""]]]
+    assert tp._sniff_file_type(make_cv_odt("x")) == "odt" and tp._sniff_file_type(make_cv_docx("x")) == "docx"
+    print("✅ Paragraphs, tabs, breaks and tables preserved for docx and odt")
+
+    corpus = [make_cv_docx(f"Cand {i}", paragraphs=60, tables=2) for i in range(200)]
+    xml_mb = sum(len(zipfile.ZipFile(BytesIO(d)).read("word/document.xml")) for d in corpus) / 1e6
+    new_t, _ = _timed(lambda: [tp._parse_bytes(d, "docx", "utf-8", 200000, {"warnings": []}) for d in corpus])
+    dom_t, _ = _timed(lambda: [dom_docx_text(d) for d in corpus])
+    print(f"   200 CVs, {xml_mb:.1f} MB of document.xml   parsed whole {xml_mb / new_t:5.1f} MB/s   "
+          f"full DOM (text only) {xml_mb / dom_t:5.1f} MB/s")
+
+    # Over _WORD_DOM_MAX_BYTES of document.xml, so it is streamed
+    big = make_cv_docx("Portfolio", paragraphs=40000, tables=50)
+    with zipfile.ZipFile(BytesIO(big)) as z:
+        assert z.getinfo("word/document.xml").file_size > tp._WORD_DOM_MAX_BYTES
+    new_t, new_peak, parsed = _peak_mb(lambda: tp._parse_bytes(big, "docx", "utf-8", 10 ** 9, {"warnings": []}))
+    dom_t, dom_peak, _ = _peak_mb(lambda: dom_docx_text(big))
+    print(f"   40k-paragraph document (under tracemalloc)  streamed peak {new_peak:6.1f} MB  "
+          f"full DOM peak {dom_peak:6.1f} MB")
+    assert len(parsed["tables"]) == 50
+
+
+def bench_parser_registry():
+    print("\n📊 Parser registry")
+    meta = {"warnings": []}
+    pdf = tp._parse_bytes(make_cv_pdf("Registry"), "pdf", "utf-8", 200000, meta)
+    assert "Registry page 1 line 1" in pdf["text"]
+    assert "pdf" in meta["timings_ms"], meta
+
+    @tp.register_parser("rtf")
+    def parse_rtf(file_bytes, file_type, opts, meta):
+        body = re.sub(r"\\[a-z]+\d* ?|[{}]", "", file_bytes.decode(opts["encoding"]))
+        return {"text": body.strip()}
+
+    try:
+        meta = {"warnings": []}
+        out = tp._parse_bytes(b"{\\rtf1\\ansi Jane Doe}", "rtf", "utf-8", 200000, meta)
+        assert out["text"] == "Jane Doe" and not meta["warnings"], out
+        assert set(meta["timings_ms"]) == {"rtf"}
+    finally:
+        del tp._PARSERS["rtf"]
+
+    tiny = b"Jane Doe\nPython"
+    t, _ = _timed(lambda: [tp._parse_bytes(tiny, "txt", "utf-8", 200000, {"warnings": []}) for _ in range(20000)])
+    print(f"   dispatch + timing overhead: {t / 20000 * 1e6:.1f} µs per small txt parse")
+    print(f"✅ Registered parsers: {', '.join(sorted(tp._PARSERS))}")
+
+
+def bench_local_file():
+    print("\n📊 parse_local_file (mmap) vs reading the file into parse_file_bytes")
+    samples = {
+        "cv.pdf": make_cv_pdf("Local", lines=30, pages=3),
+        "cv.docx": make_cv_docx("Local"),
+        "cv.odt": make_cv_odt("Local"),
+        "sheet.xlsx": make_applicant_xlsx(50),
+        "list.csv": b'name,notes\n"Doe, Jane","Python, SQL"\n',
+        "data.json": b'{"name": "Jane"}',
+        "notes.txt": "Jane Doe – résumé".encode(),
+        "empty.txt": b"",
+    }
+    with tempfile.TemporaryDirectory() as root:
+        old_root = os.environ.get("TEXT_PARSER_LOCAL_ROOT")
+        os.environ["TEXT_PARSER_LOCAL_ROOT"] = root
+        try:
+            for name, data in samples.items():
+                with open(os.path.join(root, name), "wb") as fh:
+                    fh.write(data)
+                local = tp.parse_local_file.fn(name, include_warnings=True)
+                direct = tp.parse_file_bytes.fn(data, file_name=name, include_warnings=True)
+                for key in ("file_type", "text", "tables", "obj", "file_name"):
+                    assert local[key] == direct[key], (name, key)
+                assert local["meta"]["warnings"] == direct["meta"]["warnings"], name
+            for bad in ("../etc/passwd", "/etc/passwd", "missing.pdf"):
+                out = tp.parse_local_file.fn(bad, include_warnings=True)
+                assert out["file_type"] == "unknown" and out["meta"]["warnings"], bad
+            print(f"✅ {len(samples)} formats parse identically from disk; paths outside the root are refused")
+
+            big = make_cv_pdf("Portfolio", lines=60, pages=300)
+            with open(os.path.join(root, "big.pdf"), "wb") as fh:
+                fh.write(big)
+
+            def from_bytes():
+                with open(os.path.join(root, "big.pdf"), "rb") as fh:
+                    return tp.parse_file_bytes.fn(fh.read(), file_name="big.pdf", max_chars=10 ** 9)
+
+            old_t, old_peak, old = _peak_mb(from_bytes)
+            new_t, new_peak, new = _peak_mb(lambda: tp.parse_local_file.fn("big.pdf", max_chars=10 ** 9))
+            assert old["text"] == new["text"]
+            print(f"   300-page PDF ({len(big) / 1e6:.1f} MB, under tracemalloc)  read+parse peak {old_peak:6.1f} MB  "
+                  f"mmap peak {new_peak:6.1f} MB")
+        finally:
+            if old_root is None:
+                del os.environ["TEXT_PARSER_LOCAL_ROOT"]
+            else:
+                os.environ["TEXT_PARSER_LOCAL_ROOT"] = old_root
+
+
+def bench_parse_files_bulk(count: int = 40):
+    print(f"\n📊 parse_files_bulk over {count} CV payloads ({os.cpu_count()} CPU(s) available)")
+    pdfs = [make_cv_pdf(f"Bulk {i}", lines=40, pages=4) for i in range(count)]
+    items = [{"file_bytes": p, "file_name": f"cv{i}.pdf"} for i, p in enumerate(pdfs)]
+    items[3] = {"file_bytes": base64.b64encode(pdfs[3]).decode(), "file_name": "cv3.pdf"}
+    items.append({"file_name": "nothing.pdf"})
+    items.append({"file_bytes": "not base64!", "file_name": "bad.pdf"})
+
+    start = time.perf_counter()
+    single = [tp.parse_file_bytes.fn(p, file_name=f"cv{i}.pdf") for i, p in enumerate(pdfs)]
+    one_by_one = time.perf_counter() - start
+    print(f"   {'one call per file':<24} {one_by_one:6.2f}s")
+
+    for executor, workers in (("thread", 1), ("thread", 4), ("process", 4)):
+        start = time.perf_counter()
+        out = tp.parse_files_bulk.fn(items, executor=executor, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        results = out["results"]
+        assert out["total"] == count + 2 and out["failed"] == 2, out["failed"]
+        assert [r["index"] for r in results] == list(range(count + 2))
+        for r, s in zip(results, single):
+            assert r["error"] is None and r["text"] == s["text"] and r["file_name"] == s["file_name"]
+        assert results[-2]["error"].startswith("ValueError") and results[-1]["error"]
+        print(f"   {executor + ' x' + str(workers):<24} {elapsed:6.2f}s")
+    print("✅ Bulk results in item order, identical to single calls, with per-item errors")
+
+
+def bench_pdf_fallback():
+    print("\n📊 _extract_text_from_pdf_fallback vs previous regex scanner")
+    corpus = {
+        "plain Tj, 40 CVs x 2 pages": ([
+            make_cv_pdf(f"Cand {i}", lines=40, pages=2, compress=True) for i in range(40)
+        ], 3),
+        "kerned TJ, 40 CVs x 2 pages": ([
+            make_cv_pdf(f"Cand {i}", lines=40, pages=2, compress=True, kerned=True) for i in range(40)
+        ], 3),
+        # The old scanner takes several seconds per image-heavy CV; run once
+        "256 KB images, 3 CVs x 2 pages": ([
+            make_cv_pdf(f"Cand {i}", lines=40, pages=2, compress=True, image_kb=256) for i in range(3)
+        ], 1),
+    }
+    for label, (pdfs, repeat) in corpus.items():
+        size_mb = sum(len(p) for p in pdfs) / 1e6
+        old_t, old = _timed(lambda: [legacy_extract_text_from_pdf_fallback(p) for p in pdfs], repeat=repeat)
+        new_t, new = _timed(lambda: [tp._extract_text_from_pdf_fallback(p) for p in pdfs], repeat=repeat)
+        # The old scanner's "\s*endstream" eats compressed bytes that happen
+        # to be whitespace, losing those pages; /Length framing does not
+        recovered = 0
+        for o, n in zip(old, new):
+            assert n == o or len(n) > len(o), label
+            recovered += n != o
+        print(
+            f"   {label:<30} {size_mb:6.2f} MB  old {old_t:6.3f}s  new {new_t:6.3f}s  "
+            f"x{old_t / new_t:5.1f}  ({recovered} doc(s) with text the old scanner lost)"
+        )
+    print("✅ Same text as the previous extractor wherever it could decode the streams")
+
+
+if __name__ == "__main__":
+    bench_pdf_unescape()
+    bench_text_normalizer()
+    bench_sniff_file_type()
+    bench_xlsx_paging()
+    bench_csv_paging()
+    bench_word_extraction()
+    bench_parser_registry()
+    bench_local_file()
+    bench_parse_files_bulk()
+    bench_pdf_fallback()
@@ -1,3 +1,13 @@
+"""
+Job listing briefing helpers for watsonx Orchestrate ADK.
+
+Import with:
+  orchestrate tools import -k python -f tools/briefing_tool.py -p tools
+
+(-p packages the tools/ folder so the shared drive_download module ships
+with the tool.)
+"""
+
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 from typing import Dict, Any, Optional
 import re
@@ -8,14 +18,24 @@ try:
 except Exception:
     requests = None  # type: ignore
 
+# Sibling module; only present when the tool is imported with -p tools
+try:
+    import drive_download  # type: ignore
+except Exception:
+    drive_download = None  # type: ignore
+
 
 @tool
-def get_public_text_or_json(link: str, ext: str = "txt", timeout_s: int = 20) -> Dict[str, Any]:
+def get_public_text_or_json(
+    link: str, ext: str = "txt", timeout_s: int = 20, use_cache: bool = True
+) -> Dict[str, Any]:
     """
     Download a public Google Drive FILE (not folder) and return text.
     Accepts:
       - https://drive.google.com/file/d/<id>/view?...
       - https://drive.google.com/uc?export=download&id=<id>
+    Downloads are cached locally by file id and revalidated with the server;
+    set use_cache=false to force a fresh download.
     Returns:
       { ok, file_id, file_type, text, obj, meta }
     """
@@ -42,15 +62,30 @@ def get_public_text_or_json(link: str, ext: str = "txt", timeout_s: int = 20) ->
 
     if requests is None:
         return {"ok": False, "error": "requests not available in runtime"}
+    if drive_download is None:
+        return {
+            "ok": False,
+            "error": "drive_download module not available in runtime",
+            "meta": {"hint": "import the tool with -p tools so drive_download.py ships with it"}
+        }
 
-    r = requests.get(download_url, timeout=timeout_s)
-    r.raise_for_status()
+    r = drive_download.download_public_file(
+        download_url, timeout=timeout_s, cache_key=file_id if use_cache else None
+    )
+    with r["file"] as fh:
+        if r["status"] >= 400:
+            raise drive_download.DownloadError(
+                f"HTTP {r['status']} for {download_url}", download_url, r["status"]
+            )
+        content = fh.read()
 
     # Decode as text
-    text = r.content.decode("utf-8", errors="replace").strip()
+    text = content.decode("utf-8", errors="replace").strip()
 
     obj = None
     warnings = []
+    if r.get("cache_error"):
+        warnings.append(r["cache_error"])
 
     # If JSON-like, parse it
     if text.startswith("{") or text.startswith("["):
@@ -65,5 +100,5 @@ def get_public_text_or_json(link: str, ext: str = "txt", timeout_s: int = 20) ->
         "file_type": ext,
         "text": text,
         "obj": obj,                 # <-- never None if parse succeeds
-        "meta": {"warnings": warnings, "download_url": download_url}
+        "meta": {"warnings": warnings, "download_url": download_url, "cache": r["cache"]}
     }
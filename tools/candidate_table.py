@@ -0,0 +1,308 @@
+"""Columnar store for reviewed candidates.
+
+``CandidateTable`` holds the fields the review exports use as columns
+instead of one nested dict per candidate. Scores and worth ranges live in
+``array('d')`` columns, repeated strings (decisions, currencies) are
+interned, and every export (CSV, XLSX, JSON) is written straight from
+the columns.
+
+It exists to hold large reviews in less memory (about a quarter of the
+list of dicts); exporting from it is not faster than exporting the dicts.
+
+Values are kept exactly: a numeric column stores the number for
+arithmetic plus a one-byte kind per row, so missing keys, ints, numeric
+strings and non-numeric values are written out the way the dict-based
+exporters wrote them.
+"""
+
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import csv
+import json
+import math
+import os
+import re
+import sys
+
+import cv_review_excel
+
+
+# Row kinds in a NumericColumn
+MISSING = 0     # key absent
+FLOAT = 1       # a float, stored as is
+INT = 2         # an int (not bool) that fits a double exactly
+NUMERIC = 3     # anything else float() accepts (numeric strings, bools, big ints)
+MALFORMED = 4   # float() raises (None, "N/A", ...)
+
+_NOT_FLOAT = re.compile(b"[^\x01]")
+_INT_LIMIT = 2 ** 53
+# Marks an absent key while a chunk is being split into columns
+_ABSENT = object()
+_EMPTY: Dict[str, Any] = {}
+# Candidates converted per column-wise pass in from_dicts
+_CHUNK_ROWS = 8192
+
+
+class NumericColumn:
+    """A float column that remembers how each value was given.
+
+    ``values`` holds ``float(value)`` (NaN for missing or malformed rows)
+    and ``kinds`` one of MISSING / FLOAT / INT / NUMERIC / MALFORMED per
+    row. Values that are not plain floats or ints keep their original
+    object in ``raw`` so exports reproduce them.
+    """
+
+    __slots__ = ("values", "kinds", "raw")
+
+    def __init__(self):
+        self.values = array("d")
+        self.kinds = bytearray()
+        self.raw: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def extend(self, items: List[Any]) -> None:
+        """Append values; ``_ABSENT`` marks a missing key."""
+        start = len(self.values)
+        kinds = bytearray(b"\x01") * len(items)
+        odd = [i for i, v in enumerate(items) if type(v) is not float]
+        if odd:
+            items = list(items)
+            for i in odd:
+                value = items[i]
+                if value is _ABSENT:
+                    items[i] = math.nan
+                    kinds[i] = MISSING
+                    continue
+                if type(value) is int and -_INT_LIMIT <= value <= _INT_LIMIT:
+                    kinds[i] = INT
+                    continue
+                self.raw[start + i] = value
+                try:
+                    items[i] = float(value)
+                    kinds[i] = NUMERIC
+                except (TypeError, ValueError, OverflowError):
+                    items[i] = math.nan
+                    kinds[i] = MALFORMED
+        self.values.extend(array("d", items))
+        self.kinds.extend(kinds)
+
+    def to_list(self, missing: Any = "") -> List[Any]:
+        """The column as Python values, with ``missing`` for absent keys."""
+        out = self.values.tolist()
+        for m in _NOT_FLOAT.finditer(self.kinds):
+            i = m.start()
+            kind = self.kinds[i]
+            if kind == INT:
+                out[i] = int(out[i])
+            elif kind == MISSING:
+                out[i] = missing
+            else:
+                out[i] = self.raw[i]
+        return out
+
+
+class CandidateTable:
+    """Reviewed candidates stored column by column.
+
+    Build one with ``from_dicts`` (the candidate dicts the review tools
+    pass around) or ``from_review_response`` (agent response text), or
+    ``append`` candidates one at a time. Export with ``to_csv``,
+    ``to_xlsx`` and ``to_json``, or get plain columns/rows with
+    ``column`` and ``rows``.
+    """
+
+    # Numeric fields, as NumericColumns
+    NUMERIC_FIELDS = ("final_score", "worth_min", "worth_max")
+    # Low-cardinality text fields, interned
+    INTERNED_FIELDS = ("auto_decision", "worth_currency")
+    # Free text fields
+    TEXT_FIELDS = (
+        "file_name", "name", "unreadable_reason",
+        "skills", "experience", "reasoning", "missing",
+    )
+
+    def __init__(self):
+        self._numeric = {f: NumericColumn() for f in self.NUMERIC_FIELDS}
+        self._text: Dict[str, List[Any]] = {
+            f: [] for f in self.INTERNED_FIELDS + self.TEXT_FIELDS
+        }
+        # unreadable: 0/1 flags, with non-bool values kept in _unreadable_raw
+        self._unreadable = bytearray()
+        self._unreadable_raw: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._unreadable)
+
+    @classmethod
+    def from_dicts(cls, candidates: Iterable[Dict]) -> "CandidateTable":
+        """Build a table from candidate dicts (nested or flat).
+
+        Any iterable works; it is consumed in chunks, so a generator is
+        never materialised as a list.
+        """
+        table = cls()
+        it = iter(candidates or [])
+        while True:
+            chunk = list(islice(it, _CHUNK_ROWS))
+            if not chunk:
+                return table
+            table.extend(chunk)
+
+    @classmethod
+    def from_review_response(cls, response_text: str) -> "CandidateTable":
+        """Build a table from agent review response text."""
+        parser = cv_review_excel.ReviewResponseParser()
+        candidates = parser.feed(response_text)
+        candidates.extend(parser.close())
+        return cls.from_dicts(candidates)
+
+    def append(self, c: Dict) -> None:
+        """Add one candidate dict (see ``extend``)."""
+        self.extend([c])
+
+    def extend(self, candidates: List[Dict]) -> None:
+        """Add candidate dicts, one column at a time.
+
+        Accepts the nested shape (``scores.final_score``, ``worth_range``)
+        and the flat one ``parse_agent_review_response`` produces. Field
+        lookups follow ``export_cv_review_to_csv``.
+        """
+        scores = [c.get("scores") or _EMPTY for c in candidates]
+        worth = [c.get("worth_range") or _EMPTY for c in candidates]
+        numeric = self._numeric
+        numeric["final_score"].extend(
+            [s.get("final_score", c.get("final_score", _ABSENT)) for s, c in zip(scores, candidates)]
+        )
+        numeric["worth_min"].extend([w.get("min", _ABSENT) for w in worth])
+        numeric["worth_max"].extend([w.get("max", _ABSENT) for w in worth])
+
+        text = self._text
+        intern = sys.intern
+        text["auto_decision"].extend(
+            [intern(v) if type(v) is str else v for v in (c.get("auto_decision", "") for c in candidates)]
+        )
+        text["worth_currency"].extend(
+            [intern(v) if type(v) is str else v for v in (w.get("currency", "") for w in worth)]
+        )
+        for field in self.TEXT_FIELDS:
+            text[field].extend([c.get(field, "") for c in candidates])
+
+        start = len(self._unreadable)
+        unreadable = [c.get("unreadable", False) for c in candidates]
+        for i, value in enumerate(unreadable):
+            if value is not True and value is not False:
+                self._unreadable_raw[start + i] = value
+                unreadable[i] = bool(value)
+        self._unreadable.extend(unreadable)
+
+    # ---- column access ----
+
+    def numeric(self, field: str) -> NumericColumn:
+        """The NumericColumn for final_score, worth_min or worth_max."""
+        return self._numeric[field]
+
+    def unreadable_flags(self) -> bytearray:
+        """One byte per row: 1 if the candidate's unreadable value is truthy."""
+        return self._unreadable
+
+    def column(self, field: str, missing: Any = "") -> List[Any]:
+        """One column as a list of Python values.
+
+        ``missing`` stands in for numeric fields whose key was absent.
+        """
+        if field in self._numeric:
+            return self._numeric[field].to_list(missing)
+        if field == "unreadable":
+            out = [flag == 1 for flag in self._unreadable]
+            for i, value in self._unreadable_raw.items():
+                out[i] = value
+            return out
+        return list(self._text[field])
+
+    def rows(self, fields: Iterable[str], missing: Optional[Dict[str, Any]] = None) -> Iterator[List[Any]]:
+        """Rows of the given fields; ``missing`` maps field -> value for absent keys."""
+        missing = missing or {}
+        columns = [self.column(f, missing.get(f, "")) for f in fields]
+        return map(list, zip(*columns))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Candidates as nested dicts, the shape ``from_dicts`` accepts.
+
+        Absent numeric keys stay absent and empty detail fields are left
+        out, so ``from_dicts(table.to_dicts())`` rebuilds the same table.
+        """
+        score = self.column("final_score", _ABSENT)
+        low = self.column("worth_min", _ABSENT)
+        high = self.column("worth_max", _ABSENT)
+        unreadable = self.column("unreadable")
+        text = self._text
+        details = ("skills", "experience", "reasoning", "missing")
+        out = []
+        for i in range(len(self)):
+            c = {
+                "file_name": text["file_name"][i],
+                "name": text["name"][i],
+                "auto_decision": text["auto_decision"][i],
+                "unreadable": unreadable[i],
+                "unreadable_reason": text["unreadable_reason"][i],
+            }
+            if score[i] is not _ABSENT:
+                c["scores"] = {"final_score": score[i]}
+            worth = {"currency": text["worth_currency"][i]}
+            if low[i] is not _ABSENT:
+                worth["min"] = low[i]
+            if high[i] is not _ABSENT:
+                worth["max"] = high[i]
+            c["worth_range"] = worth
+            for field in details:
+                if text[field][i]:
+                    c[field] = text[field][i]
+            out.append(c)
+        return out
+
+    def decision_counts(self) -> Counter:
+        """Number of candidates per auto_decision string."""
+        return Counter(d for d in self._text["auto_decision"] if isinstance(d, str))
+
+    # ---- exports ----
+
+    def to_csv(self, output_path: str = "cv_review_results.csv") -> str:
+        """Write the ``export_cv_review_to_csv`` layout; returns the absolute path."""
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(cv_review_excel.CV_REVIEW_HEADERS)
+            writer.writerows(self.rows(cv_review_excel.CV_REVIEW_HEADERS))
+        return os.path.abspath(output_path)
+
+    def to_xlsx(self, output_path: str = "cv_review_results.xlsx") -> str:
+        """Write the ``export_cv_review_to_xlsx`` layout; returns the absolute path."""
+        headers = cv_review_excel.CV_REVIEW_HEADERS
+        return cv_review_excel._write_xlsx_by_decision(
+            output_path,
+            headers,
+            self.rows(headers),
+            decision_col=headers.index("auto_decision"),
+            numeric_cols=[headers.index(h) for h in self.NUMERIC_FIELDS],
+        )
+
+    def to_json(self, output_path: str = "cv_review_results.json") -> str:
+        """Write a JSON array with one flat object per candidate; returns the absolute path.
+
+        Rows are written one at a time, so no list of dicts is built.
+        """
+        fields = ["file_name", "name", "final_score", "auto_decision", "worth_currency",
+                  "worth_min", "worth_max", "unreadable", "unreadable_reason",
+                  "skills", "experience", "reasoning", "missing"]
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, mode="w", encoding="utf-8") as f:
+            f.write("[")
+            for i, row in enumerate(self.rows(fields)):
+                f.write(",\n" if i else "\n")
+                f.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False))
+            f.write("\n]\n" if len(self) else "]\n")
+        return os.path.abspath(output_path)
@@ -4,55 +4,741 @@ This tool helps the Reviewer Agent get CV content from Drive.
 """
 
 import os
-from typing import Dict, List
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+from contextlib import contextmanager
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.http import MediaIoBaseDownload
+import httplib2
 import io
 import PyPDF2
 
+# Sibling module; without it long PDFs are always extracted serially
+try:
+    import pdf_pages
+except ImportError:
+    pdf_pages = None
+
+
+SCOPES = ['https://www.googleapis.com/auth/drive']
+HTTP_TIMEOUT_SEC = 60
+# Downloads larger than this spill from memory to a temp file
+SPOOL_MAX_MEMORY_BYTES = 8 * 1024 * 1024
+# Opt-in per-page parallel extraction for very long PDFs (0 = off); the
+# page threshold is pdf_pages.PDF_PARALLEL_MIN_PAGES
+PDF_PAGE_WORKERS = int(os.getenv('CV_PDF_PAGE_WORKERS', '0'))
+# Drive rejects batch requests with more than 100 sub-requests
+BATCH_MAX_REQUESTS = 100
+CV_FILE_FIELDS = "id, name, mimeType, md5Checksum, modifiedTime"
+
+
+_thread_local = threading.local()
+
+_cache_lock = threading.Lock()
+_extraction_cache = None
+
+
+class DriveClientPool:
+    """Process-wide, thread-safe pool of authorized Drive clients.
+
+    Service-account credentials are read once and reused until the JSON
+    file changes; ``AuthorizedHttp`` refreshes the access token whenever it
+    expires. Each client keeps its own httplib2 connection open, and a
+    client is only ever used by one thread at a time.
+    """
+
+    def __init__(self, scopes: Optional[List[str]] = None, max_idle: int = 16, factory=None):
+        self.scopes = scopes or list(SCOPES)
+        self.max_idle = max_idle
+        # Optional zero-argument callable replacing the real client builder
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._idle = []
+        self._leased = {}
+        self._credentials = None
+        self._credentials_key = None
+
+    def _get_credentials(self):
+        # Try to get credentials from environment or file
+        creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'credentials.json')
+        
+        if not os.path.exists(creds_path):
+            raise FileNotFoundError(f"Google credentials not found at {creds_path}")
+        
+        key = (os.path.abspath(creds_path), os.path.getmtime(creds_path))
+        with self._lock:
+            if key != self._credentials_key:
+                self._credentials = service_account.Credentials.from_service_account_file(
+                    creds_path, scopes=self.scopes
+                )
+                self._credentials_key = key
+                # Clients bound to the old credentials are dropped
+                self._idle.clear()
+            return self._credentials, key
+
+    def credentials_key(self):
+        """Identity of the current credentials file (path, mtime)."""
+        if self._factory is not None:
+            return None
+        return self._get_credentials()[1]
+
+    def acquire(self):
+        """Take a client out of the pool, building one if none is idle."""
+        if self._factory is not None:
+            credentials, key = None, None
+        else:
+            credentials, key = self._get_credentials()
+        
+        with self._lock:
+            while self._idle:
+                client_key, client = self._idle.pop()
+                if client_key == key:
+                    self._leased[id(client)] = key
+                    return client
+        
+        if self._factory is not None:
+            client = self._factory()
+        else:
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT_SEC))
+            # Discovery comes from the document bundled with googleapiclient
+            client = build('drive', 'v3', http=http, cache_discovery=False)
+        
+        with self._lock:
+            self._leased[id(client)] = key
+        return client
+
+    def release(self, client) -> None:
+        """Return a client so another thread can reuse its connection."""
+        with self._lock:
+            key = self._leased.pop(id(client), None)
+            # Clients built from rotated-out credentials are not reused
+            if key == self._credentials_key and len(self._idle) < self.max_idle:
+                self._idle.append((key, client))
+
+    @contextmanager
+    def client(self):
+        """Lease a client for the duration of a ``with`` block."""
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def clear(self) -> None:
+        """Forget cached credentials and idle clients."""
+        with self._lock:
+            self._idle.clear()
+            self._credentials = None
+            self._credentials_key = None
+
+
+_drive_pool = DriveClientPool()
+
+
+class _ThreadLease:
+    """A pool client bound to one thread.
+
+    Only the thread's ``threading.local`` refers to it, so when the thread
+    exits the lease is collected and the client goes back to its pool;
+    ``release()`` returns it early (at most once either way).
+    """
+
+    def __init__(self, pool: DriveClientPool, service, credentials_key):
+        self.service = service
+        self.credentials_key = credentials_key
+        self.release = weakref.finalize(self, pool.release, service)
+
 
 def get_drive_service():
-    """Initialize Google Drive service with credentials."""
-    SCOPES = ['https://www.googleapis.com/auth/drive']
+    """Return the calling thread's Google Drive client.
+
+    The client comes from the process-wide ``DriveClientPool`` and stays
+    bound to this thread, so repeated tool calls skip credential loading,
+    discovery and connection setup. It is released back to the pool when
+    the credentials rotate or the thread exits.
+    """
+    key = _drive_pool.credentials_key()
+    lease = getattr(_thread_local, "lease", None)
+    if lease is None or lease.credentials_key != key:
+        if lease is not None:
+            # Rotated credentials: the pool drops the old client
+            lease.release()
+        lease = _ThreadLease(_drive_pool, _drive_pool.acquire(), key)
+        _thread_local.lease = lease
+    return lease.service
+
+
+def _download_file_bytes(service, file_id: str) -> bytes:
+    """Download a Drive file's content into memory."""
+    request = service.files().get_media(fileId=file_id)
+    file_buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(file_buffer, request)
+
+    done = False
+    while not done:
+        status, done = downloader.next_chunk()
+
+    return file_buffer.getvalue()
+
+
+def _download_file_spooled(service, file_id: str):
+    """Download a Drive file into a spooled temp file, rewound to the start.
     
-    # Try to get credentials from environment or file
-    creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'credentials.json')
+    Small files stay in memory; anything over ``SPOOL_MAX_MEMORY_BYTES`` is
+    written to disk, so a huge portfolio PDF is never held in the heap.
+    """
+    request = service.files().get_media(fileId=file_id)
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+    downloader = MediaIoBaseDownload(spool, request)
+
+    done = False
+    while not done:
+        status, done = downloader.next_chunk()
+
+    spool.seek(0)
+    return spool
+
+
+def extract_text_from_pdf_stream(
+    stream,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    page_workers: Optional[int] = None
+) -> str:
+    """Extract text from a seekable PDF file object.
     
-    if not os.path.exists(creds_path):
-        raise FileNotFoundError(f"Google credentials not found at {creds_path}")
+    Page texts are collected and joined once. Extraction stops after
+    ``max_pages`` pages or once ``max_chars`` characters have been read,
+    so oversized scans do not have to be walked to the end.
+    
+    Documents with at least ``pdf_pages.PDF_PARALLEL_MIN_PAGES`` pages are
+    split across ``page_workers`` processes (default ``CV_PDF_PAGE_WORKERS``,
+    capped at the CPU count) on a shared pool; shorter ones, and any PDF
+    extracted inside a worker process, stay in the calling thread.
+    """
+    if page_workers is None:
+        page_workers = PDF_PAGE_WORKERS
+    try:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        workers = pdf_pages.split_workers(page_count, page_workers) if pdf_pages else 0
+        if workers:
+            text = "\n".join(pdf_pages.extract_pages(stream, page_count, workers)).strip()
+            return text[:max_chars] if max_chars is not None else text
+        
+        parts = []
+        total = 0
+        for i, page in enumerate(pdf_reader.pages):
+            if max_pages is not None and i >= max_pages:
+                break
+            page_text = page.extract_text() or ""
+            parts.append(page_text)
+            total += len(page_text) + 1
+            if max_chars is not None and total >= max_chars:
+                break
+        
+        text = "\n".join(parts).strip()
+        if max_chars is not None:
+            text = text[:max_chars]
+        return text
+    except Exception as e:
+        return f"[Error extracting text: {str(e)}]"
+
+
+def extract_text_from_pdf_bytes(
+    pdf_bytes: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    page_workers: Optional[int] = None
+) -> str:
+    """Extract text from PDF bytes."""
+    # BytesIO shares the bytes object's buffer until written to, so this
+    # does not copy the PDF
+    return extract_text_from_pdf_stream(io.BytesIO(pdf_bytes), max_pages, max_chars, page_workers)
+
+
+def _user_cache_dir() -> str:
+    """Per-user cache root, created private (0700) if missing.
+
+    %LOCALAPPDATA%/hireit on Windows, else $XDG_CACHE_HOME/hireit or
+    ~/.cache/hireit.
+    """
+    if os.name == 'nt':
+        base = os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    root = os.path.join(base, 'hireit')
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    return root
+
+
+class ExtractionCache:
+    """Persistent SQLite cache of extracted CV text.
+
+    Entries are keyed by Drive file id and a content version
+    (``md5Checksum``, or ``modifiedTime`` when Drive has no checksum), so an
+    edited CV is re-extracted instead of served stale. Once the stored text
+    exceeds ``max_bytes`` the least recently used entries are evicted.
+
+    CV text is personal data: a directory the cache creates is private to
+    the user. Reads do not write; their last-used times are kept in memory
+    and written in one transaction with the next ``put``, every
+    ``TOUCH_BATCH`` hits, or on ``flush``/``close``.
+    """
+
+    TOUCH_BATCH = 64
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # file_id -> last-used time of hits not yet written
+        self._touched: Dict[str, float] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        # Shared by the download threads; every access goes through _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extracted_text ("
+            " file_id TEXT PRIMARY KEY,"
+            " version TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS extracted_text_last_used ON extracted_text (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, file_id: str, version: str) -> Optional[str]:
+        """Return cached text for this version of the file, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM extracted_text WHERE file_id = ? AND version = ?",
+                (file_id, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[file_id] = time.time()
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._write_touches()
+                self._conn.commit()
+            return row[0]
+
+    def put(self, file_id: str, version: str, text: str) -> None:
+        """Store text for a file, replacing any older version."""
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extracted_text (file_id, version, text, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_id, version, text, size, time.time())
+            )
+            self._touched.pop(file_id, None)
+            # Eviction must see recent hits as recent
+            self._write_touches()
+            self._evict()
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Write the last-used times of pending hits."""
+        with self._lock:
+            if self._touched:
+                self._write_touches()
+                self._conn.commit()
+
+    def _write_touches(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE extracted_text SET last_used = ? WHERE file_id = ?",
+                [(used, file_id) for file_id, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM extracted_text").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for file_id, size in self._conn.execute(
+            "SELECT file_id, size FROM extracted_text ORDER BY last_used"
+        ).fetchall():
+            self._conn.execute("DELETE FROM extracted_text WHERE file_id = ?", (file_id,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracted_text"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                if self._touched:
+                    self._write_touches()
+                    self._conn.commit()
+            finally:
+                self._conn.close()
+
+
+# What an unusable cache path or index raises; callers extract uncached
+CACHE_ERRORS = (OSError, sqlite3.Error, ValueError)
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Return the process-wide extraction cache, or None if disabled.
+
+    Configured with ``CV_TEXT_CACHE_PATH`` (empty string disables it;
+    default ``cv_text_cache.sqlite3`` in the per-user cache directory, see
+    ``_user_cache_dir``) and ``CV_TEXT_CACHE_MAX_MB``.
+    """
+    global _extraction_cache
+    path = os.getenv('CV_TEXT_CACHE_PATH')
+    if path is None:
+        path = os.path.join(_user_cache_dir(), 'cv_text_cache.sqlite3')
+    if not path:
+        return None
+    with _cache_lock:
+        if _extraction_cache is None or _extraction_cache.path != path:
+            max_mb = int(os.getenv('CV_TEXT_CACHE_MAX_MB', '256'))
+            _extraction_cache = ExtractionCache(path, max_bytes=max_mb * 1024 * 1024)
+        return _extraction_cache
+
+
+def _file_version(file: Dict) -> Optional[str]:
+    """Content version of a listed file, used as the cache key."""
+    if file.get('md5Checksum'):
+        return f"md5:{file['md5Checksum']}"
+    if file.get('modifiedTime'):
+        return f"mtime:{file['modifiedTime']}"
+    return None
+
+
+def _fetch_and_extract(
+    file_id: str,
+    service=None,
+    extract_pool: Optional[Executor] = None,
+    version: Optional[str] = None,
+    cache: Optional[ExtractionCache] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> str:
+    """Download one PDF and extract its text.
+
+    Without an explicit service a client is leased from the shared pool.
+    When ``extract_pool`` is given, extraction runs there and this call
+    blocks until it is done, so each download worker holds at most one
+    PDF in memory at a time. A cache hit for ``version`` skips the
+    download entirely.
+    """
+    if version and (max_pages is not None or max_chars is not None):
+        # Truncated text must not be served for an unlimited request
+        version = f"{version};pages={max_pages};chars={max_chars}"
+
+    if cache is not None and version:
+        try:
+            cv_text = cache.get(file_id, version)
+        except CACHE_ERRORS:
+            # A broken cache only costs the re-extraction
+            cv_text = None
+        if cv_text is not None:
+            return cv_text
+
+    if service is not None:
+        spool = _download_file_spooled(service, file_id)
+    else:
+        with _drive_pool.client() as leased:
+            spool = _download_file_spooled(leased, file_id)
     
-    credentials = service_account.Credentials.from_service_account_file(
-        creds_path, scopes=SCOPES
+    with spool:
+        if extract_pool is None:
+            cv_text = extract_text_from_pdf_stream(spool, max_pages, max_chars)
+        else:
+            # Worker processes need the bytes themselves
+            cv_text = extract_pool.submit(
+                extract_text_from_pdf_bytes, spool.read(), max_pages, max_chars
+            ).result()
+
+    # Extraction failures are reported inline; don't pin them in the cache
+    if cache is not None and version and not cv_text.startswith("[Error extracting text"):
+        try:
+            cache.put(file_id, version, cv_text)
+        except CACHE_ERRORS:
+            pass
+    return cv_text
+
+
+def _cv_query(folder_id: str) -> str:
+    # Query for PDF files in the folder
+    return f"'{folder_id}' in parents and (mimeType='application/pdf' or name contains '.pdf') and trashed=false"
+
+
+def _job_listing_query(folder_id: str) -> str:
+    return f"'{folder_id}' in parents and (name='job-listing.txt' or name='job_intake.json') and trashed=false"
+
+
+def _list_request(service, query: str, fields: str, page_size: int = 100, page_token: str = None):
+    return service.files().list(
+        q=query,
+        fields=f"nextPageToken, files({fields})",
+        pageSize=page_size,
+        pageToken=page_token
     )
+
+
+def _iter_folder_files(
+    service,
+    query: str,
+    fields: str,
+    page_size: int = 100,
+    first_page: Optional[Dict] = None
+) -> Iterator[Dict]:
+    """Yield every file matching ``query``, following ``nextPageToken``.
     
-    return build('drive', 'v3', credentials=credentials)
+    ``first_page`` is an already fetched first response (for example from a
+    batch request); listing then continues from its page token.
+    """
+    results = first_page
+    page_token = None
+    while True:
+        if results is None:
+            results = _list_request(service, query, fields, page_size, page_token).execute()
+        
+        for file in results.get('files', []):
+            yield file
+        
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+        results = None
 
 
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    """Extract text from PDF bytes."""
+def _execute_batch(service, requests: List, batch_size: int = BATCH_MAX_REQUESTS) -> Dict:
+    """Run ``(request_id, HttpRequest)`` pairs through the Drive batch endpoint.
+    
+    Sends ``batch_size`` sub-requests per round trip and returns
+    ``{request_id: (response, exception)}``.
+    """
+    results = {}
+    
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+    
+    for start in range(0, len(requests), batch_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for request_id, request in requests[start:start + batch_size]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    
+    return results
+
+
+def iter_cvs_from_folder(
+    folder_id: str,
+    candidate_name: str = None,
+    download_workers: int = 1,
+    extract_workers: int = 0,
+    use_cache: bool = True,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    errors: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """Yield parsed CVs from a Google Drive folder one at a time.
+    
+    Walks every page of the folder listing and yields each CV as soon as
+    it is ready, in listing order. With ``download_workers > 1`` only a
+    small window of downloads is in flight at once, so memory stays
+    constant however large the folder is.
+    
+    Parameters
+    ----------
+    folder_id, candidate_name, download_workers, extract_workers, use_cache,
+    max_pages, max_chars
+        Same as ``parse_cvs_from_folder``.
+    errors : List[str], optional
+        Per-file failures are appended here instead of being raised.
+    
+    Yields
+    ------
+    Dict
+        {"file_name": str, "candidate_name": str, "cv_text": str, "file_id": str}
+    
+    Raises
+    ------
+    Exception
+        If the folder itself cannot be listed.
+    """
+    service = get_drive_service()
+    files = _iter_folder_files(service, _cv_query(folder_id), CV_FILE_FIELDS)
+    yield from _iter_cvs(
+        service,
+        files,
+        candidate_name,
+        errors if errors is not None else [],
+        download_workers=download_workers,
+        extract_workers=extract_workers,
+        use_cache=use_cache,
+        max_pages=max_pages,
+        max_chars=max_chars
+    )
+
+
+def _iter_cvs(
+    service,
+    files: Iterator[Dict],
+    candidate_name: Optional[str],
+    errors: List[str],
+    download_workers: int = 1,
+    extract_workers: int = 0,
+    use_cache: bool = True,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> Iterator[Dict]:
+    """Download and extract the CVs among ``files``, in order."""
+    cache = None
+    if use_cache:
+        try:
+            cache = get_extraction_cache()
+        except CACHE_ERRORS as e:
+            # Unwritable cache path or bad settings: extract uncached
+            errors.append(f"Extraction cache disabled: {str(e)}")
+    extract_pool = None
+    if extract_workers > 0:
+        # Workers never split PDFs by page themselves: no nested pools
+        extract_pool = ProcessPoolExecutor(
+            max_workers=extract_workers,
+            initializer=pdf_pages.mark_worker if pdf_pages else None,
+        )
+    download_pool = ThreadPoolExecutor(max_workers=download_workers) if download_workers > 1 else None
+    # Downloads submitted but not yet yielded; bounded to keep memory flat
+    window = deque()
+    max_in_flight = download_workers * 2
+    
+    def finish(file_name, file_id, extracted_name, version, future=None):
+        try:
+            if future is not None:
+                cv_text = future.result()
+            else:
+                cv_text = _fetch_and_extract(
+                    file_id, service, extract_pool, version, cache, max_pages, max_chars
+                )
+        except Exception as e:
+            errors.append(f"Failed to parse {file_name}: {str(e)}")
+            return None
+        return {
+            "file_name": file_name,
+            "candidate_name": extracted_name,
+            "cv_text": cv_text,
+            "file_id": file_id
+        }
+    
     try:
-        pdf_file = io.BytesIO(pdf_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        for file in files:
+            file_name = file['name']
+            file_id = file['id']
+            version = _file_version(file)
+            
+            # Extract candidate name from filename (remove .pdf and clean up)
+            extracted_name = file_name.replace('.pdf', '').replace('_', ' ').strip()
+            
+            # Filter by candidate name if provided
+            if candidate_name and candidate_name.lower() not in extracted_name.lower():
+                continue
+            
+            if download_pool is None:
+                cv = finish(file_name, file_id, extracted_name, version)
+                if cv is not None:
+                    yield cv
+                continue
+            
+            future = download_pool.submit(
+                _fetch_and_extract, file_id, None, extract_pool, version, cache, max_pages, max_chars
+            )
+            window.append((file_name, file_id, extracted_name, version, future))
+            while len(window) >= max_in_flight:
+                cv = finish(*window.popleft())
+                if cv is not None:
+                    yield cv
         
-        return text.strip()
-    except Exception as e:
-        return f"[Error extracting text: {str(e)}]"
+        while window:
+            cv = finish(*window.popleft())
+            if cv is not None:
+                yield cv
+    finally:
+        if download_pool is not None:
+            download_pool.shutdown(wait=True, cancel_futures=True)
+        if extract_pool is not None:
+            extract_pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            try:
+                cache.flush()
+            except CACHE_ERRORS:
+                pass
 
 
-def parse_cvs_from_folder(folder_id: str, candidate_name: str = None) -> Dict:
+def parse_cvs_from_folder(
+    folder_id: str,
+    candidate_name: str = None,
+    download_workers: int = 1,
+    extract_workers: int = 0,
+    use_cache: bool = True,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> Dict:
     """Parse CV files from a Google Drive folder.
     
+    Thin wrapper collecting ``iter_cvs_from_folder`` into one dict.
+    
     Parameters
     ----------
     folder_id : str
         The Google Drive folder ID containing CV files
     candidate_name : str, optional
         If provided, only parse CVs matching this name
+    download_workers : int, optional
+        Number of threads downloading files concurrently. 1 (default)
+        downloads one file at a time.
+    extract_workers : int, optional
+        Number of processes running PDF text extraction. 0 (default)
+        extracts in the downloading thread.
+    use_cache : bool, optional
+        Reuse text extracted on earlier runs for files whose md5Checksum /
+        modifiedTime is unchanged (see ``get_extraction_cache``).
+    max_pages : int, optional
+        Stop extracting each CV after this many pages
+    max_chars : int, optional
+        Stop extracting each CV once this many characters are read
     
     Returns
     -------
@@ -70,70 +756,29 @@ def parse_cvs_from_folder(folder_id: str, candidate_name: str = None) -> Dict:
             "errors": List[str]
         }
     """
+    cvs = []
+    errors = []
+    
     try:
-        service = get_drive_service()
-        
-        # Query for PDF files in the folder
-        query = f"'{folder_id}' in parents and (mimeType='application/pdf' or name contains '.pdf') and trashed=false"
-        
-        results = service.files().list(
-            q=query,
-            fields="files(id, name, mimeType)",
-            pageSize=100
-        ).execute()
-        
-        files = results.get('files', [])
-        
-        cvs = []
-        errors = []
-        
-        for file in files:
-            file_name = file['name']
-            file_id = file['id']
-            
-            # Extract candidate name from filename (remove .pdf and clean up)
-            extracted_name = file_name.replace('.pdf', '').replace('_', ' ').strip()
-            
-            # Filter by candidate name if provided
-            if candidate_name and candidate_name.lower() not in extracted_name.lower():
-                continue
-            
-            try:
-                # Download file content
-                request = service.files().get_media(fileId=file_id)
-                file_buffer = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_buffer, request)
-                
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                
-                # Extract text
-                pdf_bytes = file_buffer.getvalue()
-                cv_text = extract_text_from_pdf_bytes(pdf_bytes)
-                
-                cvs.append({
-                    "file_name": file_name,
-                    "candidate_name": extracted_name,
-                    "cv_text": cv_text,
-                    "file_id": file_id
-                })
-                
-            except Exception as e:
-                errors.append(f"Failed to parse {file_name}: {str(e)}")
-        
-        return {
-            "cvs": cvs,
-            "total_found": len(cvs),
-            "errors": errors
-        }
-        
+        for cv in iter_cvs_from_folder(
+            folder_id,
+            candidate_name,
+            download_workers=download_workers,
+            extract_workers=extract_workers,
+            use_cache=use_cache,
+            max_pages=max_pages,
+            max_chars=max_chars,
+            errors=errors
+        ):
+            cvs.append(cv)
     except Exception as e:
-        return {
-            "cvs": [],
-            "total_found": 0,
-            "errors": [f"Failed to access folder: {str(e)}"]
-        }
+        errors.append(f"Failed to access folder: {str(e)}")
+    
+    return {
+        "cvs": cvs,
+        "total_found": len(cvs),
+        "errors": errors
+    }
 
 
 def get_job_listing_from_folder(folder_id: str) -> Dict:
@@ -159,42 +804,14 @@ def get_job_listing_from_folder(folder_id: str) -> Dict:
         service = get_drive_service()
         
         # Look for job listing files
-        query = f"'{folder_id}' in parents and (name='job-listing.txt' or name='job_intake.json') and trashed=false"
-        
         results = service.files().list(
-            q=query,
+            q=_job_listing_query(folder_id),
             fields="files(id, name)",
             orderBy="modifiedTime desc",
             pageSize=1
         ).execute()
         
-        files = results.get('files', [])
-        
-        if not files:
-            return {
-                "job_listing": "",
-                "file_name": "",
-                "found": False
-            }
-        
-        file = files[0]
-        
-        # Download content
-        request = service.files().get_media(fileId=file['id'])
-        file_buffer = io.BytesIO()
-        downloader = MediaIoBaseDownload(file_buffer, request)
-        
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-        
-        content = file_buffer.getvalue().decode('utf-8')
-        
-        return {
-            "job_listing": content,
-            "file_name": file['name'],
-            "found": True
-        }
+        return _read_job_listing(service, results.get('files', []))
         
     except Exception as e:
         return {
@@ -203,3 +820,166 @@ def get_job_listing_from_folder(folder_id: str) -> Dict:
             "found": False,
             "error": str(e)
         }
+
+
+def _read_job_listing(service, files: List[Dict]) -> Dict:
+    """Download the newest job listing file from a listing response."""
+    if not files:
+        return {
+            "job_listing": "",
+            "file_name": "",
+            "found": False
+        }
+    
+    file = files[0]
+    
+    # Download content
+    content = _download_file_bytes(service, file['id']).decode('utf-8')
+    
+    return {
+        "job_listing": content,
+        "file_name": file['name'],
+        "found": True
+    }
+
+
+def get_files_metadata(
+    file_ids: List[str],
+    fields: str = CV_FILE_FIELDS + ", size"
+) -> Dict:
+    """Look up metadata for many Drive files in batched round trips.
+    
+    Up to ``BATCH_MAX_REQUESTS`` lookups travel in one HTTP request, so
+    refreshing checksums for a 300-CV folder takes 3 round trips, not 300.
+    
+    Parameters
+    ----------
+    file_ids : List[str]
+        Drive file IDs to look up
+    fields : str, optional
+        Drive ``fields`` selector for each file
+    
+    Returns
+    -------
+    Dict
+        {
+            "files": List[Dict] (in the order of file_ids, failures omitted),
+            "errors": List[str]
+        }
+    """
+    files = []
+    errors = []
+    
+    try:
+        with _drive_pool.client() as service:
+            results = _execute_batch(service, [
+                (str(i), service.files().get(fileId=file_id, fields=fields))
+                for i, file_id in enumerate(file_ids)
+            ])
+    except Exception as e:
+        return {
+            "files": [],
+            "errors": [f"Batch request failed: {str(e)}"]
+        }
+    
+    for i, file_id in enumerate(file_ids):
+        response, exception = results.get(str(i), (None, None))
+        if exception is not None or response is None:
+            errors.append(f"Failed to get metadata for {file_id}: {exception}")
+        else:
+            files.append(response)
+    
+    return {
+        "files": files,
+        "errors": errors
+    }
+
+
+def ingest_review_folder(
+    folder_id: str,
+    candidate_name: str = None,
+    download_workers: int = 1,
+    extract_workers: int = 0,
+    use_cache: bool = True,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> Dict:
+    """Fetch a folder's job listing and CVs with as few round trips as possible.
+    
+    The first page of the CV listing and the job listing lookup go out in a
+    single batch request; remaining CV pages are then followed as usual.
+    File contents are still downloaded one request per file, as the Drive
+    batch endpoint does not serve media.
+    
+    Parameters
+    ----------
+    folder_id, candidate_name, download_workers, extract_workers, use_cache,
+    max_pages, max_chars
+        Same as ``parse_cvs_from_folder``.
+    
+    Returns
+    -------
+    Dict
+        {
+            "job_listing": Dict (same shape as get_job_listing_from_folder),
+            "cvs": List[Dict],
+            "total_found": int,
+            "errors": List[str]
+        }
+    """
+    cvs = []
+    errors = []
+    job_listing = {
+        "job_listing": "",
+        "file_name": "",
+        "found": False
+    }
+    
+    try:
+        service = get_drive_service()
+        cv_query = _cv_query(folder_id)
+        results = _execute_batch(service, [
+            ("cvs", _list_request(service, cv_query, CV_FILE_FIELDS)),
+            ("job_listing", service.files().list(
+                q=_job_listing_query(folder_id),
+                fields="files(id, name)",
+                orderBy="modifiedTime desc",
+                pageSize=1
+            )),
+        ])
+        
+        listing, exception = results.get("job_listing", (None, None))
+        if exception is not None or listing is None:
+            job_listing["error"] = str(exception)
+        else:
+            try:
+                job_listing = _read_job_listing(service, listing.get('files', []))
+            except Exception as e:
+                job_listing["error"] = str(e)
+        
+        first_page, exception = results.get("cvs", (None, None))
+        if exception is not None or first_page is None:
+            raise RuntimeError(exception)
+        
+        files = _iter_folder_files(service, cv_query, CV_FILE_FIELDS, first_page=first_page)
+        for cv in _iter_cvs(
+            service,
+            files,
+            candidate_name,
+            errors,
+            download_workers=download_workers,
+            extract_workers=extract_workers,
+            use_cache=use_cache,
+            max_pages=max_pages,
+            max_chars=max_chars
+        ):
+            cvs.append(cv)
+    except Exception as e:
+        errors.append(f"Failed to access folder: {str(e)}")
+    
+    return {
+        "job_listing": job_listing,
+        "cvs": cvs,
+        "total_found": len(cvs),
+        "errors": errors
+    }
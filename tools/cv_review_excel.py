@@ -1,27 +1,84 @@
-"""Utility tool for exporting CV review results to CSV.
+"""Utility tool for exporting CV review results to CSV and XLSX.
 
 Intended to be used as a Python tool in watsonx Orchestrate.
-It converts a list of candidate review objects into a flat CSV table.
+It converts a list of candidate review objects into a flat CSV table,
+or an XLSX workbook with one sheet per decision.
 Can also parse agent response text to extract review data.
 """
 
-from typing import List, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Iterable, List, Dict, Optional, Union
 import csv
 import os
 import re
 import json
 
+try:
+    from openpyxl import Workbook  # type: ignore
+    from openpyxl.cell import WriteOnlyCell  # type: ignore
+    from openpyxl.styles import Font  # type: ignore
+except Exception:
+    Workbook = None  # type: ignore
+    WriteOnlyCell = None  # type: ignore
+    Font = None  # type: ignore
+
+if TYPE_CHECKING:
+    from candidate_table import CandidateTable
+
+
+CV_REVIEW_HEADERS = [
+    "file_name",
+    "name",
+    "final_score",
+    "auto_decision",
+    "worth_currency",
+    "worth_min",
+    "worth_max",
+    "unreadable",
+    "unreadable_reason",
+]
+
+
+def _cv_review_row(c: Dict) -> List:
+    worth = c.get("worth_range") or {}
+    scores = c.get("scores") or {}
+    final_score = scores.get("final_score", c.get("final_score", ""))
+    return [
+        c.get("file_name", ""),
+        c.get("name", ""),
+        final_score,
+        c.get("auto_decision", ""),
+        worth.get("currency", ""),
+        worth.get("min", ""),
+        worth.get("max", ""),
+        c.get("unreadable", False),
+        c.get("unreadable_reason", ""),
+    ]
+
+
+def _is_candidate_table(candidates: Any) -> bool:
+    """True for a ``CandidateTable``.
+
+    candidate_table imports this module, so it is imported here, lazily;
+    without it (tool imported without -p tools) no table can exist.
+    """
+    try:
+        from candidate_table import CandidateTable  # type: ignore
+    except ImportError:
+        return False
+    return isinstance(candidates, CandidateTable)
+
 
 def export_cv_review_to_csv(
-    candidates: List[Dict],
+    candidates: Union[List[Dict], "CandidateTable"],
     output_path: str = "cv_review_results.csv"
 ) -> str:
     """Export a list of candidate profiles to a CSV file.
 
     Parameters
     ----------
-    candidates : List[Dict]
-        List of candidate profile objects. Each object is expected to contain:
+    candidates : List[Dict] or CandidateTable
+        List of candidate profile objects, or a ``CandidateTable``. Each
+        object is expected to contain:
         - "file_name" (optional)
         - "name"
         - "scores.final_score" or "final_score"
@@ -39,45 +96,146 @@ def export_cv_review_to_csv(
     str
         The absolute path of the created CSV file.
     """
+    if _is_candidate_table(candidates):
+        return candidates.to_csv(output_path)
+
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
-    headers = [
-        "file_name",
-        "name",
-        "final_score",
-        "auto_decision",
-        "worth_currency",
-        "worth_min",
-        "worth_max",
-        "unreadable",
-        "unreadable_reason",
-    ]
-
     with open(output_path, mode="w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(headers)
+        writer.writerow(CV_REVIEW_HEADERS)
 
         for c in candidates or []:
-            worth = c.get("worth_range") or {}
-            scores = c.get("scores") or {}
-            final_score = scores.get("final_score", c.get("final_score", ""))
-            row = [
-                c.get("file_name", ""),
-                c.get("name", ""),
-                final_score,
-                c.get("auto_decision", ""),
-                worth.get("currency", ""),
-                worth.get("min", ""),
-                worth.get("max", ""),
-                c.get("unreadable", False),
-                c.get("unreadable_reason", ""),
-            ]
-            writer.writerow(row)
+            writer.writerow(_cv_review_row(c))
 
     return os.path.abspath(output_path)
 
 
+# Line patterns for ReviewResponseParser (see the Reviewer agent's output format)
+_CANDIDATE_LINE_PAT = re.compile(r'\d+\.\s+\*\*(.+?)\*\*\s+-\s+Score:\s+(\d+(?:\.\d+)?)/10')
+_DETAIL_LINE_PAT = re.compile(r'-\s+(Skills|Experience|Why|Missing):\s+(.+)')
+_DETAIL_FIELDS = {
+    'Skills': 'skills',
+    'Experience': 'experience',
+    'Why': 'reasoning',
+    'Missing': 'missing',
+}
+_JOB_LINE_PAT = re.compile(r'Job:\s+(.+?)(?=Total|$)')
+_SECTION_MARKERS = (
+    ('🟢', re.compile(r'🟢\s+RECOMMENDED'), 'RECOMMEND'),
+    ('🟡', re.compile(r'🟡\s+CONSIDER'), 'CONSIDER'),
+    ('🔴', re.compile(r'🔴\s+NOT\s+RECOMMENDED'), 'REJECT'),
+)
+
+
+class ReviewResponseParser:
+    """Incremental, line-by-line parser for agent review responses.
+
+    Feed it the response text in chunks of any size (a whole response, or
+    tokens as the LLM streams them). Each line is looked at once: section
+    headers switch the current decision, ``N. **Name** - Score: X/10``
+    starts a candidate and ``- Skills: ...`` style lines fill in its
+    details. A candidate is complete, and returned, once the next
+    candidate or section header arrives, or on ``close``.
+
+    Candidates are decided by the section they appear in; before any
+    section header the score decides (8+ RECOMMEND, 6+ CONSIDER, else
+    REJECT). ``counts`` keeps a running tally of completed candidates per
+    decision, and ``job_title`` holds the first ``Job:`` line seen.
+    """
+
+    def __init__(self):
+        self.section: Optional[str] = None
+        self.job_title: Optional[str] = None
+        self.counts: Dict[str, int] = {'RECOMMEND': 0, 'CONSIDER': 0, 'REJECT': 0}
+        self._pending: List[str] = []
+        self._current: Optional[Dict] = None
+        self._field: Optional[str] = None
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk of text; return the candidates it completed."""
+        if '\n' not in chunk:
+            # Mid-line token: park it until the line ends
+            self._pending.append(chunk)
+            return []
+        lines = chunk.split('\n')
+        if self._pending:
+            self._pending.append(lines[0])
+            lines[0] = ''.join(self._pending)
+        self._pending = [lines.pop()]
+        done: List[Dict] = []
+        for line in lines:
+            self._line(line, done)
+        return done
+
+    def close(self) -> List[Dict]:
+        """Flush the last line and candidate; return what they completed."""
+        done: List[Dict] = []
+        if self._pending:
+            self._line(''.join(self._pending), done)
+            self._pending = []
+        self._finish(done)
+        return done
+
+    def _line(self, line: str, done: List[Dict]) -> None:
+        text = line.strip()
+        if not text:
+            # A blank line ends a wrapped detail value
+            self._field = None
+            return
+
+        if text[0] == '-':
+            if self._current is not None:
+                m = _DETAIL_LINE_PAT.match(text)
+                if m:
+                    self._field = _DETAIL_FIELDS[m.group(1)]
+                    self._current[self._field] = m.group(2).strip()
+                else:
+                    self._field = None
+            return
+
+        if '**' in text:
+            m = _CANDIDATE_LINE_PAT.search(text)
+            if m:
+                self._finish(done)
+                score = float(m.group(2))
+                decision = self.section
+                if decision is None:
+                    decision = 'RECOMMEND' if score >= 8 else 'CONSIDER' if score >= 6 else 'REJECT'
+                self._current = {
+                    'name': m.group(1).strip(),
+                    'final_score': score,
+                    'auto_decision': decision,
+                    'skills': '',
+                    'experience': '',
+                    'reasoning': '',
+                    'missing': '',
+                }
+                return
+
+        for marker, pattern, decision in _SECTION_MARKERS:
+            if marker in text and pattern.search(text):
+                self._finish(done)
+                self.section = decision
+                return
+
+        if self._field is not None:
+            # Detail value wrapped onto the next line
+            self._current[self._field] += ' ' + text
+        elif self.job_title is None and 'Job:' in text:
+            m = _JOB_LINE_PAT.search(text)
+            if m:
+                self.job_title = m.group(1).strip()
+
+    def _finish(self, done: List[Dict]) -> None:
+        if self._current is not None:
+            self.counts[self._current['auto_decision']] += 1
+            done.append(self._current)
+            self._current = None
+        self._field = None
+
+
 def parse_agent_review_response(response_text: str) -> List[Dict]:
     """Parse agent's review response text into structured data.
     
@@ -98,73 +256,37 @@ def parse_agent_review_response(response_text: str) -> List[Dict]:
     List[Dict]
         List of candidate objects with parsed data
     """
-    candidates = []
-    
-    # Pattern to match candidate entries
-    # Matches: 1. **Name** - Score: X/10
-    pattern = r'\d+\.\s+\*\*(.+?)\*\*\s+-\s+Score:\s+(\d+(?:\.\d+)?)/10\s+(.+?)(?=\d+\.\s+\*\*|\Z)'
-    
-    matches = re.finditer(pattern, response_text, re.DOTALL)
-    
-    # Find section boundaries for decision detection
-    sections = {
-        'RECOMMEND': [],
-        'CONSIDER': [],
-        'REJECT': []
-    }
-    
-    # Find all section headers and their positions
-    recommend_pos = [m.start() for m in re.finditer(r'🟢\s+RECOMMENDED', response_text)]
-    consider_pos = [m.start() for m in re.finditer(r'🟡\s+CONSIDER', response_text)]
-    reject_pos = [m.start() for m in re.finditer(r'🔴\s+NOT\s+RECOMMENDED', response_text)]
-    
-    for match in matches:
-        name = match.group(1).strip()
-        score = float(match.group(2))
-        details = match.group(3).strip()
-        match_pos = match.start()
-        
-        # Extract details
-        skills_match = re.search(r'-\s+Skills:\s+(.+?)(?=\n\s+-|\Z)', details)
-        exp_match = re.search(r'-\s+Experience:\s+(.+?)(?=\n\s+-|\Z)', details)
-        why_match = re.search(r'-\s+Why:\s+(.+?)(?=\n\s+-|\Z)', details)
-        missing_match = re.search(r'-\s+Missing:\s+(.+?)(?=\n\s+-|\Z)', details)
-        
-        # Determine decision based on which section this candidate is in
-        decision = 'CONSIDER'  # default
-        
-        # Check if match is after recommend section but before consider
-        if recommend_pos and match_pos > recommend_pos[0]:
-            decision = 'RECOMMEND'
-            if consider_pos and match_pos > consider_pos[0]:
-                decision = 'CONSIDER'
-            if reject_pos and match_pos > reject_pos[0]:
-                decision = 'REJECT'
-        elif consider_pos and match_pos > consider_pos[0]:
-            decision = 'CONSIDER'
-            if reject_pos and match_pos > reject_pos[0]:
-                decision = 'REJECT'
-        elif reject_pos and match_pos > reject_pos[0]:
-            decision = 'REJECT'
-        else:
-            # Fallback to score-based decision
-            decision = 'RECOMMEND' if score >= 8 else 'CONSIDER' if score >= 6 else 'REJECT'
-        
-        candidate = {
-            'name': name,
-            'final_score': score,
-            'auto_decision': decision,
-            'skills': skills_match.group(1).strip() if skills_match else '',
-            'experience': exp_match.group(1).strip() if exp_match else '',
-            'reasoning': why_match.group(1).strip() if why_match else '',
-            'missing': missing_match.group(1).strip() if missing_match else '',
-        }
-        
-        candidates.append(candidate)
-    
+    parser = ReviewResponseParser()
+    candidates = parser.feed(response_text)
+    candidates.extend(parser.close())
     return candidates
 
 
+REVIEW_SUMMARY_HEADERS = [
+    "Name",
+    "Score",
+    "Decision",
+    "Skills",
+    "Experience",
+    "Reasoning",
+    "Missing/Gaps",
+    "Job Title"
+]
+
+
+def _review_summary_row(c: Dict, job_title: Optional[str]) -> List:
+    return [
+        c.get("name", ""),
+        c.get("final_score", ""),
+        c.get("auto_decision", ""),
+        c.get("skills", ""),
+        c.get("experience", ""),
+        c.get("reasoning", ""),
+        c.get("missing", ""),
+        job_title or ""
+    ]
+
+
 def export_review_summary_to_csv(
     agent_response: Union[str, List[Dict]],
     output_path: str = "review_summary.csv",
@@ -188,12 +310,12 @@ def export_review_summary_to_csv(
     """
     # Parse response if it's text
     if isinstance(agent_response, str):
-        candidates = parse_agent_review_response(agent_response)
-        # Try to extract job title from response
+        parser = ReviewResponseParser()
+        candidates = parser.feed(agent_response)
+        candidates.extend(parser.close())
+        # Job title from the response's "Job:" line
         if not job_title:
-            job_match = re.search(r'Job:\s+(.+?)(?=\n|Total)', agent_response)
-            if job_match:
-                job_title = job_match.group(1).strip()
+            job_title = parser.job_title
     else:
         candidates = agent_response
     
@@ -203,37 +325,88 @@ def export_review_summary_to_csv(
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
     
-    headers = [
-        "Name",
-        "Score",
-        "Decision",
-        "Skills",
-        "Experience",
-        "Reasoning",
-        "Missing/Gaps",
-        "Job Title"
-    ]
-    
     with open(output_path, mode="w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(headers)
+        writer.writerow(REVIEW_SUMMARY_HEADERS)
         
         for c in candidates:
-            row = [
-                c.get("name", ""),
-                c.get("final_score", ""),
-                c.get("auto_decision", ""),
-                c.get("skills", ""),
-                c.get("experience", ""),
-                c.get("reasoning", ""),
-                c.get("missing", ""),
-                job_title or ""
-            ]
-            writer.writerow(row)
+            writer.writerow(_review_summary_row(c, job_title))
     
     return os.path.abspath(output_path)
 
 
+class ReviewSummaryStream:
+    """Write the review summary CSV while the agent response streams in.
+
+    ``feed`` takes text chunks as the LLM produces them; every candidate
+    they complete is written to ``output_path`` straight away and kept in
+    ``candidates``, and ``counts`` holds the running per-decision tally.
+    ``close`` flushes the last candidate and returns the same summary as
+    ``create_review_summary_from_text``. The CSV is only created once the
+    first candidate is complete, so a response without candidates leaves
+    no file behind.
+    """
+
+    def __init__(self, output_path: str = "review_summary.csv", job_title: Optional[str] = None):
+        self.output_path = output_path
+        self.job_title = job_title
+        self.parser = ReviewResponseParser()
+        self.candidates: List[Dict] = []
+        self._file = None
+        self._writer = None
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return self.parser.counts
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk of response text; return the candidates it completed."""
+        done = self.parser.feed(chunk)
+        if done:
+            self._write(done)
+        return done
+
+    def close(self) -> Dict:
+        """Finish the CSV and return the summary (see create_review_summary_from_text)."""
+        done = self.parser.close()
+        if done:
+            self._write(done)
+        if self._file is None:
+            return {
+                "error": "No candidates found in response text",
+                "csv_path": None,
+                "total_candidates": 0
+            }
+        self._file.close()
+        return {
+            "csv_path": os.path.abspath(self.output_path),
+            "total_candidates": len(self.candidates),
+            "recommended": self.counts['RECOMMEND'],
+            "consider": self.counts['CONSIDER'],
+            "reject": self.counts['REJECT'],
+            "candidates": self.candidates
+        }
+
+    def _write(self, candidates: List[Dict]) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+            self._file = open(self.output_path, mode="w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(REVIEW_SUMMARY_HEADERS)
+        for c in candidates:
+            self._writer.writerow(_review_summary_row(c, self.job_title or self.parser.job_title))
+        # Readers can follow the file while the response is still streaming
+        self._file.flush()
+        self.candidates.extend(candidates)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+
+
 def create_review_summary_from_text(
     agent_response_text: str,
     output_csv_path: str = "review_summary.csv"
@@ -259,34 +432,169 @@ def create_review_summary_from_text(
             "candidates": List[Dict]
         }
     """
-    candidates = parse_agent_review_response(agent_response_text)
-    
+    # One pass: rows are written as the parser completes each candidate
+    with ReviewSummaryStream(output_csv_path) as stream:
+        stream.feed(agent_response_text)
+        return stream.close()
+
+
+# Sheet per decision bucket, in the order the agent reports them
+_DECISION_SHEETS = (
+    ("RECOMMEND", "Recommended"),
+    ("CONSIDER", "Consider"),
+    ("REJECT", "Not Recommended"),
+)
+# Batch review decisions (build_batch_review_result) share the same sheets
+_DECISION_ALIASES = {
+    "PASS": "RECOMMEND",
+    "BORDERLINE": "CONSIDER",
+    "FAIL": "REJECT",
+}
+_OTHER_SHEET = "Other"
+
+
+def _xlsx_number(value: Any) -> Any:
+    """Numeric cell value for a score/worth field; text that isn't a number stays text."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _write_xlsx_by_decision(
+    output_path: str,
+    headers: List[str],
+    rows: Iterable[List],
+    decision_col: int,
+    numeric_cols: Iterable[int],
+) -> str:
+    """Stream rows into a write-only workbook, one sheet per decision.
+
+    Write-only sheets spool their rows to temp files, so memory stays flat
+    however many rows there are. Decisions outside RECOMMEND / CONSIDER /
+    REJECT (or pass / borderline / fail) go to one "Other" sheet, created
+    on first use.
+    """
+    if Workbook is None:
+        raise RuntimeError("openpyxl is not installed; cannot write XLSX files.")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    numeric_cols = tuple(numeric_cols)
+    wb = Workbook(write_only=True)
+
+    def new_sheet(title: str):
+        ws = wb.create_sheet(title)
+        ws.freeze_panes = "A2"
+        header = []
+        for h in headers:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        ws.append(header)
+        return ws
+
+    sheets = {decision: new_sheet(title) for decision, title in _DECISION_SHEETS}
+    for row in rows:
+        for i in numeric_cols:
+            row[i] = _xlsx_number(row[i])
+        decision = str(row[decision_col] or "").strip().upper()
+        ws = sheets.get(_DECISION_ALIASES.get(decision, decision))
+        if ws is None:
+            ws = sheets.get(_OTHER_SHEET)
+            if ws is None:
+                ws = sheets[_OTHER_SHEET] = new_sheet(_OTHER_SHEET)
+        for i, value in enumerate(row):
+            if isinstance(value, str) and value.startswith("="):
+                # Agent text is data, never a formula
+                cell = WriteOnlyCell(ws, value=value)
+                cell.data_type = "s"
+                row[i] = cell
+        ws.append(row)
+
+    wb.save(output_path)
+    return os.path.abspath(output_path)
+
+
+def export_cv_review_to_xlsx(
+    candidates: Union[Iterable[Dict], "CandidateTable"],
+    output_path: str = "cv_review_results.xlsx"
+) -> str:
+    """Export candidate profiles to an XLSX workbook, one sheet per decision.
+
+    Same columns as ``export_cv_review_to_csv``, with final_score and the
+    worth range written as numbers and unreadable as a boolean. Each sheet
+    has a frozen header row. Rows are streamed (openpyxl write-only
+    mode), so ``candidates`` may be any iterable, including a generator
+    over a very large review.
+
+    Parameters
+    ----------
+    candidates : Iterable[Dict] or CandidateTable
+        Candidate profile objects, as for ``export_cv_review_to_csv``.
+    output_path : str, optional
+        Path to the XLSX file to be created.
+
+    Returns
+    -------
+    str
+        The absolute path of the created XLSX file.
+    """
+    if _is_candidate_table(candidates):
+        return candidates.to_xlsx(output_path)
+
+    return _write_xlsx_by_decision(
+        output_path,
+        CV_REVIEW_HEADERS,
+        (_cv_review_row(c) for c in candidates or []),
+        decision_col=CV_REVIEW_HEADERS.index("auto_decision"),
+        numeric_cols=[CV_REVIEW_HEADERS.index(h) for h in ("final_score", "worth_min", "worth_max")],
+    )
+
+
+def export_review_summary_to_xlsx(
+    agent_response: Union[str, List[Dict]],
+    output_path: str = "review_summary.xlsx",
+    job_title: Optional[str] = None
+) -> str:
+    """Export agent review response to XLSX, one sheet per decision.
+
+    XLSX counterpart of ``export_review_summary_to_csv``: same columns,
+    with Score written as a number and a frozen header row on each sheet.
+
+    Parameters
+    ----------
+    agent_response : Union[str, List[Dict]]
+        Either raw text response from agent or structured candidate list
+    output_path : str, optional
+        Path to the XLSX file to be created
+    job_title : str, optional
+        Job title to include in the export
+
+    Returns
+    -------
+    str
+        The absolute path of the created XLSX file
+    """
+    if isinstance(agent_response, str):
+        parser = ReviewResponseParser()
+        candidates = parser.feed(agent_response)
+        candidates.extend(parser.close())
+        if not job_title:
+            job_title = parser.job_title
+    else:
+        candidates = agent_response
+
     if not candidates:
-        return {
-            "error": "No candidates found in response text",
-            "csv_path": None,
-            "total_candidates": 0
-        }
-    
-    csv_path = export_review_summary_to_csv(candidates, output_csv_path)
-    
-    # Count by decision
-    stats = {
-        'RECOMMEND': 0,
-        'CONSIDER': 0,
-        'REJECT': 0
-    }
-    
-    for c in candidates:
-        decision = c.get('auto_decision', '').upper()
-        if decision in stats:
-            stats[decision] += 1
-    
-    return {
-        "csv_path": csv_path,
-        "total_candidates": len(candidates),
-        "recommended": stats['RECOMMEND'],
-        "consider": stats['CONSIDER'],
-        "reject": stats['REJECT'],
-        "candidates": candidates
-    }
+        raise ValueError("No candidates found in response")
+
+    return _write_xlsx_by_decision(
+        output_path,
+        REVIEW_SUMMARY_HEADERS,
+        (_review_summary_row(c, job_title) for c in candidates),
+        decision_col=REVIEW_SUMMARY_HEADERS.index("Decision"),
+        numeric_cols=[REVIEW_SUMMARY_HEADERS.index("Score")],
+    )
@@ -0,0 +1,713 @@
+"""Shared HTTP downloader for public Google Drive links.
+
+Used by text_parser_tools and briefing_tool. All downloads go through one
+pooled ``requests.Session`` so repeated calls reuse TLS connections, bodies
+are streamed with a size cutoff, and transient failures (connection errors,
+timeouts, 429 and 5xx) are retried with exponential backoff.
+
+``download_public_file`` streams a Drive file to a temp file instead,
+following the large-file virus-scan interstitial and resuming dropped
+transfers with HTTP Range requests. Given a cache key (the Drive file id)
+it goes through ``ResponseCache``, which keeps bodies on disk and
+revalidates them with conditional requests.
+
+``fetch`` / ``fetch_many`` are the asyncio interface: each request runs on a
+small thread pool (``requests`` is blocking) and the number of requests in
+flight per host is capped. ``download`` is the blocking equivalent for
+synchronous tool code.
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit
+
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+    from requests.structures import CaseInsensitiveDict  # type: ignore
+except Exception:
+    requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+    CaseInsensitiveDict = dict  # type: ignore
+
+
+POOL_SIZE = int(os.getenv('DRIVE_DOWNLOAD_POOL_SIZE', '16'))
+PER_HOST_LIMIT = int(os.getenv('DRIVE_DOWNLOAD_PER_HOST', '4'))
+MAX_DOWNLOAD_BYTES = int(os.getenv('DRIVE_DOWNLOAD_MAX_MB', '50')) * 1024 * 1024
+RETRIES = 3
+BACKOFF_SEC = 0.5
+BACKOFF_MAX_SEC = 8.0
+CHUNK_BYTES = 64 * 1024
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class DownloadError(Exception):
+    """A download failed for good (after retries, or on a non-retryable error)."""
+
+    def __init__(self, message: str, url: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.url = url
+        self.status = status
+
+
+class DownloadTooLarge(DownloadError):
+    """The body is larger than the caller's max_bytes."""
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: Optional[float]):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    # Only the delta-seconds form; HTTP dates fall back to plain backoff
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class Downloader:
+    """Pooled, retrying HTTP GET with per-host concurrency limits.
+
+    One instance is shared process-wide (see ``get_downloader``). The
+    session's connection pool holds ``pool_size`` connections per host, and
+    at most ``per_host_limit`` requests per host are in flight at once,
+    whether they come from ``fetch_many`` or from threads calling
+    ``download`` directly.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        per_host_limit: int = PER_HOST_LIMIT,
+        max_bytes: int = MAX_DOWNLOAD_BYTES,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF_SEC,
+        session=None,
+    ):
+        if requests is None and session is None:
+            raise RuntimeError("requests library unavailable; cannot download files.")
+        self.per_host_limit = per_host_limit
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self._session = session or self._build_session(pool_size)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="drive-download")
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @staticmethod
+    def _build_session(pool_size: int):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _slots(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slots
+
+    def _get_once(self, url: str, max_bytes: int, timeout: float, headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        with self._session.get(url, stream=True, timeout=timeout, headers=headers) as r:
+            if r.status_code in RETRY_STATUSES:
+                raise _RetryableStatus(r.status_code, _retry_after(r.headers.get("Retry-After")))
+
+            declared = r.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise DownloadTooLarge(
+                    f"Download is {int(declared)} bytes, over the {max_bytes} byte limit.",
+                    url, r.status_code,
+                )
+            body = bytearray()
+            for chunk in r.iter_content(CHUNK_BYTES):
+                body += chunk
+                if len(body) > max_bytes:
+                    raise DownloadTooLarge(
+                        f"Download exceeded the {max_bytes} byte limit.", url, r.status_code
+                    )
+            return {
+                "url": r.url,
+                "status": r.status_code,
+                "headers": r.headers,
+                "content": bytes(body),
+            }
+
+    def download(
+        self,
+        url: str,
+        timeout: float = 30,
+        max_bytes: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Blocking GET with retries.
+
+        Parameters
+        ----------
+        url : str
+            URL to fetch.
+        timeout : float
+            Connect/read timeout per attempt, in seconds.
+        max_bytes : int, optional
+            Body size cutoff; defaults to the downloader's ``max_bytes``.
+        headers : dict, optional
+            Extra request headers.
+
+        Returns
+        -------
+        dict
+            ``url`` (after redirects), ``status``, ``headers`` and ``content``.
+            Non-retryable HTTP errors (e.g. 403, 404) are returned, not raised.
+
+        Raises
+        ------
+        DownloadTooLarge
+            The body is over ``max_bytes``; never retried.
+        DownloadError
+            Retries were exhausted.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        return self._with_retries(url, lambda: self._get_once(url, max_bytes, timeout, headers))
+
+    def _with_retries(self, url: str, attempt_fn):
+        # Runs attempt_fn under the host's slot, retrying transient failures
+        slots = self._slots(url)
+        attempt = 0
+        while True:
+            with slots:
+                try:
+                    return attempt_fn()
+                except DownloadTooLarge:
+                    raise
+                except (
+                    _RetryableStatus,
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                ) as e:
+                    error = e
+            if attempt >= self.retries:
+                status = getattr(error, "status", None)
+                raise DownloadError(
+                    f"Download failed after {attempt + 1} attempts: {error}", url, status
+                ) from error
+            # Exponential backoff with jitter, unless the server said how long
+            delay = getattr(error, "retry_after", None)
+            if delay is None:
+                delay = min(BACKOFF_MAX_SEC, self.backoff * (2 ** attempt)) * (0.5 + random.random() / 2)
+            time.sleep(delay)
+            attempt += 1
+
+    def _stream_to_file(
+        self,
+        url: str,
+        out,
+        state: Dict[str, Any],
+        max_bytes: int,
+        timeout: float,
+        headers: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        req_headers = dict(headers or {})
+        if state["written"]:
+            # Resume after a dropped connection; If-Range makes the server
+            # send the whole file again if it changed in between
+            req_headers["Range"] = f"bytes={state['written']}-"
+            if state["validator"]:
+                req_headers["If-Range"] = state["validator"]
+
+        with self._session.get(url, stream=True, timeout=timeout, headers=req_headers) as r:
+            if r.status_code in RETRY_STATUSES:
+                raise _RetryableStatus(r.status_code, _retry_after(r.headers.get("Retry-After")))
+
+            resumed = False
+            if state["written"]:
+                content_range = r.headers.get("Content-Range", "")
+                if r.status_code == 206 and content_range.startswith(f"bytes {state['written']}-"):
+                    resumed = True
+                    state["resumes"] += 1
+                else:
+                    # Range ignored (200) or answered for the wrong offset:
+                    # start over, without a Range header for a bad 206
+                    state["written"] = 0
+                    if r.status_code == 206:
+                        raise requests.ConnectionError(f"Unexpected Content-Range: {content_range!r}")
+            if not resumed:
+                out.seek(0)
+                out.truncate()
+                state["status"] = r.status_code
+                state["headers"] = r.headers
+                state["url"] = r.url
+                state["validator"] = r.headers.get("ETag") or r.headers.get("Last-Modified")
+                state["cookies"] = r.cookies.get_dict()
+            declared = r.headers.get("Content-Length")
+            if declared and declared.isdigit() and state["written"] + int(declared) > max_bytes:
+                raise DownloadTooLarge(
+                    f"Download is {state['written'] + int(declared)} bytes, over the {max_bytes} byte limit.",
+                    url, r.status_code,
+                )
+            out.seek(state["written"])
+            for chunk in r.iter_content(CHUNK_BYTES):
+                out.write(chunk)
+                state["written"] += len(chunk)
+                if state["written"] > max_bytes:
+                    raise DownloadTooLarge(
+                        f"Download exceeded the {max_bytes} byte limit.", url, r.status_code
+                    )
+            return self._finish_file(out, state)
+
+    @staticmethod
+    def _finish_file(out, state: Dict[str, Any]) -> Dict[str, Any]:
+        out.flush()
+        out.seek(0)
+        return {
+            "url": state["url"],
+            "status": state["status"],
+            "headers": state["headers"],
+            "file": out,
+            "size": state["written"],
+            "resumes": state["resumes"],
+            "cookies": state["cookies"],
+        }
+
+    def download_to_file(
+        self,
+        url: str,
+        timeout: float = 30,
+        max_bytes: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Stream a download into an anonymous temp file, resuming with HTTP Range.
+
+        A connection dropped mid-body counts as a retry. The next attempt
+        asks for the remaining bytes with ``Range`` (and ``If-Range``), and
+        starts over if the server answers with the full file instead.
+
+        Returns
+        -------
+        dict
+            ``url``, ``status``, ``headers``, ``file`` (rewound temp file,
+            owned by the caller), ``size``, ``resumes`` and ``cookies`` (the
+            cookies this response set, name -> value).
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        out = tempfile.TemporaryFile()
+        state = {"written": 0, "validator": None, "resumes": 0,
+                 "status": None, "headers": None, "url": url, "cookies": {}}
+        try:
+            return self._with_retries(
+                url, lambda: self._stream_to_file(url, out, state, max_bytes, timeout, headers)
+            )
+        except BaseException:
+            out.close()
+            raise
+
+    async def fetch(self, url: str, **kwargs) -> Dict[str, Any]:
+        """Async ``download``; runs on the downloader's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: self.download(url, **kwargs))
+
+    async def fetch_many(self, urls: Iterable[str], **kwargs) -> List[Any]:
+        """Fetch URLs concurrently.
+
+        Returns one entry per URL, in order: the ``download`` result dict,
+        or the exception that URL raised.
+        """
+        return await asyncio.gather(
+            *(self.fetch(url, **kwargs) for url in urls), return_exceptions=True
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+
+_downloader_lock = threading.Lock()
+_downloader: Optional[Downloader] = None
+
+
+def get_downloader() -> Downloader:
+    """Process-wide shared downloader (created on first use)."""
+    global _downloader
+    with _downloader_lock:
+        if _downloader is None:
+            _downloader = Downloader()
+        return _downloader
+
+
+def download(url: str, **kwargs) -> Dict[str, Any]:
+    """``Downloader.download`` on the shared downloader."""
+    return get_downloader().download(url, **kwargs)
+
+
+# Drive answers uc?export=download for files over its virus-scan size
+# limit with an HTML page; the real download needs the confirm token on it
+_DRIVE_FORM_PAT = re.compile(r'<form[^>]*id="download-form"[^>]*action="([^"]+)"', re.I)
+_DRIVE_INPUT_PAT = re.compile(r'<input[^>]*type="hidden"[^>]*name="([^"]+)"[^>]*value="([^"]*)"', re.I)
+_DRIVE_CONFIRM_HREF_PAT = re.compile(r'href="(/uc\?export=download[^"]*confirm=[^"]+)"', re.I)
+_DRIVE_CONFIRM_PAT = re.compile(r'confirm=([0-9A-Za-z_-]+)')
+INTERSTITIAL_MAX_BYTES = 512 * 1024
+
+
+def drive_confirm_url(page: str, url: str) -> Optional[str]:
+    """URL that confirms a Drive virus-scan interstitial, or None.
+
+    Handles the current download form (action plus hidden inputs) and the
+    older ``/uc?...&confirm=<token>`` link.
+    """
+    form = _DRIVE_FORM_PAT.search(page)
+    if form:
+        action = html.unescape(form.group(1))
+        params = {name: html.unescape(value) for name, value in _DRIVE_INPUT_PAT.findall(page)}
+        if params:
+            return urljoin(url, action) + "?" + urlencode(params)
+    href = _DRIVE_CONFIRM_HREF_PAT.search(page)
+    if href:
+        return urljoin(url, html.unescape(href.group(1)))
+    token = _DRIVE_CONFIRM_PAT.search(page)
+    if token:
+        return f"{url}&confirm={token.group(1)}"
+    return None
+
+
+def _download_past_scan_page(
+    url: str, timeout: float, max_bytes: Optional[int], headers: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    dl = get_downloader()
+    result = dl.download_to_file(url, timeout=timeout, max_bytes=max_bytes, headers=headers)
+    result["interstitial"] = False
+    content_type = (result["headers"] or {}).get("Content-Type", "")
+    if result["status"] != 200 or not content_type.startswith("text/html"):
+        return result
+    if result["size"] > INTERSTITIAL_MAX_BYTES:
+        return result
+
+    page = result["file"].read().decode("utf-8", errors="replace")
+    result["file"].seek(0)
+    confirm = drive_confirm_url(page, result["url"])
+    if confirm is None:
+        # Older flow: the token only comes as a download_warning cookie.
+        # Only this response's cookies count (the shared session's jar
+        # holds tokens for other files), and it must name this file
+        file_id = parse_qs(urlsplit(url).query).get("id", [""])[0]
+        for name, value in result["cookies"].items():
+            if name == "download_warning" or (file_id and name.startswith("download_warning")
+                                              and name.endswith("_" + file_id)):
+                confirm = f"{url}&confirm={value}"
+                break
+    if confirm is None:
+        if "Google Drive" in page:
+            result["interstitial"] = "unresolved"
+        return result
+
+    result["file"].close()
+    confirmed = dl.download_to_file(confirm, timeout=timeout, max_bytes=max_bytes, headers=headers)
+    confirmed["interstitial"] = True
+    return confirmed
+
+
+def download_public_file(
+    url: str,
+    timeout: float = 30,
+    max_bytes: Optional[int] = None,
+    cache_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Download a public Drive file to a temp file, passing the scan interstitial.
+
+    Same result as ``Downloader.download_to_file``, plus ``interstitial``:
+    True if a confirm page was followed, or "unresolved" if Drive sent an
+    HTML page with no confirm token (the page is then the result).
+
+    With a ``cache_key`` (normally the Drive file id) and the response
+    cache enabled, a fresh cached copy is returned without a request, a
+    stale one is revalidated with If-None-Match / If-Modified-Since, and
+    new 200 responses are stored. ``cache`` in the result is then "hit",
+    "revalidated" or "miss"; it is None when the cache was not used.
+    Cache failures (unwritable directory, corrupt index, bad settings)
+    never fail the download: it goes ahead uncached and ``cache_error``
+    says why.
+    """
+    cache = entry = None
+    cache_error = None
+    if cache_key:
+        try:
+            cache = get_response_cache()
+            entry = cache.lookup(cache_key) if cache is not None else None
+            if entry is not None and entry["fresh"]:
+                return cache.open(entry, "hit")
+        except CACHE_ERRORS as e:
+            # The cache fails open: download as if it were disabled
+            cache = entry = None
+            cache_error = f"Response cache unavailable: {e}"
+
+    headers = cache.conditional_headers(entry) if entry is not None else None
+    result = _download_past_scan_page(url, timeout, max_bytes, headers)
+    if entry is not None and result["status"] == 304:
+        result["file"].close()
+        try:
+            cache.touch(cache_key)
+            return cache.open(entry, "revalidated")
+        except CACHE_ERRORS as e:
+            # Stored body unreadable after all: fetch it unconditionally
+            cache = None
+            cache_error = f"Response cache unavailable: {e}"
+            result = _download_past_scan_page(url, timeout, max_bytes, None)
+    result["cache"] = None
+    if cache is not None and result["status"] == 200 and result["interstitial"] != "unresolved":
+        try:
+            cache.put(cache_key, result)
+            result["cache"] = "miss"
+        except CACHE_ERRORS as e:
+            result["file"].seek(0)
+            cache_error = f"Response not cached: {e}"
+    result["cache_error"] = cache_error
+    return result
+
+
+def download_many(urls: Iterable[str], **kwargs) -> List[Any]:
+    """Fetch many URLs concurrently from synchronous code.
+
+    Runs ``fetch_many`` on a fresh event loop; results are in URL order,
+    with exceptions in place of failed downloads.
+    """
+    return asyncio.run(get_downloader().fetch_many(list(urls), **kwargs))
+
+
+def _user_cache_dir() -> str:
+    """Per-user cache root, created private (0700) if missing.
+
+    %LOCALAPPDATA%/hireit on Windows, else $XDG_CACHE_HOME/hireit or
+    ~/.cache/hireit.
+    """
+    if os.name == 'nt':
+        base = os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    root = os.path.join(base, 'hireit')
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    return root
+
+
+class ResponseCache:
+    """On-disk cache of public Drive downloads, keyed by file id.
+
+    Bodies are stored as files under ``directory`` next to a SQLite index
+    holding each entry's ETag / Last-Modified, content headers and fetch
+    time. Entries younger than ``ttl_sec`` are served without a request;
+    older ones are revalidated with a conditional request, and a 304
+    answer serves the stored body. Once the stored bodies exceed
+    ``max_bytes`` the least recently used entries are evicted. Bodies can
+    be CVs, so a directory the cache creates is private to the user.
+    """
+
+    # Response headers kept with a cached body
+    KEPT_HEADERS = ("Content-Type", "Content-Disposition", "ETag", "Last-Modified")
+
+    def __init__(self, directory: str, ttl_sec: float = 300, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Shared by download threads; every access goes through _lock
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " cache_key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._conn.commit()
+
+    def _body_path(self, cache_key: str) -> str:
+        name = hashlib.sha1(cache_key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".body")
+
+    def lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for ``cache_key`` (with ``fresh``), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, size, fetched_at FROM responses WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            if row is None or not os.path.exists(self._body_path(cache_key)):
+                return None
+        url, headers, size, fetched_at = row
+        return {
+            "cache_key": cache_key,
+            "url": url,
+            "headers": json.loads(headers),
+            "size": size,
+            "fresh": time.time() - fetched_at < self.ttl_sec,
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a stored entry."""
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def open(self, entry: Dict[str, Any], how: str) -> Dict[str, Any]:
+        """A download result reading the stored body; the caller closes ``file``."""
+        with self._lock:
+            if how == "hit":
+                self.hits += 1
+            else:
+                self.revalidated += 1
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE cache_key = ?",
+                (time.time(), entry["cache_key"])
+            )
+            self._conn.commit()
+            # Opened under the lock so eviction cannot unlink it first;
+            # once open, a later unlink leaves this handle readable
+            body = open(self._body_path(entry["cache_key"]), "rb")
+        return {
+            "url": entry["url"],
+            "status": 200,
+            "headers": CaseInsensitiveDict(entry["headers"]),
+            "file": body,
+            "size": entry["size"],
+            "resumes": 0,
+            "cookies": {},
+            "interstitial": False,
+            "cache": how,
+            "cache_error": None,
+        }
+
+    def touch(self, cache_key: str) -> None:
+        """Restart the TTL of an entry the server confirmed unchanged."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ? WHERE cache_key = ?",
+                (time.time(), cache_key)
+            )
+            self._conn.commit()
+
+    def put(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Copy a download result's body into the cache; rewinds its file."""
+        with self._lock:
+            self.misses += 1
+        if result["size"] > self.max_bytes:
+            return
+        headers = {k: result["headers"][k] for k in self.KEPT_HEADERS if k in result["headers"]}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                shutil.copyfileobj(result["file"], tmp, CHUNK_BYTES)
+            with self._lock:
+                os.replace(tmp_path, self._body_path(cache_key))
+                now = time.time()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (cache_key, url, headers, size, fetched_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key, result["url"], json.dumps(headers), result["size"], now, now)
+                )
+                self._evict()
+                self._conn.commit()
+        finally:
+            result["file"].seek(0)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for cache_key, size in self._conn.execute(
+            "SELECT cache_key, size FROM responses ORDER BY last_used"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+            try:
+                os.unlink(self._body_path(cache_key))
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/revalidation/miss/eviction counters and current size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# What a broken cache directory or index raises; download_public_file
+# treats these as "no cache"
+CACHE_ERRORS = (OSError, sqlite3.Error, ValueError)
+
+_cache_lock = threading.Lock()
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None if disabled.
+
+    Configured with ``DRIVE_DOWNLOAD_CACHE_DIR`` (empty string disables
+    it; default ``drive_download`` in the per-user cache directory, see
+    ``_user_cache_dir``), ``DRIVE_DOWNLOAD_CACHE_TTL_SEC`` and
+    ``DRIVE_DOWNLOAD_CACHE_MAX_MB``.
+    """
+    global _response_cache
+    directory = os.getenv('DRIVE_DOWNLOAD_CACHE_DIR')
+    if directory is None:
+        directory = os.path.join(_user_cache_dir(), 'drive_download')
+    if not directory:
+        return None
+    ttl_sec = float(os.getenv('DRIVE_DOWNLOAD_CACHE_TTL_SEC', '300'))
+    max_bytes = int(os.getenv('DRIVE_DOWNLOAD_CACHE_MAX_MB', '256')) * 1024 * 1024
+    with _cache_lock:
+        if _response_cache is None or _response_cache.directory != directory:
+            _response_cache = ResponseCache(directory, ttl_sec=ttl_sec, max_bytes=max_bytes)
+        _response_cache.ttl_sec = ttl_sec
+        _response_cache.max_bytes = max_bytes
+        return _response_cache
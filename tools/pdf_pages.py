@@ -0,0 +1,115 @@
+"""Per-page parallel PDF text extraction.
+
+Shared by cv_parser_tool and text_parser_tools. A long PDF's pages are
+split into ranges and extracted on a process pool, then reassembled in
+page order.
+
+- Pools are created once per worker count and reused for every document.
+- Each document reaches the workers once: it is written to a temp file
+  (unless it already is a local file) and only the path travels with each
+  page range.
+- Pool workers, and extract workers started with ``mark_worker`` as
+  initializer, never split again, so process pools are not nested.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+import os
+import shutil
+import tempfile
+import threading
+
+
+# PDFs shorter than this are never split across processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('CV_PDF_PARALLEL_MIN_PAGES', '50'))
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+# Set in worker processes by mark_worker
+_in_worker = False
+
+
+def mark_worker() -> None:
+    """Pool initializer: PDFs extracted in this process are never split."""
+    global _in_worker
+    _in_worker = True
+
+
+def split_workers(page_count: int, workers: int) -> int:
+    """Processes to split a ``page_count``-page PDF across, or 0 to stay serial.
+
+    ``workers`` is capped at the CPU count; extra processes only add
+    start-up and scheduling cost.
+    """
+    if _in_worker or page_count < PDF_PARALLEL_MIN_PAGES:
+        return 0
+    workers = min(workers or 0, os.cpu_count() or 1)
+    return workers if workers > 1 else 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, initializer=mark_worker)
+        return pool
+
+
+def _drop_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_range(path: str, start: int, stop: int) -> List[str]:
+    """Extract pages ``start``..``stop - 1`` of the PDF at ``path``."""
+    import PyPDF2  # type: ignore
+    with open(path, "rb") as fh:
+        reader = PyPDF2.PdfReader(fh)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _write_temp(source: Any) -> str:
+    """Write a file object or bytes-like PDF to a temp file; returns its path."""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            if hasattr(source, "read"):
+                source.seek(0)
+                shutil.copyfileobj(source, out)
+            else:
+                out.write(source)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def extract_pages(source: Any, page_count: int, workers: int) -> List[str]:
+    """Texts of the first ``page_count`` pages, extracted on a shared pool.
+
+    ``source`` is the path of a local PDF, a seekable binary file object
+    or a bytes-like object (bytes, memoryview, mmap). Pick ``workers`` with
+    ``split_workers``. If the pool breaks, the pages are extracted here.
+    """
+    path = source if isinstance(source, str) else _write_temp(source)
+    try:
+        # A few ranges per worker so one slow range does not stall the rest
+        chunk = max(1, -(-page_count // (workers * 2)))
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        pool = _get_pool(workers)
+        try:
+            futures = [pool.submit(_extract_range, path, a, b) for a, b in ranges]
+            parts: List[str] = []
+            for future in futures:
+                parts.extend(future.result())
+            return parts
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory); start afresh next time
+            _drop_pool(workers, pool)
+            return _extract_range(path, 0, page_count)
+    finally:
+        if path is not source:
+            os.unlink(path)
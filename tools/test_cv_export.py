@@ -1,6 +1,16 @@
 """Test the CV review export functionality"""
 
-from cv_review_excel import create_review_summary_from_text
+import csv
+import os
+import tempfile
+
+import openpyxl
+
+from cv_review_excel import (
+    create_review_summary_from_text,
+    export_cv_review_to_xlsx,
+    export_review_summary_to_xlsx,
+)
 
 # Sample agent response (like what Reviewer Agent would output)
 sample_response = """
@@ -59,6 +69,45 @@ if __name__ == "__main__":
     print(f"   🟢 Recommended: {result['recommended']}")
     print(f"   🟡 Consider: {result['consider']}")
     print(f"   🔴 Reject: {result['reject']}")
+    with open(result['csv_path'], newline='', encoding='utf-8') as f:
+        job_titles = {row['Job Title'] for row in csv.DictReader(f)}
+    assert job_titles == {"Senior Backend Developer"}, job_titles
+
     print("\n📋 Candidates parsed:")
     for c in result['candidates']:
         print(f"   - {c['name']}: {c['final_score']}/10 ({c['auto_decision']})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx_path = export_review_summary_to_xlsx(sample_response, os.path.join(tmp, "review_summary.xlsx"))
+        wb = openpyxl.load_workbook(xlsx_path)
+        sheets = {ws.title: [row[0] for row in ws.iter_rows(min_row=2, values_only=True)] for ws in wb}
+        assert sheets == {
+            "Recommended": ["John Doe", "Jane Smith"],
+            "Consider": ["Bob Wilson", "Alice Johnson"],
+            "Not Recommended": ["Charlie Brown"],
+        }, sheets
+        ws = wb["Consider"]
+        assert ws.freeze_panes == "A2" and ws["B3"].value == 5.5 and ws["H2"].value == "Senior Backend Developer"
+        wb.close()
+    print("\n✅ XLSX Export Successful: one sheet per decision, numeric scores, frozen header")
+
+    # Batch review decisions land in the same three sheets; anything else
+    # shares a single "Other" sheet
+    batch_candidates = [
+        {"file_name": "a.pdf", "name": "A", "scores": {"final_score": 8.1}, "auto_decision": "pass"},
+        {"file_name": "b.pdf", "name": "B", "scores": {"final_score": 6.0}, "auto_decision": "borderline"},
+        {"file_name": "c.pdf", "name": "C", "scores": {"final_score": 3.2}, "auto_decision": "fail"},
+        {"file_name": "d.pdf", "name": "D"},
+        {"file_name": "e.pdf", "name": "E", "auto_decision": "unsure"},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        wb = openpyxl.load_workbook(export_cv_review_to_xlsx(batch_candidates, os.path.join(tmp, "batch.xlsx")))
+        sheets = {ws.title: [row[1] for row in ws.iter_rows(min_row=2, values_only=True)] for ws in wb}
+        assert sheets == {
+            "Recommended": ["A"],
+            "Consider": ["B"],
+            "Not Recommended": ["C"],
+            "Other": ["D", "E"],
+        }, sheets
+        wb.close()
+    print("✅ XLSX Export Successful: pass / borderline / fail sheets, one Other sheet")
@@ -0,0 +1,497 @@
+"""Test drive_download against a local HTTP stand-in server"""
+
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import drive_download
+from drive_download import Downloader, DownloadError, DownloadTooLarge
+
+
+# Served by /resume and /no-range; distinct bytes so a misplaced resume shows
+_RESUMABLE = bytes(range(256)) * 1024
+
+_SCAN_FORM_PAGE = b"""<html><head><title>Google Drive - Virus scan warning</title></head><body>
+<form id="download-form" action="/confirmed" method="get">
+<input type="submit" value="Download anyway"/>
+<input type="hidden" name="id" value="big1">
+<input type="hidden" name="export" value="download">
+<input type="hidden" name="confirm" value="t">
+<input type="hidden" name="uuid" value="5a1b&amp;c">
+</form></body></html>"""
+
+_SCAN_LINK_PAGE = b"""<html><head><title>Google Drive - Virus scan warning</title></head><body>
+<a id="uc-download-link" href="/uc?export=download&amp;confirm=Ab3_x&amp;id=big2">Download anyway</a>
+</body></html>"""
+
+_SCAN_NO_TOKEN_PAGE = b"<html><title>Google Drive - Quota exceeded</title><body>Too many users</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # set per server
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.state["lock"]:
+            self.state["connections"] += 1
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.state
+        with state["lock"]:
+            state["hits"][self.path] = state["hits"].get(self.path, 0) + 1
+            hits = state["hits"][self.path]
+
+        if self.path.startswith("/ok/"):
+            self._send(200, b"x" * int(self.path.rsplit("/", 1)[-1]))
+        elif self.path == "/flaky":
+            if hits <= 2:
+                self._send(503, b"busy", {"Retry-After": "0"})
+            else:
+                self._send(200, b"finally")
+        elif self.path == "/always-503":
+            self._send(503, b"busy", {"Retry-After": "0"})
+        elif self.path == "/drop":
+            if hits == 1:
+                # Promise 1000 bytes, send 10, hang up
+                self.send_response(200)
+                self.send_header("Content-Length", "1000")
+                self.end_headers()
+                self.wfile.write(b"0123456789")
+                self.wfile.flush()
+                self.close_connection = True
+            else:
+                self._send(200, b"y" * 1000)
+        elif self.path == "/declared-big":
+            self.send_response(200)
+            self.send_header("Content-Length", str(10 * 1024 * 1024))
+            self.end_headers()
+            self.close_connection = True
+        elif self.path == "/undeclared-big":
+            # No Content-Length: only the streamed byte count can stop it
+            self.send_response(200)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                for _ in range(64):
+                    self.wfile.write(b"z" * 65536)
+            except OSError:
+                pass
+        elif self.path.startswith("/slow/"):
+            with state["lock"]:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.1)
+            with state["lock"]:
+                state["in_flight"] -= 1
+            self._send(200, b"slow")
+        elif self.path in ("/resume", "/no-range"):
+            range_header = self.headers.get("Range")
+            with state["lock"]:
+                state["ranges"].append((range_header, self.headers.get("If-Range")))
+            if hits == 1:
+                # Send two and a half chunks, then hang up; only the whole
+                # chunks reach the file before the connection error
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(_RESUMABLE)))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                self.wfile.write(_RESUMABLE[:int(2.5 * drive_download.CHUNK_BYTES)])
+                self.wfile.flush()
+                self.close_connection = True
+            elif self.path == "/resume" and range_header and self.headers.get("If-Range") == '"v1"':
+                start = int(range_header[len("bytes="):].rstrip("-"))
+                self._send(206, _RESUMABLE[start:], {
+                    "Content-Range": f"bytes {start}-{len(_RESUMABLE) - 1}/{len(_RESUMABLE)}",
+                    "ETag": '"v1"',
+                })
+            else:
+                self._send(200, _RESUMABLE, {"ETag": '"v1"'})
+        elif self.path.startswith("/scan-form"):
+            self._send(200, _SCAN_FORM_PAGE, {"Content-Type": "text/html; charset=utf-8"})
+        elif self.path.startswith("/scan-link"):
+            self._send(200, _SCAN_LINK_PAGE, {"Content-Type": "text/html; charset=utf-8"})
+        elif self.path.startswith("/scan-cookie"):
+            query = parse_qs(urlsplit(self.path).query)
+            if "confirm" in query:
+                self._send(200, json.dumps(query, sort_keys=True).encode(),
+                           {"Content-Type": "application/octet-stream"})
+            else:
+                file_id = query["id"][0]
+                self._send(200, _SCAN_NO_TOKEN_PAGE, {
+                    "Content-Type": "text/html; charset=utf-8",
+                    "Set-Cookie": f"download_warning_42_{file_id}=tok_{file_id}; Path=/",
+                })
+        elif self.path.startswith("/scan-no-token"):
+            self._send(200, _SCAN_NO_TOKEN_PAGE, {"Content-Type": "text/html; charset=utf-8"})
+        elif self.path.startswith("/etag/"):
+            name = self.path.rsplit("/", 1)[-1]
+            version = state["versions"].get(name, 1)
+            etag = f'"{name}-{version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+                return
+            with state["lock"]:
+                state["bodies_sent"] += 1
+            self._send(200, f"{name} v{version}\n".encode() * 100, {
+                "ETag": etag,
+                "Last-Modified": "Tue, 06 Oct 2026 09:00:00 GMT",
+                "Content-Type": "text/plain",
+            })
+        elif self.path.startswith("/confirmed"):
+            query = parse_qs(urlsplit(self.path).query)
+            self._send(200, json.dumps(query, sort_keys=True).encode(),
+                       {"Content-Type": "application/octet-stream"})
+        elif self.path.startswith("/uc"):
+            self._send(200, json.dumps({"title": "Backend Developer"}).encode(),
+                       {"Content-Type": "application/json"})
+        else:
+            self._send(404, b"missing")
+
+
+_server = None
+
+
+def stand_in():
+    """Start the stand-in server once; returns (base_url, state)."""
+    global _server
+    if _server is None:
+        state = {"lock": threading.Lock(), "hits": {}, "connections": 0, "in_flight": 0, "max_in_flight": 0,
+                 "ranges": [], "versions": {}, "bodies_sent": 0}
+        handler = type("Handler", (_Handler,), {"state": state})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _server = (server, f"http://127.0.0.1:{server.server_address[1]}", state)
+    return _server[1], _server[2]
+
+
+@contextlib.contextmanager
+def response_cache(ttl_sec):
+    """Point the shared response cache at a temp dir for one test."""
+    keys = ("DRIVE_DOWNLOAD_CACHE_DIR", "DRIVE_DOWNLOAD_CACHE_TTL_SEC")
+    saved = {k: os.environ.get(k) for k in keys}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DRIVE_DOWNLOAD_CACHE_DIR"] = tmp
+        os.environ["DRIVE_DOWNLOAD_CACHE_TTL_SEC"] = str(ttl_sec)
+        try:
+            yield drive_download.get_response_cache()
+        finally:
+            drive_download.get_response_cache().close()
+            drive_download._response_cache = None
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+def _read_cached(url, key):
+    r = drive_download.download_public_file(url, cache_key=key)
+    with r["file"] as fh:
+        return r["cache"], fh.read()
+
+
+def test_reuses_connections():
+    base, state = stand_in()
+    dl = Downloader(backoff=0)
+    before = state["connections"]
+    for _ in range(10):
+        r = dl.download(f"{base}/ok/2048")
+        assert r["status"] == 200 and len(r["content"]) == 2048
+    assert state["connections"] - before == 1, state["connections"] - before
+    dl.close()
+
+
+def test_retries_then_succeeds():
+    base, state = stand_in()
+    dl = Downloader(backoff=0)
+    r = dl.download(f"{base}/flaky")
+    assert r["content"] == b"finally" and state["hits"]["/flaky"] == 3
+    r = dl.download(f"{base}/drop")
+    assert r["content"] == b"y" * 1000 and state["hits"]["/drop"] == 2
+    try:
+        dl.download(f"{base}/always-503")
+        raise AssertionError("expected DownloadError")
+    except DownloadError as e:
+        assert e.status == 503 and state["hits"]["/always-503"] == dl.retries + 1
+    dl.close()
+
+
+def test_http_errors_are_returned():
+    base, state = stand_in()
+    dl = Downloader(backoff=0)
+    r = dl.download(f"{base}/nope")
+    assert r["status"] == 404 and state["hits"]["/nope"] == 1
+    dl.close()
+
+
+def test_max_size_cutoff():
+    base, state = stand_in()
+    dl = Downloader(backoff=0, max_bytes=1024 * 1024)
+    for path in ("/declared-big", "/undeclared-big"):
+        try:
+            dl.download(base + path)
+            raise AssertionError(f"expected DownloadTooLarge for {path}")
+        except DownloadTooLarge:
+            pass
+        assert state["hits"][path] == 1, "oversized bodies must not be retried"
+    assert len(dl.download(f"{base}/ok/4096", max_bytes=4096)["content"]) == 4096
+    dl.close()
+
+
+def test_fetch_many_limits_per_host():
+    base, state = stand_in()
+    dl = Downloader(backoff=0, per_host_limit=3)
+    urls = [f"{base}/slow/{i}" for i in range(12)] + [f"{base}/nope-async"]
+    results = asyncio.run(dl.fetch_many(urls))
+    assert [r["status"] for r in results] == [200] * 12 + [404]
+    assert [r["url"] for r in results] == urls
+    assert state["max_in_flight"] == 3, state["max_in_flight"]
+    dl.close()
+
+
+def test_download_to_file_resumes_with_range():
+    base, state = stand_in()
+    dl = Downloader(backoff=0)
+    state["ranges"].clear()
+    r = dl.download_to_file(f"{base}/resume")
+    with r["file"] as fh:
+        assert fh.read() == _RESUMABLE
+    assert r["status"] == 200 and r["size"] == len(_RESUMABLE) and r["resumes"] == 1
+    assert state["ranges"] == [(None, None), (f"bytes={2 * drive_download.CHUNK_BYTES}-", '"v1"')], state["ranges"]
+
+    # A server that ignores Range sends the whole file again
+    r = dl.download_to_file(f"{base}/no-range")
+    with r["file"] as fh:
+        assert fh.read() == _RESUMABLE
+    assert r["size"] == len(_RESUMABLE) and r["resumes"] == 0
+
+    try:
+        dl.download_to_file(f"{base}/undeclared-big", max_bytes=1024 * 1024)
+        raise AssertionError("expected DownloadTooLarge")
+    except DownloadTooLarge:
+        pass
+    dl.close()
+
+
+def test_download_public_file_follows_scan_page():
+    base, state = stand_in()
+    r = drive_download.download_public_file(f"{base}/scan-form?export=download&id=big1")
+    with r["file"] as fh:
+        query = json.loads(fh.read())
+    assert r["interstitial"] is True
+    assert query == {"confirm": ["t"], "export": ["download"], "id": ["big1"], "uuid": ["5a1b&c"]}
+
+    r = drive_download.download_public_file(f"{base}/scan-link?export=download&id=big2")
+    with r["file"] as fh:
+        assert json.loads(fh.read()) == {"title": "Backend Developer"}
+    assert r["interstitial"] is True and state["hits"]["/uc?export=download&confirm=Ab3_x&id=big2"] == 1
+
+    r = drive_download.download_public_file(f"{base}/scan-cookie?export=download&id=big4")
+    with r["file"] as fh:
+        assert json.loads(fh.read())["confirm"] == ["tok_big4"]
+    assert r["interstitial"] is True
+
+    # big4's token is still in the shared session's cookie jar; it must
+    # not confirm another file
+    r = drive_download.download_public_file(f"{base}/scan-no-token?id=big3")
+    with r["file"] as fh:
+        assert fh.read() == _SCAN_NO_TOKEN_PAGE
+    assert r["interstitial"] == "unresolved"
+
+    r = drive_download.download_public_file(f"{base}/ok/10")
+    r["file"].close()
+    assert r["interstitial"] is False and r["size"] == 10
+
+
+def test_response_cache_revalidates():
+    base, state = stand_in()
+    url = f"{base}/etag/listing"
+    with response_cache(ttl_sec=0) as cache:
+        sent = state["bodies_sent"]
+        how, body = _read_cached(url, "listing")
+        assert how == "miss" and body.startswith(b"listing v1")
+        # Stale straight away: revalidated with If-None-Match, body from disk
+        assert _read_cached(url, "listing") == ("revalidated", body)
+        assert state["bodies_sent"] == sent + 1
+
+        state["versions"]["listing"] = 2
+        how, body = _read_cached(url, "listing")
+        assert how == "miss" and body.startswith(b"listing v2")
+        assert state["bodies_sent"] == sent + 2
+        assert cache.stats()["revalidated"] == 1 and cache.stats()["entries"] == 1
+
+    with response_cache(ttl_sec=3600):
+        _read_cached(url, "listing")
+        hits = state["hits"][urlsplit(url).path]
+        assert _read_cached(url, "listing")[0] == "hit"
+        assert state["hits"][urlsplit(url).path] == hits, "fresh entries need no request"
+
+
+def test_response_cache_evicts_least_recently_used():
+    base, state = stand_in()
+    dl = Downloader(backoff=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = drive_download.ResponseCache(tmp, ttl_sec=3600, max_bytes=1200)
+        for name in ("a", "b", "c"):
+            r = dl.download_to_file(f"{base}/etag/{name}")
+            with r["file"]:
+                cache.put(name, r)
+            assert r["size"] == 500
+            if name == "b":
+                cache.open(cache.lookup("a"), "hit")["file"].close()
+        # "a" was used after it was stored, so "b" is the oldest
+        assert cache.lookup("b") is None and cache.lookup("a") and cache.lookup("c")
+        assert cache.stats()["evictions"] == 1 and cache.stats()["size_bytes"] == 1000
+        assert len([f for f in os.listdir(tmp) if f.endswith(".body")]) == 2
+        cache.close()
+    dl.close()
+
+
+def test_response_cache_fails_open():
+    base, state = stand_in()
+    url = f"{base}/etag/open"
+    saved = os.environ.get("DRIVE_DOWNLOAD_CACHE_DIR")
+    os.environ["DRIVE_DOWNLOAD_CACHE_DIR"] = "/dev/null/cache"
+    try:
+        r = drive_download.download_public_file(url, cache_key="open")
+        with r["file"] as fh:
+            assert fh.read().startswith(b"open v1")
+        assert r["cache"] is None and "Response cache unavailable" in r["cache_error"]
+    finally:
+        drive_download._response_cache = None
+        if saved is None:
+            os.environ.pop("DRIVE_DOWNLOAD_CACHE_DIR", None)
+        else:
+            os.environ["DRIVE_DOWNLOAD_CACHE_DIR"] = saved
+
+    # Directory gone after the cache opened: the body cannot be stored
+    with response_cache(ttl_sec=3600) as cache:
+        for name in os.listdir(cache.directory):
+            os.unlink(os.path.join(cache.directory, name))
+        os.rmdir(cache.directory)
+        r = drive_download.download_public_file(url, cache_key="open")
+        with r["file"] as fh:
+            assert fh.read().startswith(b"open v1")
+        assert r["cache"] is None and "Response not cached" in r["cache_error"]
+        os.makedirs(cache.directory)
+
+
+def test_briefing_tool_uses_downloader():
+    base, state = stand_in()
+    import briefing_tool
+
+    with response_cache(ttl_sec=3600):
+        for how in ("miss", "hit"):
+            out = briefing_tool.get_public_text_or_json.fn(f"{base}/uc?export=download&id=abc123")
+            assert out["ok"] and out["obj"] == {"title": "Backend Developer"}
+            assert out["meta"]["cache"] == how
+    assert drive_download.get_downloader() is drive_download.get_downloader()
+
+
+def test_tools_report_missing_drive_download():
+    # Imported without -p tools, the sibling module is missing but requests
+    # is not; the error must say which one
+    import briefing_tool
+    import text_parser_tools
+
+    link = "https://drive.google.com/file/d/abc123/view"
+    for module in (briefing_tool, text_parser_tools):
+        module.drive_download = None
+    try:
+        out = briefing_tool.get_public_text_or_json.fn(link)
+        assert not out["ok"] and "drive_download" in out["error"], out
+        out = text_parser_tools._parse_drive_public_link_impl(link, include_warnings=True)
+        assert out["text"] == "" and "drive_download" in out["meta"]["warnings"][0], out
+    finally:
+        for module in (briefing_tool, text_parser_tools):
+            module.drive_download = drive_download
+
+
+def _blank_pdf(pages: int) -> bytes:
+    import io
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_parallel_pdf_pages_from_temp_file():
+    # Drive downloads are parsed from a mapping of an unnamed temp file;
+    # split PDFs must still reach the worker processes
+    import pdf_pages
+    import text_parser_tools
+
+    pages = pdf_pages.PDF_PARALLEL_MIN_PAGES + 10
+    meta = {"warnings": []}
+    with tempfile.TemporaryFile() as fh:
+        fh.write(_blank_pdf(pages))
+        fh.flush()
+        with text_parser_tools._map_fileobj(fh) as mapping:
+            parsed = text_parser_tools._parse_bytes(mapping, "pdf", "utf-8", 1000, meta, pdf_page_workers=2)
+            # Straight to the pool, whatever the CPU count here
+            assert pdf_pages.extract_pages(mapping, pages, 2) == [""] * pages
+    assert parsed["file_type"] == "pdf" and meta["warnings"] == [], meta
+
+
+def test_pdf_page_pool_is_shared_and_not_nested():
+    import pdf_pages
+
+    pdf = _blank_pdf(pdf_pages.PDF_PARALLEL_MIN_PAGES)
+    pdf_pages.extract_pages(pdf, pdf_pages.PDF_PARALLEL_MIN_PAGES, 2)
+    pool = pdf_pages._pools[2]
+    pdf_pages.extract_pages(pdf, pdf_pages.PDF_PARALLEL_MIN_PAGES, 2)
+    assert pdf_pages._pools[2] is pool
+    # Pool workers never split again, and nothing is split past the CPU count
+    assert pool.submit(pdf_pages.split_workers, 10 ** 4, 8).result() == 0
+    cpus = os.cpu_count() or 1
+    assert pdf_pages.split_workers(10 ** 4, 8) == (min(8, cpus) if cpus > 1 else 0)
+    assert pdf_pages.split_workers(pdf_pages.PDF_PARALLEL_MIN_PAGES - 1, 8) == 0
+
+
+if __name__ == "__main__":
+    try:
+        for test in (
+            test_reuses_connections,
+            test_retries_then_succeeds,
+            test_http_errors_are_returned,
+            test_max_size_cutoff,
+            test_fetch_many_limits_per_host,
+            test_download_to_file_resumes_with_range,
+            test_download_public_file_follows_scan_page,
+            test_response_cache_revalidates,
+            test_response_cache_evicts_least_recently_used,
+            test_response_cache_fails_open,
+            test_briefing_tool_uses_downloader,
+            test_tools_report_missing_drive_download,
+            test_parallel_pdf_pages_from_temp_file,
+            test_pdf_page_pool_is_shared_and_not_nested,
+        ):
+            test()
+            print(f"✅ {test.__name__}")
+    finally:
+        if _server is not None:
+            _server[0].shutdown()
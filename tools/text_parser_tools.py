@@ -2,13 +2,20 @@
 Text Parser Tools for watsonx Orchestrate ADK.
 
 Import with:
-  orchestrate tools import -k python -f tools/text_parser_tools.py
+  orchestrate tools import -k python -f tools/text_parser_tools.py -p tools
+
+(-p packages the tools/ folder so the shared drive_download and pdf_pages
+modules ship with the tool.)
 
 Tools:
 - parse_drive_public_link(link, ext=None, encoding="utf-8"):
     Extracts file_id from a PUBLIC Drive link, downloads bytes, auto-sniffs type if ext is None.
 - parse_file_bytes(file_bytes, file_name=None, ext=None, encoding="utf-8"):
     Parses raw bytes directly, auto-sniffs type if no ext/file_name.
+- parse_local_file(path, ext=None, encoding="utf-8"):
+    Memory-maps and parses a file staged under TEXT_PARSER_LOCAL_ROOT (default out/).
+- parse_files_bulk(items, executor="thread", max_workers=4):
+    Parses a list of links/paths/byte payloads concurrently, results in order.
 
 Notes:
 - Drive downloading only works if the file is shared as
@@ -16,17 +23,37 @@ Notes:
 """
 
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Callable, Dict, List, Tuple
+import base64
+import codecs
+import contextlib
+import csv
+import importlib
 import json
+import mmap
+import os
 import re
+import time
 import zlib
-from io import BytesIO
+from io import BufferedReader, BytesIO, RawIOBase, TextIOWrapper
 
 try:
     import requests  # type: ignore
 except Exception:
     requests = None  # type: ignore
 
+# Sibling module; only present when the tool is imported with -p tools
+try:
+    import drive_download  # type: ignore
+except Exception:
+    drive_download = None  # type: ignore
+
+# Sibling module too; without it long PDFs are always extracted serially
+try:
+    import pdf_pages  # type: ignore
+except Exception:
+    pdf_pages = None  # type: ignore
+
 import zipfile
 
 
@@ -61,40 +88,268 @@ def _infer_ext(file_name: Optional[str], ext: Optional[str]) -> Optional[str]:
     return None
 
 def _safe_decode(b: bytes, encoding: str = "utf-8") -> str:
+    # str() rather than b.decode() so mmaps decode without a bytes copy
     try:
-        return b.decode(encoding)
+        return str(b, encoding)
     except Exception:
-        return b.decode("utf-8", errors="replace")
+        return str(b, "utf-8", errors="replace")
+
+
+class _MmapIO(RawIOBase):
+    """
+    Read-only raw stream over an mmap, so parsers that want a file object
+    read from the mapping instead of a bytes copy.
+    """
+
+    def __init__(self, mapping: mmap.mmap):
+        self._map = mapping
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
 
-def _sniff_office_type(file_bytes: bytes) -> Optional[str]:
-    # ZIP container sniff (xlsx/docx/pptx) without external deps
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._map[self._pos:self._pos + len(b)]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._pos, len(self._map))[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _open_binary(data: Any):
+    """
+    Binary file object over bytes or an mmap, without copying either.
+    """
+    if isinstance(data, mmap.mmap):
+        return BufferedReader(_MmapIO(data))
+    return BytesIO(data)
+
+
+@contextlib.contextmanager
+def _map_fileobj(fh):
+    """
+    Map an open file read-only; empty files (which cannot be mapped) yield b"".
+    """
+    if os.fstat(fh.fileno()).st_size == 0:
+        yield b""
+        return
+    mapping = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes)) as z:
-            names = z.namelist()
-            if any(n.startswith("xl/") for n in names):
-                return "xlsx"
-            if any(n.startswith("word/") for n in names):
-                return "docx"
-            if any(n.startswith("ppt/") for n in names):
-                return "pptx"
+        yield mapping
+    finally:
+        try:
+            mapping.close()
+        except BufferError:
+            # A parser still holds a view; the mapping goes with it
+            pass
+
+
+@contextlib.contextmanager
+def _map_file(path: str):
+    with open(path, "rb") as fh, _map_fileobj(fh) as mapping:
+        yield mapping
+
+# Sniffing reads at most this much from the start of the payload, plus the
+# ZIP end-of-central-directory record and as much of the central directory
+# as it takes to find a telling entry
+_SNIFF_PREFIX_BYTES = 4096
+_ZIP_EOCD_SIG = b"PK\x05\x06"
+_ZIP_EOCD_MAX = 22 + 0xFFFF  # fixed record + longest archive comment
+_ZIP_CD_SIG = b"PK\x01\x02"
+_ZIP_CD_MAX_BYTES = 1024 * 1024
+_ZIP_CD_BLOCK = 64 * 1024
+_OLE_SIG = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_OOXML_PREFIXES = (("xl/", "xlsx"), ("word/", "docx"), ("ppt/", "pptx"))
+_ODF_MIMETYPES = {
+    b"application/vnd.oasis.opendocument.text": "odt",
+    b"application/vnd.oasis.opendocument.spreadsheet": "ods",
+    b"application/vnd.oasis.opendocument.presentation": "odp",
+}
+# OLE2 directory entry names (UTF-16LE) of the main stream of each format
+_OLE_STREAMS = (
+    ("WordDocument".encode("utf-16-le"), "doc"),
+    ("Workbook".encode("utf-16-le"), "xls"),
+    ("Book".encode("utf-16-le"), "xls"),
+    ("PowerPoint Document".encode("utf-16-le"), "ppt"),
+)
+_IMAGE_TYPES = ("png", "jpg", "gif", "tiff", "bmp", "webp")
+
+
+def _source_size(source: Any) -> int:
+    if hasattr(source, "seek") and not hasattr(source, "__len__"):
+        pos = source.tell()
+        size = source.seek(0, 2)
+        source.seek(pos)
+        return size
+    return len(source)
+
+
+def _read_at(source: Any, offset: int, size: int) -> bytes:
+    """
+    Read size bytes at offset from bytes, memoryview, mmap or a seekable file.
+    """
+    if hasattr(source, "seek") and not hasattr(source, "__getitem__"):
+        pos = source.tell()
+        try:
+            source.seek(offset)
+            return source.read(size)
+        finally:
+            source.seek(pos)
+    return bytes(source[offset:offset + size])
+
+
+def _sniff_odf_mimetype(head: bytes) -> Optional[str]:
+    # ODF stores an uncompressed "mimetype" entry first in the archive
+    if head[8:10] != b"\x00\x00" or head[30:38] != b"mimetype":
+        return None
+    name_len = int.from_bytes(head[26:28], "little")
+    extra_len = int.from_bytes(head[28:30], "little")
+    data_len = int.from_bytes(head[18:22], "little")
+    start = 30 + name_len + extra_len
+    return _ODF_MIMETYPES.get(head[start:start + data_len])
+
+
+def _sniff_zip_names(source: Any, size: int) -> Optional[str]:
+    # Locate the end-of-central-directory record in the archive tail
+    tail_len = min(size, _ZIP_EOCD_MAX)
+    tail = _read_at(source, size - tail_len, tail_len)
+    eocd = tail.rfind(_ZIP_EOCD_SIG)
+    if eocd < 0 or len(tail) - eocd < 22:
+        return None
+    cd_size = int.from_bytes(tail[eocd + 12:eocd + 16], "little")
+    cd_offset = int.from_bytes(tail[eocd + 16:eocd + 20], "little")
+    if cd_offset == 0xFFFFFFFF:
+        return None  # ZIP64; leave it to the local headers
+
+    # Walk central directory entries until one names a telling folder
+    cd_end = cd_offset + min(cd_size, _ZIP_CD_MAX_BYTES)
+    buf = b""
+    at = 0
+    pos = cd_offset
+    while True:
+        entry_len = 46
+        if len(buf) - at >= 46:
+            entry_len += sum(
+                int.from_bytes(buf[at + i:at + i + 2], "little") for i in (28, 30, 32)
+            )
+        if len(buf) - at < entry_len:
+            if pos >= cd_end:
+                return None
+            block = _read_at(source, pos, min(_ZIP_CD_BLOCK, cd_end - pos))
+            if not block:
+                return None
+            buf = buf[at:] + block
+            at = 0
+            pos += len(block)
+            continue
+        if buf[at:at + 4] != _ZIP_CD_SIG:
+            return None
+        name_len = int.from_bytes(buf[at + 28:at + 30], "little")
+        name = buf[at + 46:at + 46 + name_len].decode("utf-8", errors="replace")
+        for prefix, kind in _OOXML_PREFIXES:
+            if name.startswith(prefix):
+                return kind
+        at += entry_len
+
+
+def _sniff_zip_local_names(head: bytes) -> Optional[str]:
+    # Fallback: local file headers that happen to sit inside the prefix
+    for m in re.finditer(rb"PK\x03\x04", head):
+        at = m.start()
+        name_len = int.from_bytes(head[at + 26:at + 28], "little")
+        name = head[at + 30:at + 30 + name_len].decode("utf-8", errors="replace")
+        for prefix, kind in _OOXML_PREFIXES:
+            if name.startswith(prefix):
+                return kind
+    return None
+
+
+def _sniff_office_type(source: Any, head: Optional[bytes] = None) -> Optional[str]:
+    # ZIP container sniff (xlsx/docx/pptx/odt/ods/odp) without external deps
+    try:
+        if head is None:
+            head = _read_at(source, 0, _SNIFF_PREFIX_BYTES)
+        return (
+            _sniff_odf_mimetype(head)
+            or _sniff_zip_names(source, _source_size(source))
+            or _sniff_zip_local_names(head)
+        )
+    except Exception:
+        return None
+
+
+def _sniff_ole_type(source: Any, head: bytes) -> str:
+    # Read the first directory sector and look for a known main stream
+    try:
+        sector_size = 1 << int.from_bytes(head[30:32], "little")
+        dir_sector = int.from_bytes(head[48:52], "little")
+        directory = _read_at(source, (dir_sector + 1) * sector_size, sector_size)
+        for stream, kind in _OLE_STREAMS:
+            if stream in directory:
+                return kind
     except Exception:
         pass
+    return "doc"
+
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "tiff"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "webp"
+    # "BM" alone is too common in text; also require the reserved zero
+    # bytes and a known DIB header size
+    if (
+        head.startswith(b"BM")
+        and head[6:10] == b"\x00\x00\x00\x00"
+        and int.from_bytes(head[14:18], "little") in (12, 40, 52, 56, 64, 108, 124)
+    ):
+        return "bmp"
     return None
 
-def _sniff_file_type(file_bytes: bytes, header_hint: Optional[str] = None) -> str:
-    b0 = file_bytes[:8]
+
+def _sniff_file_type(source: Any, header_hint: Optional[str] = None) -> str:
+    """
+    Guess the file type of bytes, a memoryview, an mmap or a seekable file
+    from a bounded prefix (and, for ZIPs, the central directory).
+    """
+    head = _read_at(source, 0, _SNIFF_PREFIX_BYTES)
 
     # 1) Magic bytes
-    if b0.startswith(b"%PDF-"):
+    if head.startswith(b"%PDF-"):
         return "pdf"
-    if b0.startswith(b"PK\x03\x04"):
-        office = _sniff_office_type(file_bytes)
+    if head.startswith(b"PK\x03\x04"):
+        office = _sniff_office_type(source, head)
         if office:
             return office
         return "zip"
-
-    stripped = file_bytes.lstrip()[:1]
-    if stripped in (b"{", b"["):
+    if head.startswith(_OLE_SIG):
+        return _sniff_ole_type(source, head)
+    image = _sniff_image_type(head)
+    if image:
+        return image
+
+    stripped = head.lstrip()
+    if stripped.startswith(b"{\\rtf"):
+        return "rtf"
+    if stripped[:1] in (b"{", b"["):
         return "json"
 
     # 2) Content-Type hint
@@ -114,274 +369,778 @@ def _sniff_file_type(file_bytes: bytes, header_hint: Optional[str] = None) -> st
     return "txt"
 
 
+# Every escape body PDF string literals can contain, mapped to its bytes:
+# the five control escapes, 1-3 digit octal codes (values above 255 are
+# dropped), any other byte, which stands for itself, and b"" for a
+# trailing lone backslash, which is dropped
+_PDF_ESCAPES: Dict[bytes, bytes] = {bytes([c]): bytes([c]) for c in range(256)}
+_PDF_ESCAPES[b""] = b""
+_PDF_ESCAPES.update({
+    b"n": b"\n",
+    b"r": b"\r",
+    b"t": b"\t",
+    b"b": b"\b",
+    b"f": b"\f",
+})
+for _width in (1, 2, 3):
+    for _value in range(8 ** _width):
+        _PDF_ESCAPES[format(_value, "0%do" % _width).encode()] = (
+            bytes([_value]) if _value < 256 else b""
+        )
+del _width, _value
+
+_PDF_ESCAPE_PAT = re.compile(rb"\\([0-7]{1,3}|.|\Z)", re.DOTALL)
+
+
+def _pdf_unescape_match(m: "re.Match[bytes]") -> bytes:
+    return _PDF_ESCAPES[m.group(1)]
+
 
 def _pdf_unescape(s: bytes) -> str:
-    out = bytearray()
-    i = 0
-    while i < len(s):
-        c = s[i]
-        if c == 0x5C:  # backslash
-            i += 1
-            if i >= len(s): break
-            nxt = s[i]
-
-            if nxt in b"nrtbf":
-                out.extend({
-                    ord("n"): b"\n",
-                    ord("r"): b"\r",
-                    ord("t"): b"\t",
-                    ord("b"): b"\b",
-                    ord("f"): b"\f",
-                }[nxt])
-                i += 1
-                continue
+    if b"\\" not in s:
+        return s.decode("utf-8", errors="replace")
+    return _PDF_ESCAPE_PAT.sub(_pdf_unescape_match, s).decode("utf-8", errors="replace")
 
-            if nxt in b"()\\":
-                out.append(nxt); i += 1; continue
+# Patterns for TextNormalizer, compiled once at import
+_SPACING_PAT = re.compile(r"([ \t]{2,})|\n{3,}")
+_SHORT_WORD_RUN_PAT = re.compile(r'(?:(?:\b[A-Za-z]{1,3}\b\s+){2,}\b[A-Za-z]{1,3}\b)')
+# Email-like span allowing spaces
+_EMAIL_SPAN_PAT = re.compile(r'(?i)[A-Z0-9._%+\-\s]+@\s*[A-Z0-9.\-\s]+\.\s*[A-Z\s]{2,}')
+# URL-like spans (http(s) or domainy things)
+_URL_SPAN_PAT = re.compile(r'(?i)(https?\s*:\s*//\s*[^\s|]+|[A-Z0-9\-\s]+\.\s*com\s*/\s*[^\s|]+)')
+_LINKEDIN_PAT = re.compile(r'(?i)l\s*i\s*n\s*k\s*e\s*d\s*i\s*n')
+# Phone span: +digits with spaces/hyphens
+_PHONE_SPAN_PAT = re.compile(r'\+?\d(?:[\s\-]?\d){6,}')
 
-            if 0x30 <= nxt <= 0x37:
-                oct_digits = bytes([nxt]); i += 1
-                for _ in range(2):
-                    if i < len(s) and 0x30 <= s[i] <= 0x37:
-                        oct_digits += bytes([s[i]]); i += 1
-                    else:
-                        break
-                try: out.append(int(oct_digits, 8))
-                except Exception: pass
+
+def _spacing_repl(m: "re.Match[str]") -> str:
+    return " " if m.group(1) else "\n\n"
+
+
+def _despace_repl(m: "re.Match[str]") -> str:
+    return "".join(m.group(0).split())
+
+
+class TextNormalizer:
+    """
+    Cleans up text reassembled from PDF show-text chunks.
+
+    Every pattern is compiled once at import. The two whitespace passes run
+    as one regex, and the contact passes are skipped when the text cannot
+    match them (no "@" means no email, no "/" means no URL).
+    """
+
+    def merge_chunks(self, chunks) -> str:
+        out = []
+        prev = ""
+
+        for c in chunks:
+            c = c.strip()
+            if not c:
                 continue
 
-            out.append(nxt); i += 1
-        else:
-            out.append(c); i += 1
+            if prev and len(prev) == 1:
+                out[-1] = out[-1] + c
+                prev = out[-1]
+                continue
+
+            if prev and not prev.endswith((" ", "\n")) and not c.startswith(("\n", " ")):
+                out.append(" " + c)
+            else:
+                out.append(c)
+            prev = c
+
+        return self.normalize("".join(out))
+
+    def normalize(self, text: str) -> str:
+        text = _SPACING_PAT.sub(_spacing_repl, text)
+        text = self.collapse_short_word_runs(text)
+        text = self.normalize_contacts(text)
+        return text.strip()
+
+    def collapse_short_word_runs(self, text: str) -> str:
+        """
+        Collapse sequences of short alphabetic tokens (len<=3) into one token.
+        """
+        return _SHORT_WORD_RUN_PAT.sub(lambda m: m.group(0).replace(" ", ""), text)
+
+    def despace_spans(self, text: str, span_pat: re.Pattern) -> str:
+        """
+        Find spans that match span_pat and remove spaces inside them.
+        """
+        return span_pat.sub(_despace_repl, text)
+
+    def normalize_contacts(self, text: str) -> str:
+        """
+        Remove PDF kerning spaces specifically inside emails, urls, and phone numbers.
+        """
+        if "@" in text:
+            text = _EMAIL_SPAN_PAT.sub(_despace_repl, text)
+        if "/" in text:
+            text = _URL_SPAN_PAT.sub(_despace_repl, text)
+        # also fix spaced "linkedin.com/in/..."
+        text = _LINKEDIN_PAT.sub("linkedin", text)
+        return _PHONE_SPAN_PAT.sub(_despace_repl, text)
+
+
+_NORMALIZER = TextNormalizer()
 
-    return out.decode("utf-8", errors="replace")
 
 def _collapse_short_word_runs(text: str) -> str:
+    return _NORMALIZER.collapse_short_word_runs(text)
+
+
+def _despace_spans(text: str, span_pat: re.Pattern) -> str:
+    return _NORMALIZER.despace_spans(text, span_pat)
+
+
+def _normalize_contacts(text: str) -> str:
+    return _NORMALIZER.normalize_contacts(text)
+
+
+def _merge_pdf_chunks(chunks):
+    return _NORMALIZER.merge_chunks(chunks)
+
+
+
+# Stream dictionary keys, searched only inside one object's dictionary
+_PDF_LENGTH_PAT = re.compile(rb"/Length\s+(\d+)(\s+\d+\s+R)?")
+_PDF_FILTER_PAT = re.compile(rb"/Filter")
+_PDF_FLATE_PAT = re.compile(rb"/FlateDecode")
+
+# One pass over a content stream: "(lit) Tj", "[...] TJ", or any other
+# literal (consumed so brackets inside it are not mistaken for arrays)
+_PDF_LITERAL = rb"\((?:\\.|[^\\)])*\)"
+_PDF_TEXT_SHOW_PAT = re.compile(
+    rb"(" + _PDF_LITERAL + rb")\s*Tj"
+    rb"|\[((?:" + _PDF_LITERAL + rb"|[^\](])*)\]\s*TJ"
+    rb"|" + _PDF_LITERAL,
+    re.DOTALL,
+)
+_PDF_LITERAL_PAT = re.compile(_PDF_LITERAL, re.DOTALL)
+
+_INFLATE_CHUNK = 64 * 1024
+
+
+def _inflate(raw: memoryview) -> bytes:
     """
-    Collapse sequences of short alphabetic tokens (len<=3) into one token.
+    Decompress a FlateDecode stream incrementally, tolerating trailing junk
+    and truncation. Falls back to raw deflate for streams without a header.
     """
-    pat = re.compile(r'(?:(?:\b[A-Za-z]{1,3}\b\s+){2,}\b[A-Za-z]{1,3}\b)')
-    def repl(m):
-        return m.group(0).replace(" ", "")
-    return pat.sub(repl, text)
+    for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+        d = zlib.decompressobj(wbits)
+        out = []
+        try:
+            for i in range(0, len(raw), _INFLATE_CHUNK):
+                out.append(d.decompress(raw[i:i + _INFLATE_CHUNK]))
+                if d.eof:
+                    break
+            out.append(d.flush())
+        except zlib.error:
+            if out:
+                return b"".join(out)
+            continue
+        return b"".join(out)
+    return b""
 
 
-def _despace_spans(text: str, span_pat: re.Pattern) -> str:
+def _iter_pdf_streams(data: bytes):
     """
-    Find spans that match span_pat and remove spaces inside them.
+    Yield (stream_dict, raw_stream) for each stream object, using /Length to
+    jump over the payload instead of scanning it for "endstream".
     """
-    def repl(m):
-        s = m.group(0)
-        return re.sub(r"\s+", "", s)
-    return span_pat.sub(repl, text)
+    view = memoryview(data)
+    pos = 0
+    n = len(data)
+    while True:
+        i = data.find(b"stream", pos)
+        if i < 0:
+            return
+        if data[i - 3:i] == b"end":
+            pos = i + 6
+            continue
 
+        dict_start = data.rfind(b"obj", max(0, i - 2048), i)
+        stream_dict = data[dict_start if dict_start >= 0 else max(0, i - 200):i]
+
+        start = i + 6
+        if data[start:start + 2] == b"\r\n":
+            start += 2
+        elif data[start:start + 1] in (b"\n", b"\r"):
+            start += 1
+
+        end = -1
+        m = _PDF_LENGTH_PAT.search(stream_dict)
+        if m and not m.group(2):
+            cand = start + int(m.group(1))
+            # Trust /Length only if endstream follows right after it
+            if cand <= n and data.find(b"endstream", cand, cand + 32) >= 0:
+                end = cand
+        if end < 0:
+            end = data.find(b"endstream", start)
+            if end < 0:
+                return
+            while end > start and data[end - 1] in b"\r\n":
+                end -= 1
+
+        yield stream_dict, view[start:end]
+        after = data.find(b"endstream", end)
+        pos = after + 9 if after >= 0 else n
 
-def _normalize_contacts(text: str) -> str:
+
+def _extract_text_from_pdf_fallback(file_bytes: bytes) -> str:
     """
-    Remove PDF kerning spaces specifically inside emails, urls, and phone numbers.
+    Fallback extractor that:
+    1) Walks stream objects using /Length, inflating FlateDecode ones,
+    2) Collects Tj/TJ operands in a single scan of each content stream.
+    Works for most text-based PDFs, including ATS CVs.
     """
-    # Email-like span allowing spaces
-    email_span = re.compile(
-        r'(?i)[A-Z0-9._%+\-\s]+@\s*[A-Z0-9.\-\s]+\.\s*[A-Z\s]{2,}'
-    )
-    text = _despace_spans(text, email_span)
+    chunks = []
 
-    # URL-like spans (http(s) or domainy things)
-    url_span = re.compile(
-        r'(?i)(https?\s*:\s*//\s*[^\s|]+|[A-Z0-9\-\s]+\.\s*com\s*/\s*[^\s|]+)'
-    )
-    text = _despace_spans(text, url_span)
-    # also fix spaced "linkedin.com/in/..."
-    text = re.sub(r'(?i)l\s*i\s*n\s*k\s*e\s*d\s*i\s*n', 'linkedin', text)
+    for stream_dict, raw in _iter_pdf_streams(file_bytes):
+        if _PDF_FLATE_PAT.search(stream_dict):
+            content = _inflate(raw)
+        elif _PDF_FILTER_PAT.search(stream_dict):
+            # Images and other encodings never hold text operators
+            continue
+        else:
+            content = raw.tobytes()
 
-    # Phone span: +digits with spaces/hyphens
-    phone_span = re.compile(r'\+?\d(?:[\s\-]?\d){6,}')
-    text = _despace_spans(text, phone_span)
+        for m in _PDF_TEXT_SHOW_PAT.finditer(content):
+            lit, arr = m.group(1), m.group(2)
+            if lit is not None:
+                chunks.append(_pdf_unescape(lit[1:-1]))
+            elif arr is not None:
+                for sm in _PDF_LITERAL_PAT.finditer(arr):
+                    chunks.append(_pdf_unescape(sm.group(0)[1:-1]))
 
-    return text
+    return _merge_pdf_chunks(chunks)
 
-def _merge_pdf_chunks(chunks):
-    out = []
-    prev = ""
 
-    for c in chunks:
-        c = c.strip()
-        if not c:
-            continue
+# Word processing documents: the body XML member and the element names
+# (namespaced, as ElementTree reports them) that carry structure
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_ODF_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_ODF_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_WORD_LAYOUTS = {
+    "docx": {
+        "member": "word/document.xml",
+        "paragraphs": (_W + "p",),
+        "table": _W + "tbl",
+        "row": _W + "tr",
+        "cells": (_W + "tc",),
+    },
+    "odt": {
+        "member": "content.xml",
+        "paragraphs": (_ODF_TEXT + "p", _ODF_TEXT + "h"),
+        "table": _ODF_TABLE + "table",
+        "row": _ODF_TABLE + "table-row",
+        "cells": (_ODF_TABLE + "table-cell", _ODF_TABLE + "covered-table-cell"),
+    },
+}
+
+
+_W_TEXT = _W + "t"
+# Run elements that stand for a character
+_W_CHARS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+
+
+def _docx_paragraph_text(p: Any) -> str:
+    parts = []
+    for el in p.iter():
+        tag = el.tag
+        if tag == _W_TEXT:
+            parts.append(el.text or "")
+        elif tag in _W_CHARS:
+            parts.append(_W_CHARS[tag])
+    return "".join(parts)
+
+
+def _odt_paragraph_text(p: Any) -> str:
+    # ODF paragraphs are mixed content: text, spans and tails
+    parts = [p.text or ""]
+    for el in p:
+        if el.tag == _ODF_TEXT + "s":
+            parts.append(" " * int(el.get(_ODF_TEXT + "c", "1")))
+        elif el.tag == _ODF_TEXT + "tab":
+            parts.append("\t")
+        elif el.tag == _ODF_TEXT + "line-break":
+            parts.append("\n")
+        else:
+            parts.append(_odt_paragraph_text(el))
+        parts.append(el.tail or "")
+    return "".join(parts)
 
-        if prev and len(prev) == 1 and len(c) == 1:
-            out[-1] = out[-1] + c
-            prev = out[-1]
-            continue
 
-        if prev and len(prev) == 1 and len(c) > 1:
-            out[-1] = out[-1] + c
-            prev = out[-1]
-            continue
+# document.xml / content.xml members up to this size (uncompressed) are
+# parsed into a tree in one go, which peaks at about 12x the XML size.
+# Larger ones are streamed with iterparse: flat memory, but slower per MB.
+_WORD_DOM_MAX_BYTES = 1024 * 1024
 
-        if prev and not prev.endswith((" ", "\n")) and not c.startswith(("\n", " ")):
-            out.append(" " + c)
-            prev = c
+
+class _WordBodyReader:
+    """
+    Collects paragraphs and tables from the start/end element events of a
+    docx/odt body. Fed by a walk over a parsed tree or by iterparse.
+    """
+
+    def __init__(self, file_type: str, max_chars: int):
+        layout = _WORD_LAYOUTS[file_type]
+        self.paragraphs = layout["paragraphs"]
+        self.table = layout["table"]
+        self.row = layout["row"]
+        self.cells = layout["cells"]
+        # Tags start() or end() act on; every other element is skipped
+        self.structure = frozenset(self.paragraphs + self.cells + (self.table, self.row))
+        self.paragraph_text = _docx_paragraph_text if file_type == "docx" else _odt_paragraph_text
+        self.max_chars = max_chars
+        self.lines: List[str] = []
+        self.tables: List[List[List[str]]] = []
+        # One frame per open table: its rows, the current row, the current cell
+        self.open_tables: List[Dict[str, Any]] = []
+        self.total = 0
+
+    def emit(self, line: str) -> None:
+        frame = self.open_tables[-1] if self.open_tables else None
+        if frame is not None and frame["cell"] is not None:
+            frame["cell"].append(line)
         else:
-            out.append(c)
-            prev = c
+            self.lines.append(line)
+
+    def start(self, el: Any) -> None:
+        tag = el.tag
+        if tag == self.table:
+            self.open_tables.append({"rows": [], "row": None, "cell": None})
+        elif self.open_tables and tag == self.row:
+            self.open_tables[-1]["row"] = []
+        elif self.open_tables and tag in self.cells:
+            self.open_tables[-1]["cell"] = []
+
+    def end(self, el: Any) -> bool:
+        """Handle a closed element and clear it; True once max_chars is reached."""
+        tag = el.tag
+        if tag in self.paragraphs:
+            text = self.paragraph_text(el).strip()
+            el.clear()
+            if text:
+                self.emit(text)
+                self.total += len(text) + 1
+                if self.total >= self.max_chars:
+                    return True
+        elif self.open_tables and tag in self.cells:
+            frame = self.open_tables[-1]
+            if frame["row"] is not None:
+                frame["row"].append("\n".join(frame["cell"]))
+            frame["cell"] = None
+            el.clear()
+        elif self.open_tables and tag == self.row:
+            frame = self.open_tables[-1]
+            frame["rows"].append(frame["row"])
+            frame["row"] = None
+            el.clear()
+        elif tag == self.table:
+            rows = self.open_tables.pop()["rows"]
+            self.tables.append(rows)
+            for row in rows:
+                self.emit("\t".join(c.replace("\n", " ") for c in row))
+            el.clear()
+        return False
+
+    def walk(self, el: Any) -> bool:
+        """Feed the elements under el, in document order; True once max_chars is reached."""
+        structure = self.structure
+        paragraphs = self.paragraphs
+        for child in el:
+            tag = child.tag
+            if tag in structure:
+                self.start(child)
+                # A paragraph's own runs are read by paragraph_text; only
+                # text boxes (paragraphs or tables inside it) need a walk
+                descend = tag not in paragraphs or self._nests(child)
+                if (descend and self.walk(child)) or self.end(child):
+                    return True
+            elif len(child) and self.walk(child):
+                return True
+        return False
+
+    def _nests(self, paragraph: Any) -> bool:
+        for tag in self.paragraphs + (self.table,):
+            for inner in paragraph.iter(tag):
+                if inner is not paragraph:
+                    return True
+        return False
+
+    def iterparse(self, fh: Any) -> None:
+        """Stream events from fh; each handled element is removed from its parent."""
+        import xml.etree.ElementTree as ET
+
+        structure = self.structure
+        stack: List[Any] = []
+        for event, el in ET.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                stack.append(el)
+                if el.tag in structure:
+                    self.start(el)
+                continue
+            stack.pop()
+            if el.tag in structure:
+                if self.end(el):
+                    return
+                # Cleared above; drop the empty shell too, so the body
+                # does not keep one per paragraph
+                if stack:
+                    stack[-1].remove(el)
 
-    text = "".join(out)
 
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+def _extract_word_text(file_bytes: bytes, file_type: str, max_chars: int) -> tuple:
+    """
+    Extract the body XML of a docx/odt.
 
-    text = _collapse_short_word_runs(text)
-    text = _normalize_contacts(text)
+    Returns (text, tables): paragraphs one per line with tables rendered
+    as tab-separated rows, and each table as a list of rows of cell text.
+    Parsing stops once max_chars of text have been collected. Bodies up to
+    _WORD_DOM_MAX_BYTES are parsed whole; larger ones are streamed.
+    """
+    import xml.etree.ElementTree as ET
 
-    return text.strip()
+    member = _WORD_LAYOUTS[file_type]["member"]
+    reader = _WordBodyReader(file_type, max_chars)
+    with zipfile.ZipFile(_open_binary(file_bytes)) as z:
+        if z.getinfo(member).file_size <= _WORD_DOM_MAX_BYTES:
+            reader.walk(ET.fromstring(z.read(member)))
+        else:
+            with z.open(member) as fh:
+                reader.iterparse(fh)
 
+    return "\n".join(reader.lines), reader.tables
 
 
-def _extract_text_from_pdf_fallback(file_bytes: bytes) -> str:
+# Spreadsheets and CSVs are paged: each call returns at most max_rows rows
+# (per sheet) starting at row_offset, cut to this many columns
+_XLSX_MAX_COLS = 200
+_TABLE_PREVIEW_ROWS = 100
+_CSV_SNIFF_CHARS = 64 * 1024
+
+
+def _page_window(opts: Dict[str, Any]) -> Tuple[int, int]:
+    """(max_rows, row_offset) clamped to a page of at least one row.
+
+    An empty page would report next_row_offset == row_offset, and a
+    caller following it would never get past that row.
     """
-    Fallback extractor that:
-    1) Finds FlateDecode streams, decompresses them,
-    2) Scans decompressed content for Tj/TJ text operators.
-    Works for most text-based PDFs, including ATS CVs.
+    return max(1, int(opts["max_rows"])), max(0, int(opts["row_offset"]))
+
+
+def _open_csv(file_bytes: bytes, encoding: str):
+    """
+    Wrap bytes in a text stream and sniff the CSV dialect from its head.
     """
-    data = file_bytes
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    stream = TextIOWrapper(_open_binary(file_bytes), encoding=encoding, errors="replace", newline="")
+    sample = stream.read(_CSV_SNIFF_CHARS)
+    stream.seek(0)
+    # Sniff whole lines only; a cut-off quoted field confuses the Sniffer
+    if "\n" in sample:
+        sample = sample[:sample.rfind("\n") + 1]
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    return stream, dialect
 
-    # 1) Find all "stream ... endstream" blocks
-    stream_pat = re.compile(rb"stream\s*(.*?)\s*endstream", re.DOTALL)
-    # 2) Detect FlateDecode near the stream (simple heuristic)
-    flate_hint_pat = re.compile(rb"/Filter\s*/FlateDecode")
 
-    # Tj/TJ patterns
-    tj_pat = re.compile(rb"\((?:\\.|[^\\)])*\)\s*Tj")
-    tj_array_pat = re.compile(rb"\[(.*?)\]\s*TJ", re.DOTALL)
-    inner_str_pat = re.compile(rb"\((?:\\.|[^\\)])*\)")
+def _csv_value_type(value: str) -> str:
+    if not value:
+        return "empty"
+    try:
+        int(value)
+        return "int"
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return "float"
+    except ValueError:
+        return "str"
 
-    chunks = []
 
-    for m in stream_pat.finditer(data):
-        raw_stream = m.group(1)
+def _csv_columns(rows: List[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Typed column view: name (from the first row) and the narrowest type
+    that fits every non-empty value in the page.
+    """
+    if not rows:
+        return []
+    header, body = rows[0], rows[1:]
+    widest = {"empty": 0, "int": 1, "float": 2, "str": 3}
+    columns = []
+    for i, name in enumerate(header):
+        kind = "empty"
+        for row in body:
+            if i < len(row):
+                t = _csv_value_type(row[i])
+                if widest[t] > widest[kind]:
+                    kind = t
+                    if kind == "str":
+                        break
+        columns.append({"name": name, "index": i, "type": kind})
+    return columns
 
-        # Look backwards a bit for /FlateDecode
-        start = max(0, m.start() - 200)
-        context = data[start:m.start()]
-        is_flate = bool(flate_hint_pat.search(context))
 
-        candidates = []
+# ---- parser registry ----
 
-        if is_flate:
-            # Try zlib decompression (some PDFs need "raw" mode)
-            for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
-                try:
-                    candidates.append(zlib.decompress(raw_stream, wbits))
-                    break
-                except Exception:
-                    continue
-        else:
-            candidates.append(raw_stream)
+# file_type -> parser. A parser takes (file_bytes, file_type, opts, meta),
+# where opts holds encoding, max_chars, pdf_page_workers, max_rows,
+# row_offset and path (set for local files), and returns a dict with any of
+# "text", "tables" and "obj". file_bytes is bytes or a read-only mmap; use
+# _open_binary() for a file object and _safe_decode() for text.
+_PARSERS: Dict[str, Callable[..., Dict[str, Any]]] = {}
 
-        for cand in candidates:
-            for tm in tj_pat.finditer(cand):
-                sm = inner_str_pat.search(tm.group(0))
-                if sm:
-                    lit = sm.group(0)[1:-1]
-                    chunks.append(_pdf_unescape(lit))
+# Optional backends, imported on first use. A failed import is cached too,
+# so a missing package costs one import attempt per process.
+_BACKENDS: Dict[str, Any] = {}
 
-            for tm in tj_array_pat.finditer(cand):
-                arr = tm.group(1)
-                for sm in inner_str_pat.finditer(arr):
-                    lit = sm.group(0)[1:-1]
-                    chunks.append(_pdf_unescape(lit))
 
-    return _merge_pdf_chunks(chunks)
+def register_parser(*file_types: str):
+    """
+    Decorator registering a parser for one or more file types.
 
+    Registering a type that already has a parser replaces it.
+    """
+    def decorator(fn):
+        for file_type in file_types:
+            _PARSERS[file_type.lower().lstrip(".")] = fn
+        return fn
+    return decorator
 
-def _parse_bytes(
-    file_bytes: bytes,
-    file_type: str,
-    encoding: str,
-    max_chars: int,
-    meta: Dict[str, Any],
-) -> Dict[str, Any]:
-    text: str = ""
-    tables: List[List[Any]] = []
-    obj: Any = None
-
-    if file_type in ("txt", "md"):
-        text = _safe_decode(file_bytes, encoding)
-
-    elif file_type == "csv":
-        text = _safe_decode(file_bytes, encoding)
-        rows = []
-        for line in text.splitlines():
-            rows.append([c.strip() for c in line.split(",")])
-        tables = rows
-
-    elif file_type == "json":
-        raw = _safe_decode(file_bytes, encoding)
+
+def _load_backend(name: str, meta: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Import a backend module once and cache it (or its ImportError).
+    """
+    cached = _BACKENDS.get(name)
+    if cached is None:
+        start = time.perf_counter()
         try:
-            obj = json.loads(raw)
-            text = json.dumps(obj, ensure_ascii=False, indent=2)
+            cached = importlib.import_module(name)
         except Exception as e:
-            meta["warnings"].append(f"Invalid JSON: {e}")
-            text = raw
+            cached = e
+        _BACKENDS[name] = cached
+        if meta is not None:
+            meta.setdefault("timings_ms", {})[f"import:{name}"] = round(
+                (time.perf_counter() - start) * 1000, 3
+            )
+    if isinstance(cached, Exception):
+        raise cached
+    return cached
+
+
+@register_parser("txt", "md")
+def _parse_text(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    return {"text": _safe_decode(file_bytes, opts["encoding"])}
+
+
+@register_parser("csv")
+def _parse_csv(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    # text is the CSV itself, decoded only as far as max_chars needs (one
+    # char more, so _parse_bytes still reports the truncation). Rows are
+    # read straight off the byte buffer and only tables is paged.
+    max_rows, row_offset = _page_window(opts)
+    stream, dialect = _open_csv(file_bytes, opts["encoding"])
+    text = stream.read(opts["max_chars"] + 1)
+    stream.seek(0)
+    header: List[str] = []
+    rows = []
+    next_offset = None
+    for i, row in enumerate(csv.reader(stream, dialect)):
+        if i == 0:
+            header = [c.strip() for c in row]
+        if i < row_offset:
+            continue
+        if len(rows) == max_rows:
+            next_offset = row_offset + max_rows
+            meta["warnings"].append(
+                f"CSV has more than {next_offset} rows; "
+                f"pass row_offset={next_offset} for the next page of tables."
+            )
+            break
+        rows.append([c.strip() for c in row])
+    # Column names always come from the file's first row; types from this page
+    body = rows[1:] if row_offset == 0 else rows
+    return {
+        "text": text,
+        "tables": rows,
+        "obj": {
+            "delimiter": dialect.delimiter,
+            "columns": _csv_columns([header] + body) if header else [],
+            "row_offset": row_offset,
+            "next_row_offset": next_offset,
+        },
+    }
 
-    elif file_type == "pdf":
-        # Try proper parser first, fallback if unavailable
-        try:
-            import PyPDF2  # type: ignore
-            reader = PyPDF2.PdfReader(BytesIO(file_bytes))
+
+@register_parser("json")
+def _parse_json(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    raw = _safe_decode(file_bytes, opts["encoding"])
+    try:
+        obj = json.loads(raw)
+        return {"text": json.dumps(obj, ensure_ascii=False, indent=2), "obj": obj}
+    except Exception as e:
+        meta["warnings"].append(f"Invalid JSON: {e}")
+        return {"text": raw}
+
+
+@register_parser("pdf")
+def _parse_pdf(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    # Try proper parser first, fallback if unavailable
+    try:
+        PyPDF2 = _load_backend("PyPDF2", meta)
+        reader = PyPDF2.PdfReader(_open_binary(file_bytes))
+        page_count = len(reader.pages)
+        workers = pdf_pages.split_workers(page_count, opts["pdf_page_workers"]) if pdf_pages else 0
+        if workers:
+            # A local file is read by the workers in place; anything else is
+            # written to one temp file they all read
+            parts = pdf_pages.extract_pages(opts.get("path") or file_bytes, page_count, workers)
+        else:
             parts = []
+            total = 0
             for page in reader.pages:
-                parts.append(page.extract_text() or "")
-            text = "\n\n".join(parts)
+                page_text = page.extract_text() or ""
+                parts.append(page_text)
+                total += len(page_text) + 2
+                # Everything past max_chars is truncated below anyway
+                if total >= opts["max_chars"]:
+                    break
+        return {"text": "\n\n".join(parts)}
 
-        except Exception as e:
-            # Fallback: crude PDF text extraction (works for ATS-friendly text PDFs)
+    except Exception as e:
+        # Fallback: crude PDF text extraction (works for ATS-friendly text PDFs)
+        meta["warnings"].append(
+            f"PyPDF2 unavailable or failed ({e}). Using fallback PDF text extractor."
+        )
+        text = _extract_text_from_pdf_fallback(file_bytes)
+        if not text.strip():
             meta["warnings"].append(
-                f"PyPDF2 unavailable or failed ({e}). Using fallback PDF text extractor."
+                "Fallback extractor found no text. PDF may be image-based or heavily encoded."
             )
-            text = _extract_text_from_pdf_fallback(file_bytes)
-            if not text.strip():
+        return {"text": text}
+
+
+@register_parser("xlsx", "xls")
+def _parse_spreadsheet(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    max_rows, row_offset = _page_window(opts)
+    wb = None
+    try:
+        openpyxl = _load_backend("openpyxl", meta)
+        # read_only streams rows from the sheet XML instead of building
+        # every cell up front
+        wb = openpyxl.load_workbook(_open_binary(file_bytes), read_only=True, data_only=True)
+        sheets_out = []
+        for name in wb.sheetnames:
+            ws = wb[name]
+            sheet_rows = []
+            next_offset = None
+            # Rows are padded to the declared sheet width; sheets without
+            # a dimension record yield ragged rows and are cut below
+            width = ws.max_column
+            # Fetch one extra row to learn whether another page exists
+            for row in ws.iter_rows(
+                min_row=row_offset + 1,
+                max_row=row_offset + max_rows + 1,
+                max_col=min(width, _XLSX_MAX_COLS) if width else None,
+                values_only=True,
+            ):
+                if len(sheet_rows) == max_rows:
+                    next_offset = row_offset + max_rows
+                    break
+                sheet_rows.append(list(row[:_XLSX_MAX_COLS]))
+            if next_offset is not None:
                 meta["warnings"].append(
-                    "Fallback extractor found no text. PDF may be image-based or heavily encoded."
+                    f"Sheet '{name}' has more than {row_offset + max_rows} rows; "
+                    f"pass row_offset={next_offset} for the next page."
+                )
+            sheets_out.append({
+                "sheet": name,
+                "row_offset": row_offset,
+                "rows": sheet_rows,
+                "next_row_offset": next_offset,
+            })
+
+        preview_lines = []
+        for s in sheets_out:
+            preview_lines.append(f"## {s['sheet']}")
+            for r in s["rows"][:_TABLE_PREVIEW_ROWS]:
+                preview_lines.append(
+                    "\t".join("" if v is None else str(v) for v in r)
                 )
+        return {"text": "\n".join(preview_lines), "obj": {"sheets": sheets_out}}
+
+    except Exception as e:
+        meta["warnings"].append(
+            f"Excel parsing failed. openpyxl may be unavailable: {e}"
+        )
+        return {"text": ""}
+    finally:
+        # Read-only workbooks keep the archive open until closed
+        if wb is not None:
+            wb.close()
 
 
-    elif file_type in ("xlsx", "xls"):
-        try:
-            import openpyxl  # type: ignore
-            wb = openpyxl.load_workbook(BytesIO(file_bytes), data_only=True)
-            sheets_out = []
-            for name in wb.sheetnames:
-                ws = wb[name]
-                sheet_rows = []
-                for row in ws.iter_rows(values_only=True):
-                    sheet_rows.append([cell for cell in row])
-                sheets_out.append({"sheet": name, "rows": sheet_rows})
-            obj = {"sheets": sheets_out}
-
-            preview_lines = []
-            for s in sheets_out:
-                preview_lines.append(f"## {s['sheet']}")
-                for r in s["rows"][:100]:
-                    preview_lines.append(
-                        "\t".join("" if v is None else str(v) for v in r)
-                    )
-            text = "\n".join(preview_lines)
+@register_parser("docx", "odt")
+def _parse_word(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        text, tables = _extract_word_text(file_bytes, file_type, opts["max_chars"])
+        return {"text": text, "tables": tables}
+    except Exception as e:
+        meta["warnings"].append(f"{file_type.upper()} parsing failed: {e}")
+        return {"text": ""}
 
-        except Exception as e:
-            meta["warnings"].append(
-                f"Excel parsing failed. openpyxl may be unavailable: {e}"
-            )
-            text = ""
 
-    else:
-        meta["warnings"].append(
-            f"Unsupported/unknown file_type '{file_type}'. Returning raw text decode."
-        )
-        text = _safe_decode(file_bytes, encoding)
+@register_parser(*_IMAGE_TYPES)
+def _parse_image(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    meta["warnings"].append(
+        f"'{file_type}' is an image with no text layer; OCR is not supported."
+    )
+    return {"text": ""}
+
 
+def _parse_unknown(file_bytes: bytes, file_type: str, opts: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    meta["warnings"].append(
+        f"Unsupported/unknown file_type '{file_type}'. Returning raw text decode."
+    )
+    return {"text": _safe_decode(file_bytes, opts["encoding"])}
+
+
+def _parse_bytes(
+    file_bytes: bytes,
+    file_type: str,
+    encoding: str,
+    max_chars: int,
+    meta: Dict[str, Any],
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0,
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    opts = {
+        "encoding": encoding,
+        "max_chars": max_chars,
+        "pdf_page_workers": pdf_page_workers,
+        "max_rows": max_rows,
+        "row_offset": row_offset,
+        "path": path,
+    }
+    parser = _PARSERS.get(file_type, _parse_unknown)
+
+    start = time.perf_counter()
+    parsed = parser(file_bytes, file_type, opts, meta)
+    meta.setdefault("timings_ms", {})[file_type] = round((time.perf_counter() - start) * 1000, 3)
+
+    text: str = parsed.get("text") or ""
     if len(text) > max_chars:
         meta["warnings"].append(f"Text truncated to {max_chars} chars.")
         text = text[:max_chars]
@@ -389,45 +1148,41 @@ def _parse_bytes(
     return {
         "file_type": file_type,
         "text": text,
-        "tables": tables,
-        "obj": obj,
+        "tables": parsed.get("tables") or [],
+        "obj": parsed.get("obj"),
         "meta": meta,
     }
 
 
-# ---- tools ----
+# Directory parse_local_file may read from; main.py stages files in out/
+_LOCAL_ROOT_ENV = "TEXT_PARSER_LOCAL_ROOT"
 
-@tool
-def debug_head_bytes(file_bytes: bytes, n: int = 200) -> Dict[str, Any]:
+
+def _resolve_local_path(path: str) -> Optional[str]:
     """
-    Return first N bytes as latin-1 and hex to verify what we downloaded.
+    Resolve path under the local root, or None if it points outside it.
     """
-    head = file_bytes[:n]
-    return {
-        "head_latin1": head.decode("latin-1", errors="replace"),
-        "head_hex": head.hex()[:400]
-    }
+    root = os.path.realpath(os.environ.get(_LOCAL_ROOT_ENV) or "out")
+    full = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, full]) != root:
+        return None
+    return full
 
-@tool
-def parse_drive_public_link(
+
+# ---- tool implementations ----
+
+def _parse_drive_public_link_impl(
     link: str,
     ext: Optional[str] = None,
     encoding: str = "utf-8",
     max_chars: int = 200000,
     timeout_sec: int = 30,
-    include_warnings: bool = False
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
-    """
-    Download a PUBLIC Google Drive file from its share link and parse it.
-
-    - Extracts file_id from the link.
-    - Downloads bytes via `https://drive.google.com/uc?export=download&id=...`
-      (file must be shared to "Anyone with link").
-    - Auto-sniffs file type if ext is not provided.
-    - Returns structured JSON with file_type, file_name, text, tables, obj, meta.
-
-    Set include_warnings=true only if you want diagnostic warnings back.
-    """
     meta: Dict[str, Any] = {"warnings": []}
 
     file_id = _extract_drive_id(link)
@@ -447,14 +1202,32 @@ def parse_drive_public_link(
         out["file_name"] = None
         return out
 
+    if drive_download is None:
+        meta["warnings"].append(
+            "drive_download module unavailable; import the tool with -p tools to download Drive files."
+        )
+        out = {"file_type": "unknown", "text": "", "tables": [], "obj": None, "meta": meta}
+        if not include_warnings:
+            out["meta"]["warnings"] = []
+        out["file_name"] = None
+        return out
+
     url = f"https://drive.google.com/uc?export=download&id={file_id}"
 
     try:
-        r = requests.get(url, timeout=timeout_sec)
-        if r.status_code != 200:
+        # Streamed to a temp file (pooled, retried, resumed, past the
+        # large-file scan page) or served from the response cache; see
+        # drive_download
+        r = drive_download.download_public_file(
+            url, timeout=timeout_sec, cache_key=file_id if use_cache else None
+        )
+        if r["status"] != 200 or r["interstitial"] == "unresolved":
+            r["file"].close()
             meta["warnings"].append(
-                f"Drive download failed (HTTP {r.status_code}). "
+                f"Drive download failed (HTTP {r['status']}). "
                 "Check sharing: 'Anyone with the link can download'."
+                if r["status"] != 200 else
+                "Drive returned its download warning page without a confirm token."
             )
             out = {"file_type": "unknown", "text": "", "tables": [], "obj": None, "meta": meta}
             if not include_warnings:
@@ -462,11 +1235,15 @@ def parse_drive_public_link(
             out["file_name"] = None
             return out
 
-        file_bytes = r.content
-        header_ct = r.headers.get("Content-Type")
-        sniffed = _sniff_file_type(file_bytes, header_ct)
+        if r["resumes"]:
+            meta["warnings"].append(f"Download resumed {r['resumes']} time(s) after dropped connections.")
+        if r.get("cache"):
+            meta["cache"] = r["cache"]
+        if r.get("cache_error"):
+            meta["warnings"].append(r["cache_error"])
+        header_ct = r["headers"].get("Content-Type")
 
-        cd = r.headers.get("Content-Disposition", "")
+        cd = r["headers"].get("Content-Disposition", "")
         fname = None
         m = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', cd)
         if m:
@@ -480,16 +1257,24 @@ def parse_drive_public_link(
         out["file_name"] = None
         return out
 
-    ext_hint = _infer_ext(None, ext)
-    if ext_hint and ext_hint != sniffed:
-        meta["warnings"].append(
-            f"File looks like '{sniffed}' but you forced ext='{ext_hint}'."
-        )
-        chosen_type = ext_hint
-    else:
-        chosen_type = ext_hint or sniffed
+    # Parsers read the temp file through a read-only mapping, so the body
+    # is never copied into a bytes object
+    with r["file"] as fh, _map_fileobj(fh) as file_bytes:
+        sniffed = _sniff_file_type(file_bytes, header_ct)
 
-    parsed = _parse_bytes(file_bytes, chosen_type, encoding, max_chars, meta)
+        ext_hint = _infer_ext(None, ext)
+        if ext_hint and ext_hint != sniffed:
+            meta["warnings"].append(
+                f"File looks like '{sniffed}' but you forced ext='{ext_hint}'."
+            )
+            chosen_type = ext_hint
+        else:
+            chosen_type = ext_hint or sniffed
+
+        parsed = _parse_bytes(
+            file_bytes, chosen_type, encoding, max_chars, meta, pdf_page_workers,
+            max_rows=max_rows, row_offset=row_offset,
+        )
 
     if not fname:
         fname = f"drive_{file_id}.{chosen_type}"
@@ -501,24 +1286,17 @@ def parse_drive_public_link(
     return parsed
 
 
-@tool
-def parse_file_bytes(
+def _parse_file_bytes_impl(
     file_bytes: bytes,
     file_name: Optional[str] = None,
     ext: Optional[str] = None,
     encoding: str = "utf-8",
     max_chars: int = 200000,
-    include_warnings: bool = False
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0
 ) -> Dict[str, Any]:
-    """
-    Parse raw file bytes into structured text/tables.
-
-    - If ext/file_name is missing, auto-sniffs file type from magic bytes.
-    - Supports txt/md/csv/json/pdf/xlsx.
-    - Returns structured JSON with file_type, file_name, text, tables, obj, meta.
-
-    Set include_warnings=true only if you want diagnostic warnings back.
-    """
     meta: Dict[str, Any] = {"warnings": []}
 
     ext_hint = _infer_ext(file_name, ext)
@@ -532,11 +1310,316 @@ def parse_file_bytes(
     else:
         chosen_type = ext_hint or sniffed
 
-    parsed = _parse_bytes(file_bytes, chosen_type, encoding, max_chars, meta)
+    parsed = _parse_bytes(
+        file_bytes, chosen_type, encoding, max_chars, meta, pdf_page_workers,
+        max_rows=max_rows, row_offset=row_offset,
+    )
 
     parsed["file_name"] = file_name or f"uploaded.{chosen_type}"
 
     if not include_warnings:
         parsed["meta"]["warnings"] = []
 
-    return parsed
\ No newline at end of file
+    return parsed
+
+
+def _parse_local_file_impl(
+    path: str,
+    ext: Optional[str] = None,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0
+) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {"warnings": []}
+
+    full_path = _resolve_local_path(path)
+    if full_path is None or not os.path.isfile(full_path):
+        meta["warnings"].append(
+            f"File not found under the local root: {path}"
+            if full_path else f"Path is outside the local root: {path}"
+        )
+        out = {"file_type": "unknown", "text": "", "tables": [], "obj": None, "meta": meta}
+        if not include_warnings:
+            out["meta"]["warnings"] = []
+        out["file_name"] = os.path.basename(path)
+        return out
+
+    file_name = os.path.basename(full_path)
+    with _map_file(full_path) as mapping:
+        ext_hint = _infer_ext(file_name, ext)
+        sniffed = _sniff_file_type(mapping)
+
+        if ext_hint and ext_hint != sniffed:
+            meta["warnings"].append(
+                f"File looks like '{sniffed}' but ext/file_name suggests '{ext_hint}'."
+            )
+            chosen_type = ext_hint
+        else:
+            chosen_type = ext_hint or sniffed
+
+        parsed = _parse_bytes(
+            mapping, chosen_type, encoding, max_chars, meta, pdf_page_workers,
+            max_rows=max_rows, row_offset=row_offset, path=full_path,
+        )
+
+    parsed["file_name"] = file_name
+
+    if not include_warnings:
+        parsed["meta"]["warnings"] = []
+
+    return parsed
+
+
+def _parse_bulk_item(item: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse one parse_files_bulk item; module-level so process pools can run it.
+    """
+    if not isinstance(item, dict):
+        raise TypeError(
+            f"Item must be an object with 'link', 'path' or 'file_bytes', not {type(item).__name__}."
+        )
+    if item.get("link"):
+        return _parse_drive_public_link_impl(
+            link=item["link"], ext=item.get("ext"), timeout_sec=options["timeout_sec"],
+            **options["parse"],
+        )
+    if item.get("path"):
+        return _parse_local_file_impl(path=item["path"], ext=item.get("ext"), **options["parse"])
+    if item.get("file_bytes") is not None:
+        file_bytes = item["file_bytes"]
+        if isinstance(file_bytes, str):
+            # JSON callers cannot send raw bytes
+            file_bytes = base64.b64decode(file_bytes, validate=True)
+        return _parse_file_bytes_impl(
+            file_bytes=file_bytes, file_name=item.get("file_name"), ext=item.get("ext"),
+            **options["parse"],
+        )
+    raise ValueError("Item needs one of 'link', 'path' or 'file_bytes'.")
+
+
+def _parse_files_bulk_impl(
+    items: List[Dict[str, Any]],
+    executor: str = "thread",
+    max_workers: int = 4,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    timeout_sec: int = 30,
+    include_warnings: bool = False,
+    max_rows: int = 1000
+) -> Dict[str, Any]:
+    options = {
+        "timeout_sec": timeout_sec,
+        "parse": {
+            "encoding": encoding,
+            "max_chars": max_chars,
+            "include_warnings": include_warnings,
+            "max_rows": max_rows,
+        },
+    }
+    workers = max(1, min(max_workers, len(items)))
+
+    if workers == 1:
+        pool = None
+        futures = []
+    else:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        pool = pool_cls(max_workers=workers)
+        futures = [pool.submit(_parse_bulk_item, item, options) for item in items]
+
+    results = []
+    failed = 0
+    try:
+        for i, item in enumerate(items):
+            try:
+                if pool is None:
+                    parsed = _parse_bulk_item(item, options)
+                else:
+                    parsed = futures[i].result()
+                parsed["error"] = None
+            except Exception as e:
+                failed += 1
+                parsed = {
+                    "file_type": "unknown", "text": "", "tables": [], "obj": None,
+                    "meta": {"warnings": []},
+                    "file_name": (
+                        item.get("file_name") or item.get("path") or item.get("link")
+                        if isinstance(item, dict) else None
+                    ),
+                    "error": f"{type(e).__name__}: {e}",
+                }
+            parsed["index"] = i
+            results.append(parsed)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return {"results": results, "total": len(items), "failed": failed}
+
+
+# ---- tools ----
+
+@tool
+def debug_head_bytes(file_bytes: bytes, n: int = 200) -> Dict[str, Any]:
+    """
+    Return first N bytes as latin-1 and hex to verify what we downloaded.
+    """
+    head = file_bytes[:n]
+    return {
+        "head_latin1": head.decode("latin-1", errors="replace"),
+        "head_hex": head.hex()[:400]
+    }
+
+@tool
+def parse_drive_public_link(
+    link: str,
+    ext: Optional[str] = None,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    timeout_sec: int = 30,
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Download a PUBLIC Google Drive file from its share link and parse it.
+
+    - Extracts file_id from the link.
+    - Downloads bytes via `https://drive.google.com/uc?export=download&id=...`
+      (file must be shared to "Anyone with link").
+    - Auto-sniffs file type if ext is not provided.
+    - Returns structured JSON with file_type, file_name, text, tables, obj, meta.
+
+    Set include_warnings=true only if you want diagnostic warnings back.
+    Set pdf_page_workers > 1 to split PDFs of 50+ pages across processes (one per CPU at most).
+    Spreadsheets and CSVs return max_rows rows (per sheet) from row_offset;
+    next_row_offset in obj is the row_offset for the next page (null at the end).
+    For CSVs only tables is paged; text is the whole file up to max_chars.
+    Downloads are cached locally by file id and revalidated with the server;
+    set use_cache=false to force a fresh download.
+    """
+    return _parse_drive_public_link_impl(
+        link=link,
+        ext=ext,
+        encoding=encoding,
+        max_chars=max_chars,
+        timeout_sec=timeout_sec,
+        include_warnings=include_warnings,
+        pdf_page_workers=pdf_page_workers,
+        max_rows=max_rows,
+        row_offset=row_offset,
+        use_cache=use_cache,
+    )
+
+
+@tool
+def parse_file_bytes(
+    file_bytes: bytes,
+    file_name: Optional[str] = None,
+    ext: Optional[str] = None,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0
+) -> Dict[str, Any]:
+    """
+    Parse raw file bytes into structured text/tables.
+
+    - If ext/file_name is missing, auto-sniffs file type from magic bytes.
+    - Supports txt/md/csv/json/pdf/xlsx/docx/odt.
+    - Returns structured JSON with file_type, file_name, text, tables, obj, meta.
+
+    Set include_warnings=true only if you want diagnostic warnings back.
+    Set pdf_page_workers > 1 to split PDFs of 50+ pages across processes (one per CPU at most).
+    Spreadsheets and CSVs return max_rows rows (per sheet) from row_offset;
+    next_row_offset in obj is the row_offset for the next page (null at the end).
+    For CSVs only tables is paged; text is the whole file up to max_chars.
+    """
+    return _parse_file_bytes_impl(
+        file_bytes=file_bytes,
+        file_name=file_name,
+        ext=ext,
+        encoding=encoding,
+        max_chars=max_chars,
+        include_warnings=include_warnings,
+        pdf_page_workers=pdf_page_workers,
+        max_rows=max_rows,
+        row_offset=row_offset,
+    )
+
+
+@tool
+def parse_local_file(
+    path: str,
+    ext: Optional[str] = None,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    include_warnings: bool = False,
+    pdf_page_workers: int = 0,
+    max_rows: int = 1000,
+    row_offset: int = 0
+) -> Dict[str, Any]:
+    """
+    Parse a file already staged on local disk (default root: out/).
+
+    - path is relative to the root set by TEXT_PARSER_LOCAL_ROOT; paths
+      outside it are refused.
+    - The file is memory-mapped, sniffed from the mapping and parsed
+      without being read into memory as a whole.
+    - Returns the same structure as parse_file_bytes.
+
+    Set include_warnings=true only if you want diagnostic warnings back.
+    Set pdf_page_workers > 1 to split PDFs of 50+ pages across processes (one per CPU at most).
+    """
+    return _parse_local_file_impl(
+        path=path,
+        ext=ext,
+        encoding=encoding,
+        max_chars=max_chars,
+        include_warnings=include_warnings,
+        pdf_page_workers=pdf_page_workers,
+        max_rows=max_rows,
+        row_offset=row_offset,
+    )
+
+
+@tool
+def parse_files_bulk(
+    items: List[Dict[str, Any]],
+    executor: str = "thread",
+    max_workers: int = 4,
+    encoding: str = "utf-8",
+    max_chars: int = 200000,
+    timeout_sec: int = 30,
+    include_warnings: bool = False,
+    max_rows: int = 1000
+) -> Dict[str, Any]:
+    """
+    Parse many files in one call, e.g. every CV in a review folder.
+
+    - Each item is one of {"link": ..., "ext"?}, {"path": ..., "ext"?} or
+      {"file_bytes": <base64>, "file_name"?, "ext"?}, parsed like
+      parse_drive_public_link / parse_local_file / parse_file_bytes.
+    - executor="thread" (default, best for Drive links) or "process"
+      (CPU-heavy parsing of PDFs already in hand); max_workers caps both.
+    - Returns {"results", "total", "failed"}; results are in item order and
+      each carries its index and error (null when it parsed).
+    """
+    return _parse_files_bulk_impl(
+        items=items,
+        executor=executor,
+        max_workers=max_workers,
+        encoding=encoding,
+        max_chars=max_chars,
+        timeout_sec=timeout_sec,
+        include_warnings=include_warnings,
+        max_rows=max_rows,
+    )